@@ -1,22 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, LoginResponse, LogoutResponse, VerifyResponse
-from app.core.security import verify_password, create_access_token, verify_token
+from app.core.security import verify_and_update_password_async, create_access_token, verify_token
+from app.core.cache import token_cache, user_cache
+from app.core.compression import no_compression
+from app.schemas.user import UserInDB
 from datetime import timedelta
+import time
 from app.config import settings
 
 router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    """관리자 로그인"""
-    user = db.query(User).filter(User.username == login_data.username).first()
+@no_compression  # 토큰이 담긴 응답은 압축하지 않는다 (BREACH)
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """관리자 로그인
+
+    비밀번호 검증은 프로세스 풀에서 실행하고, 해시 방식/비용이 바뀌었으면 새 해시로 교체한다.
+    """
+    user = (await db.execute(select(User).where(User.username == login_data.username))).scalars().first()
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    verified, new_hash = (
+        await verify_and_update_password_async(login_data.password, user.password_hash)
+        if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="잘못된 사용자명 또는 비밀번호입니다."
@@ -28,6 +42,11 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             detail="관리자 권한이 필요합니다."
         )
     
+    if new_hash:
+        # 커밋 후 User 이벤트가 인증 캐시를 무효화한다
+        user.password_hash = new_hash
+        await db.commit()
+    
     # JWT 토큰 생성
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
@@ -72,13 +91,37 @@ async def verify_token_endpoint(credentials: HTTPAuthorizationCredentials = Depe
         }
     )
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """현재 사용자 정보 가져오기"""
-    payload = verify_token(credentials.credentials)
+def verify_token_cached(token: str) -> dict:
+    """토큰 검증 (검증된 클레임을 토큰 만료 시각까지 캐시)"""
+    generation = token_cache.generation()
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    
+    payload = verify_token(token)
+    if "exp" in payload:
+        token_cache.set(token, payload, generation, ttl=payload["exp"] - time.time())
+    return payload
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> UserInDB:
+    """현재 사용자 정보 가져오기
+
+    DB 조회 결과는 세션에 묶이지 않는 스냅샷(UserInDB)으로 캐시하며, 토큰 만료 시각을 넘기지 않는다.
+    사용자가 수정/삭제되면 커밋 후 캐시가 무효화된다.
+    """
+    payload = verify_token_cached(credentials.credentials)
     username = payload.get("sub")
-    user = db.query(User).filter(User.username == username).first()
+    user_id = payload.get("user_id")
     
+    generation = user_cache.generation()
+    user = user_cache.get(user_id) if user_id is not None else None
     if user is None:
+        db_user = db.query(User).filter(User.username == username).first()
+        user = UserInDB.model_validate(db_user) if db_user is not None else None
+        if user is not None and user.id == user_id and "exp" in payload:
+            user_cache.set(user_id, user, generation, ttl=payload["exp"] - time.time())
+    
+    if user is None or user.username != username:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="사용자를 찾을 수 없습니다."
@@ -86,7 +129,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
+def get_current_admin_user(current_user: UserInDB = Depends(get_current_user)) -> UserInDB:
     """현재 관리자 사용자 확인"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -1,19 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status, UploadFile, File
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import List, Optional
 from app.database import get_db
-from app.models.user import User
+from app.schemas.user import UserInDB
 from app.api.auth import get_current_admin_user
-from app.utils.file_handler import save_uploaded_file, get_file_url, delete_file
+from app.core.cache import review_cache
+from app.core.image_pipeline import process_review_images
+from app.core.conditional import is_not_modified
+from app.core.image_variants import VARIANT_FORMATS, variant_cache
+from app.core.static_uploads import cache_control, upload_etag
+from app.config import settings
+from app.utils.file_handler import (
+    save_uploaded_file, get_file_url, get_file_path, delete_file, file_ref_count, upload_batch
+)
+from PIL import UnidentifiedImageError
 import os
 
 router = APIRouter()
 
+# 동기 세션/파일 I/O를 사용하는 라우트는 def로 선언해 스레드풀에서 실행한다 (이벤트 루프 차단 방지)
+
 @router.post("/images/upload")
-async def upload_image(
+def upload_image(
     image: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserInDB = Depends(get_current_admin_user)
 ):
     """이미지 업로드 (관리자 전용)"""
     try:
@@ -23,23 +36,73 @@ async def upload_image(
             "data": {
                 "image_url": get_file_url(filename),
                 "filename": filename,
-                "size": image.size,
+                "size": os.path.getsize(get_file_path(filename)),
                 "mime_type": image.content_type
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"이미지 업로드 실패: {str(e)}"
         )
 
-@router.delete("/images/{filename}")
-async def delete_image(
+@router.get("/images/{filename:path}")
+async def get_image_variant(
+    filename: str,
+    request: Request,
+    w: int = Query(..., description="너비 (IMAGE_VARIANT_WIDTHS 중 하나)"),
+    fmt: str = Query("webp", description="webp, jpeg, png")
+):
+    """크기 변형 이미지 (처음 요청 때 만들어 캐시, 원본보다 크게 늘리지 않는다)"""
+    if w not in settings.image_variant_widths:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 너비입니다. 가능한 값: {', '.join(map(str, settings.image_variant_widths))}"
+        )
+    fmt = fmt.lower()
+    if fmt not in VARIANT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 형식입니다. 가능한 값: {', '.join(VARIANT_FORMATS)}"
+        )
+
+    try:
+        variant = await variant_cache.get_or_create(filename, w, fmt)
+    except (UnidentifiedImageError, OSError):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="이미지를 변환할 수 없습니다."
+        )
+    if variant is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이미지를 찾을 수 없습니다."
+        )
+
+    path, stat_result = variant
+    headers = {
+        "ETag": upload_etag(variant_cache.variant_name(filename, w, fmt), stat_result.st_size),
+        "Cache-Control": cache_control(),
+    }
+    if is_not_modified(request, headers["ETag"], None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type=VARIANT_FORMATS[fmt][2], stat_result=stat_result, headers=headers)
+
+@router.delete("/images/{filename:path}")
+def delete_image(
     filename: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserInDB = Depends(get_current_admin_user)
 ):
     """이미지 삭제 (관리자 전용)"""
+    if file_ref_count(filename) > 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="리뷰에서 사용 중인 이미지입니다."
+        )
+    
     success = delete_file(filename)
     
     if success:
@@ -54,16 +117,17 @@ async def delete_image(
         )
 
 @router.put("/reviews/{review_id}/images")
-async def update_review_images(
+def update_review_images(
     review_id: int,
+    background_tasks: BackgroundTasks,
     images: List[UploadFile] = File(...),
     remove_images: Optional[List[int]] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserInDB = Depends(get_current_admin_user)
 ):
     """리뷰 이미지 수정 (관리자 전용)"""
     from app.models.review import Review
-    from app.models.image import ReviewImage
+    from app.models.image import IMAGE_FILE_COLUMNS, ReviewImage
     
     review = db.query(Review).filter(Review.id == review_id).first()
     
@@ -73,24 +137,21 @@ async def update_review_images(
             detail="리뷰를 찾을 수 없습니다."
         )
     
-    # 기존 이미지 삭제
+    # 기존 이미지 삭제 (파일은 커밋 후 참조가 없을 때 지운다)
     removed_images = []
+    removed_files = []
     if remove_images:
         for img_id in remove_images:
             img = db.query(ReviewImage).filter(ReviewImage.id == img_id).first()
             if img:
-                delete_file(img.image_filename)
+                removed_files.extend(f for f in (getattr(img, column) for column in IMAGE_FILE_COLUMNS) if f)
                 db.delete(img)
                 removed_images.append(img_id)
     
-    # 새 이미지 추가
+    # 새 이미지 추가 (동시에 저장하고 행과 함께 커밋, 실패하면 저장한 파일을 지운다)
     added_images = []
-    if images:
-        saved_files = []
-        for file in images:
-            filename = save_uploaded_file(file)
-            saved_files.append(filename)
-        
+    new_images = []
+    with upload_batch(images) as saved_files:
         for i, filename in enumerate(saved_files):
             review_image = ReviewImage(
                 review_id=review.id,
@@ -99,13 +160,29 @@ async def update_review_images(
                 sort_order=len(review.images) + i
             )
             db.add(review_image)
+            new_images.append(review_image)
+        
+        # 이미지 변경도 리뷰 수정 시각에 반영 (ETag/Last-Modified 기준)
+        if removed_images or new_images:
+            review.updated_at = func.now()
+        
+        # flush 후에 새 이미지 id가 정해진다
+        db.flush()
+        for review_image in new_images:
             added_images.append({
                 "id": review_image.id,
-                "image_url": get_file_url(filename),
+                "image_url": review_image.image_url,
                 "sort_order": review_image.sort_order
             })
+        
+        db.commit()
+    review_cache.invalidate()
+    
+    for filename in removed_files:
+        delete_file(filename)
     
-    db.commit()
+    # 이미지 최적화는 응답 후 프로세스 풀에서 처리
+    background_tasks.add_task(process_review_images, [img["id"] for img in added_images])
     
     return {
         "success": True,
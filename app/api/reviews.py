@@ -1,136 +1,291 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, Form, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, Form, File, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from typing import List, Optional
-from app.database import get_db
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
+from app.schemas.user import UserInDB
 from app.models.review import Review
-from app.models.image import ReviewImage
+from app.models.image import IMAGE_FILE_COLUMNS, ReviewImage
 from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse, ReviewListResponse
 from app.api.auth import get_current_admin_user
-from app.utils.file_handler import save_multiple_files, get_file_url, delete_file
+from app.core.cache import review_cache
+from app.core.image_pipeline import process_review_images
+from app.core.review_batch import apply_review_batch, parse_batch_body
+from app.core.review_export import MEDIA_TYPES, STREAMERS
+from app.core.conditional import (
+    CachedBody, cached_response, is_not_modified, latest, make_etag, not_modified, validator_headers
+)
+from app.core.review_reader import (
+    count_reviews, count_search_results, decode_cursor, fetch_facet_counts, fetch_review_rows, fetch_review_stats,
+    next_cursor_for, search_review_rows
+)
+from app.core.review_fragments import (
+    detail_body, fetch_detail_fragment, fetch_list_fragments, list_body, render_detail
+)
+from app.utils.file_handler import upload_batch, get_file_url, delete_file
+from app.config import settings
+from starlette.concurrency import run_in_threadpool
 from math import ceil
 
 router = APIRouter()
 
+# 목록 조회에서 읽는 리뷰 컬럼 (검증자 계산용, 본문은 review_fragments에서 가져온다)
+PAGE_COLUMNS = (Review.id, Review.updated_at)
+
 @router.get("/reviews")
 async def get_reviews(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(6, ge=1, le=50),
     status_filter: str = Query("published", alias="status"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    team: Optional[str] = Query(None),
+    rating: Optional[int] = Query(None, ge=1, le=5),
+    from_region: Optional[str] = Query(None),
+    to_region: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """리뷰 목록 조회 (페이지네이션)"""
-    # 총 개수 계산
-    total_count = db.query(Review).filter(Review.status == status_filter).count()
+    """리뷰 목록 조회 (페이지네이션, 팀/평점/출발·도착 지역 필터)
+
+    cursor를 넘기면 커서 모드로 동작한다. 응답의 next_cursor를 그대로 넘겨 다음 페이지를 조회하며,
+    이 모드에서는 전체 개수를 세지 않는다. 커서 모드에서도 필터는 매번 같이 넘겨야 한다.
+    """
+    filters = {"team": team, "rating": rating, "from_region": from_region, "to_region": to_region}
+    cache_key = ("list", status_filter, cursor if cursor is not None else page, limit, *filters.values())
+    cached = review_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, cached)
+    generation = review_cache.generation()
     
-    # 페이지네이션 계산
-    total_pages = ceil(total_count / limit)
-    offset = (page - 1) * limit
-    
-    # 리뷰 조회
-    reviews = db.query(Review).filter(Review.status == status_filter)\
-        .order_by(desc(Review.created_at))\
-        .offset(offset).limit(limit).all()
-    
-    # 리뷰 데이터 변환
-    review_list = []
-    for review in reviews:
-        # 이미지 URL 생성
-        images = []
-        for img in review.images:
-            images.append({
-                "id": img.id,
-                "image_url": get_file_url(img.image_filename),
-                "sort_order": img.sort_order
-            })
+    if cursor is not None:
+        try:
+            decoded_cursor = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 커서입니다."
+            )
+        
+        rows = await fetch_review_rows(db, status_filter, 0, limit, decoded_cursor, filters, PAGE_COLUMNS)
+        next_cursor = next_cursor_for(rows) if len(rows) == limit else None
+        pagination = {
+            "items_per_page": limit,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
+        }
+    else:
+        # 총 개수 계산
+        total_count = await count_reviews(db, status_filter, filters)
         
-        # 메인 이미지 (첫 번째 이미지)
-        main_image = images[0]["image_url"] if images else ""
+        # 페이지네이션 계산
+        total_pages = ceil(total_count / limit)
+        offset = (page - 1) * limit
         
-        review_data = {
-            "id": review.id,
-            "user_id": review.user_id,
-            "team": review.team,
-            "title": review.title,
-            "content": review.content,
-            "from_location": review.from_location,
-            "to_location": review.to_location,
-            "from_date": review.from_date,
-            "to_date": review.to_date,
-            "rating": review.rating,
-            "status": review.status,
-            "created_at": review.created_at,
-            "updated_at": review.updated_at,
-            "userName": f"**님",  # 개인정보 보호
-            "date": "2일전",  # 실제로는 created_at에서 계산
-            "image": main_image,
-            "images": [img["image_url"] for img in images],
-            "images_detail": images
+        rows = await fetch_review_rows(db, status_filter, offset, limit, filters=filters, columns=PAGE_COLUMNS)
+        next_cursor = next_cursor_for(rows) if page < total_pages else None
+        pagination = {
+            "current_page": page,
+            "total_pages": total_pages,
+            "total_items": total_count,
+            "items_per_page": limit,
+            "next_cursor": next_cursor
         }
-        review_list.append(review_data)
     
-    return {
-        "success": True,
-        "data": {
-            "reviews": review_list,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_items": total_count,
-                "items_per_page": limit
-            }
+    # 검증자는 리뷰 행만으로 계산 (이미지 조회 전에 304 판단)
+    last_modified = latest(row.updated_at for row in rows)
+    etag = make_etag(
+        generation,
+        pagination.get("total_items"),
+        *((row.id, row.updated_at) for row in rows)
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(request, etag, last_modified)
+    
+    # 리뷰 항목은 쓰기 시점에 만들어 둔 JSON 조각을 이어 붙인다
+    fragments = await fetch_list_fragments(db, [row.id for row in rows])
+    response = Response(
+        content=list_body((fragments[row.id] for row in rows if row.id in fragments), pagination),
+        media_type="application/json",
+        headers=validator_headers(etag, last_modified)
+    )
+    cached = CachedBody(response.body, etag, last_modified)
+    review_cache.set(cache_key, cached, generation)
+    return cached_response(request, cached)
+
+# 아래 라우트들은 /reviews/{review_id}보다 먼저 등록해야 경로가 review_id로 해석되지 않는다
+@router.get("/reviews/export")
+async def export_reviews(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after_id: int = Query(0, ge=0),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """리뷰 전체 내보내기 (관리자 전용, 이미지 목록 포함, id 순)
+
+    일정 개수씩 읽어 바로 내보내므로 리뷰 수와 관계없이 메모리 사용량이 일정하다.
+    다운로드가 끊기면 마지막으로 받은 리뷰 id를 after_id로 넘겨 이어받는다.
+    """
+    return StreamingResponse(
+        STREAMERS[format](after_id, status_filter, settings.export_batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="reviews-after-{after_id}.{format}"',
+            "Cache-Control": "no-store"
         }
+    )
+
+@router.get("/reviews/stats")
+async def get_review_stats(
+    request: Request,
+    status_filter: str = Query("published", alias="status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """리뷰 요약 (개수, 평균 평점, 평점 분포) - 집계 테이블 한 행만 읽는다"""
+    cache_key = ("stats", status_filter)
+    cached = review_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, cached)
+    generation = review_cache.generation()
+    
+    stats = await fetch_review_stats(db, status_filter)
+    etag = make_etag("stats", *stats.values())
+    if is_not_modified(request, etag, None):
+        return not_modified(request, etag, None)
+    
+    response = JSONResponse(
+        jsonable_encoder({"success": True, "data": stats}),
+        headers=validator_headers(etag, None)
+    )
+    cached = CachedBody(response.body, etag, None)
+    review_cache.set(cache_key, cached, generation)
+    return cached_response(request, cached)
+
+@router.get("/reviews/facets")
+async def get_review_facets(
+    request: Request,
+    status_filter: str = Query("published", alias="status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """필터 항목별 리뷰 수 (팀, 평점, 출발 지역, 도착 지역)
+
+    리뷰를 쓸 때 같은 트랜잭션에서 갱신되는 집계 테이블을 읽으므로 GROUP BY 스캔이 없다.
+    """
+    cache_key = ("facets", status_filter)
+    cached = review_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, cached)
+    generation = review_cache.generation()
+    
+    facets = await fetch_facet_counts(db, status_filter)
+    etag = make_etag(
+        "facets",
+        status_filter,
+        *((facet, item["value"], item["count"]) for facet, items in facets.items() for item in items)
+    )
+    if is_not_modified(request, etag, None):
+        return not_modified(request, etag, None)
+    
+    response = JSONResponse(
+        jsonable_encoder({"success": True, "data": facets}),
+        headers=validator_headers(etag, None)
+    )
+    cached = CachedBody(response.body, etag, None)
+    review_cache.set(cache_key, cached, generation)
+    return cached_response(request, cached)
+
+@router.get("/reviews/search")
+async def search_reviews(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    page: int = Query(1, ge=1),
+    limit: int = Query(6, ge=1, le=50),
+    status_filter: str = Query("published", alias="status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """리뷰 검색 (제목, 내용, 팀, 출발지, 도착지, 관련도순)"""
+    query = " ".join(q.split())
+    if not query:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="검색어를 입력해주세요."
+        )
+    
+    cache_key = ("search", query, status_filter, page, limit)
+    cached = review_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, cached)
+    generation = review_cache.generation()
+    
+    total_count = await count_search_results(db, query, status_filter)
+    total_pages = ceil(total_count / limit)
+    rows = await search_review_rows(db, query, status_filter, (page - 1) * limit, limit, columns=PAGE_COLUMNS)
+    
+    last_modified = latest(row.updated_at for row in rows)
+    etag = make_etag(generation, query, total_count, *((row.id, row.updated_at) for row in rows))
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(request, etag, last_modified)
+    
+    fragments = await fetch_list_fragments(db, [row.id for row in rows])
+    pagination = {
+        "current_page": page,
+        "total_pages": total_pages,
+        "total_items": total_count,
+        "items_per_page": limit
     }
+    response = Response(
+        content=list_body((fragments[row.id] for row in rows if row.id in fragments), pagination, query=query),
+        media_type="application/json",
+        headers=validator_headers(etag, last_modified)
+    )
+    cached = CachedBody(response.body, etag, last_modified)
+    review_cache.set(cache_key, cached, generation)
+    return cached_response(request, cached)
 
 @router.get("/reviews/{review_id}")
-async def get_review(review_id: int, db: Session = Depends(get_db)):
+async def get_review(review_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """특정 리뷰 상세 조회"""
-    review = db.query(Review).filter(Review.id == review_id).first()
+    cache_key = ("detail", review_id)
+    cached = review_cache.get(cache_key)
+    if cached is not None:
+        return cached_response(request, cached)
+    generation = review_cache.generation()
     
-    if not review:
+    row = await fetch_detail_fragment(db, review_id)
+    
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="리뷰를 찾을 수 없습니다."
         )
     
-    # 이미지 데이터
-    images = []
-    for img in review.images:
-        images.append({
-            "id": img.id,
-            "image_url": get_file_url(img.image_filename),
-            "sort_order": img.sort_order
-        })
-    
-    # 메인 이미지
-    main_image = images[0]["image_url"] if images else ""
-    
-    review_data = {
-        "id": review.id,
-        "team": review.team,
-        "title": review.title,
-        "userName": f"**님",
-        "date": "2일전",
-        "fromLocation": review.from_location,
-        "toLocation": review.to_location,
-        "fromDate": review.from_date,
-        "toDate": review.to_date,
-        "rating": review.rating,
-        "image": main_image,
-        "images": [img["image_url"] for img in images],
-        "content": review.content,
-        "created_at": review.created_at,
-        "images_detail": images
-    }
+    last_modified = row.updated_at
+    etag = make_etag(generation, row.id, row.updated_at)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(request, etag, last_modified)
     
-    return {
-        "success": True,
-        "data": review_data
-    }
+    fragment = row.detail_json if row.detail_json is not None else await render_detail(db, review_id)
+    if fragment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="리뷰를 찾을 수 없습니다."
+        )
+    
+    response = Response(
+        content=detail_body(fragment),
+        media_type="application/json",
+        headers=validator_headers(etag, last_modified)
+    )
+    cached = CachedBody(response.body, etag, last_modified)
+    review_cache.set(cache_key, cached, generation)
+    return cached_response(request, cached)
 
+# 아래 쓰기 라우트는 동기 세션을 사용하므로 def로 선언해 스레드풀에서 실행한다 (이벤트 루프 차단 방지)
 @router.post("/reviews", response_model=dict)
-async def create_review(
+def create_review(
+    background_tasks: BackgroundTasks,
     team: str = Form(...),
     title: str = Form(...),
     userName: str = Form(...),
@@ -142,10 +297,10 @@ async def create_review(
     content: str = Form(...),
     images: List[UploadFile] = File(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserInDB = Depends(get_current_admin_user)
 ):
     """새 리뷰 생성 (관리자 전용)"""
-    # 리뷰 생성
+    # 리뷰 생성 (이미지와 함께 한 번에 커밋)
     review = Review(
         user_id=current_user.id,
         team=team,
@@ -158,34 +313,87 @@ async def create_review(
         rating=rating,
         status="published"
     )
-    
     db.add(review)
-    db.commit()
-    db.refresh(review)
     
-    # 이미지 처리
-    if images:
-        saved_files = save_multiple_files(images)
-        for i, filename in enumerate(saved_files):
-            review_image = ReviewImage(
-                review_id=review.id,
+    # 이미지는 동시에 저장하고 리뷰와 함께 커밋 (실패하면 저장한 파일을 지운다)
+    with upload_batch(images or []) as saved_files:
+        review.images = [
+            ReviewImage(
                 image_url=get_file_url(filename),
                 image_filename=filename,
                 sort_order=i
             )
-            db.add(review_image)
+            for i, filename in enumerate(saved_files)
+        ]
+        
+        # flush 후에 리뷰/이미지 id가 정해진다
+        db.flush()
+        review_id = review.id
+        new_image_ids = [img.id for img in review.images]
+        db.commit()
+    review_cache.invalidate()
     
-    db.commit()
+    # 이미지 최적화는 응답 후 프로세스 풀에서 처리
+    background_tasks.add_task(process_review_images, new_image_ids)
     
     return {
         "success": True,
         "message": "리뷰가 성공적으로 생성되었습니다.",
-        "data": {"review_id": review.id}
+        "data": {"review_id": review_id}
+    }
+
+@router.post("/reviews/batch", response_model=dict)
+async def batch_reviews(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    chunk_size: int = Query(settings.batch_chunk_size, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: UserInDB = Depends(get_current_admin_user)
+):
+    """리뷰 일괄 생성/수정/삭제 (관리자 전용)
+
+    본문은 JSON 배열(또는 {"items": [...]}) 또는 NDJSON(Content-Type: application/x-ndjson)이며,
+    각 항목은 {"op": "create" | "update" | "delete", "id": ..., 리뷰 필드..., "images": [업로드한 파일명]} 형식이다.
+    chunk_size 항목마다 한 트랜잭션으로 커밋하고 항목별 결과를 요청 순서대로 돌려준다.
+    """
+    try:
+        items = parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if len(items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"한 번에 최대 {settings.batch_max_items}개까지 처리할 수 있습니다."
+        )
+    
+    # 동기 세션으로 쓰므로 스레드풀에서 실행한다
+    outcome = await run_in_threadpool(apply_review_batch, db, items, current_user.id, chunk_size)
+    if outcome.committed:
+        review_cache.invalidate()
+    
+    for filename in outcome.removed_files:
+        await run_in_threadpool(delete_file, filename)
+    
+    # 이미지 최적화는 응답 후 프로세스 풀에서 처리
+    background_tasks.add_task(process_review_images, outcome.new_image_ids)
+    
+    summary = outcome.summary()
+    return {
+        "success": summary["failed"] == 0,
+        "data": {
+            **summary,
+            "results": outcome.results
+        }
     }
 
 @router.put("/reviews/{review_id}", response_model=dict)
-async def update_review(
+def update_review(
     review_id: int,
+    background_tasks: BackgroundTasks,
     team: Optional[str] = None,
     title: Optional[str] = None,
     userName: Optional[str] = None,
@@ -198,7 +406,7 @@ async def update_review(
     images: List[UploadFile] = None,
     remove_existing_images: List[int] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserInDB = Depends(get_current_admin_user)
 ):
     """리뷰 수정 (관리자 전용)"""
     review = db.query(Review).filter(Review.id == review_id).first()
@@ -227,17 +435,18 @@ async def update_review(
     if content is not None:
         review.content = content
     
-    # 기존 이미지 삭제
+    # 기존 이미지 삭제 (파일은 커밋 후 참조가 없을 때 지운다)
+    removed_files = []
     if remove_existing_images:
         for img_id in remove_existing_images:
             img = db.query(ReviewImage).filter(ReviewImage.id == img_id).first()
             if img:
-                delete_file(img.image_filename)
+                removed_files.extend(f for f in (getattr(img, column) for column in IMAGE_FILE_COLUMNS) if f)
                 db.delete(img)
     
-    # 새 이미지 추가
-    if images:
-        saved_files = save_multiple_files(images)
+    # 새 이미지 추가 (동시에 저장하고 수정 내용과 함께 커밋, 실패하면 저장한 파일을 지운다)
+    new_images = []
+    with upload_batch(images or []) as saved_files:
         for i, filename in enumerate(saved_files):
             review_image = ReviewImage(
                 review_id=review.id,
@@ -246,8 +455,20 @@ async def update_review(
                 sort_order=len(review.images) + i
             )
             db.add(review_image)
+            new_images.append(review_image)
+        
+        # 이미지만 바뀐 경우에도 수정 시각을 갱신 (ETag/Last-Modified 기준)
+        if remove_existing_images or images:
+            review.updated_at = func.now()
+        
+        db.flush()
+        new_image_ids = [img.id for img in new_images]
+        db.commit()
+    review_cache.invalidate()
     
-    db.commit()
+    for filename in removed_files:
+        delete_file(filename)
+    background_tasks.add_task(process_review_images, new_image_ids)
     
     return {
         "success": True,
@@ -259,10 +480,10 @@ async def update_review(
     }
 
 @router.delete("/reviews/{review_id}", response_model=dict)
-async def delete_review(
+def delete_review(
     review_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: UserInDB = Depends(get_current_admin_user)
 ):
     """리뷰 삭제 (관리자 전용)"""
     review = db.query(Review).filter(Review.id == review_id).first()
@@ -273,12 +494,17 @@ async def delete_review(
             detail="리뷰를 찾을 수 없습니다."
         )
     
-    # 이미지 파일 삭제
-    for img in review.images:
-        delete_file(img.image_filename)
+    # 이미지 파일 (커밋 후 참조가 없을 때 지운다)
+    removed_files = [
+        f for img in review.images for f in (getattr(img, column) for column in IMAGE_FILE_COLUMNS) if f
+    ]
     
     db.delete(review)
     db.commit()
+    review_cache.invalidate()
+    
+    for filename in removed_files:
+        delete_file(filename)
     
     return {
         "success": True,
@@ -6,15 +6,96 @@ class Settings(BaseSettings):
     # 데이터베이스
     database_url: str = "sqlite:///./database/reviews.db"
     
+    # SQLite 연결 설정 (연결마다 PRAGMA로 적용)
+    sqlite_journal_mode: str = "wal"  # 'wal'이면 쓰기 중에도 읽기가 막히지 않는다
+    sqlite_synchronous: str = "normal"  # WAL에서는 NORMAL이어도 커밋된 데이터가 손상되지 않는다
+    sqlite_mmap_size: int = 268435456  # 256MB
+    sqlite_cache_size: int = -65536  # 음수는 KiB 단위 (64MB)
+    sqlite_busy_timeout_ms: int = 5000
+    
+    # 커넥션 풀 (워커 프로세스마다 따로 생성된다)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800  # PostgreSQL에서만 사용 (초)
+    
+    # PostgreSQL 연결 설정
+    postgres_application_name: str = "noble-back"
+    postgres_statement_timeout_ms: int = 30000  # 0이면 제한 없음
+    
     # JWT 설정
     secret_key: str = "your-secret-key-here-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440
     
+    # 비밀번호 해싱 (방식이나 비용을 바꾸면 다음 로그인 때 저장된 해시가 갱신된다)
+    password_hash_scheme: str = "sha256_crypt"
+    password_hash_rounds: int = 0  # 0이면 passlib 기본값 (sha256_crypt: 535000)
+    password_hash_workers: int = 2
+    password_hash_queue_limit: int = 16  # 실행 중 + 대기 중 작업 수 상한 (넘으면 503)
+    
     # 파일 업로드
     upload_dir: str = "./uploads"
-    max_file_size: int = 5242880  # 5MB
+    max_file_size: int = 5242880  # 5MB (파일마다, 받은 파일을 저장하면서 확인)
+    max_upload_request_size: int = 104857600  # 100MB (multipart 요청 전체, 본문을 받기 전에 확인, 0이면 제한 없음)
     allowed_file_types: List[str] = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+    upload_chunk_size: int = 1048576  # 1MB 단위로 나눠 쓰기
+    upload_storage_mode: str = "uuid"  # 'uuid' (파일마다 고유 이름) 또는 'content' (내용 해시, 중복 제거)
+    upload_workers: int = 4  # 여러 파일 업로드(리뷰 이미지)를 동시에 저장하는 스레드 수
+    
+    # 업로드 파일 서빙 (/uploads)
+    uploads_serve_mode: str = "app"  # 'app' (앱이 전송), 'x-accel-redirect' (nginx), 'x-sendfile' (Apache/lighttpd)
+    uploads_accel_prefix: str = "/_uploads/"  # x-accel-redirect 모드의 nginx internal location
+    uploads_max_age: int = 31536000  # 파일명이 바뀌지 않으므로 1년 동안 캐시 (immutable)
+    
+    # 이미지 최적화 (업로드 후 프로세스 풀에서 처리)
+    image_optimize_enabled: bool = True
+    image_max_dimension: int = 1920
+    image_jpeg_quality: int = 85
+    image_webp_quality: int = 80
+    image_placeholder_size: int = 16
+    image_process_workers: int = 0  # 0이면 CPU 코어 수
+    
+    # 이미지 크기 변형 (GET /api/images/{filename}?w=&fmt=, 처음 요청 때 만들어 디스크에 캐시)
+    image_variant_widths: List[int] = [320, 640, 960, 1280, 1920]  # 허용하는 너비 (캐시가 무한히 커지지 않도록)
+    image_variant_dir: str = "./database/image_variants"
+    image_variant_cache_bytes: int = 1073741824  # 변형 캐시 전체 크기 제한 (넘으면 오래 쓰지 않은 것부터 삭제)
+    
+    # 리뷰 일괄 쓰기 (POST /api/reviews/batch)
+    batch_chunk_size: int = 500  # 트랜잭션 하나에 넣는 항목 수
+    batch_max_items: int = 10000
+    
+    # 리뷰 내보내기 (GET /api/reviews/export, 한 번에 읽는 리뷰 수)
+    export_batch_size: int = 500
+    
+    # 응답 캐시 (워커별 LRU + TTL, 공유 세대 카운터로 무효화)
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 1024
+    response_cache_ttl_seconds: int = 300
+    cache_generation_file: str = "./database/cache_generation"
+    
+    # 인증 캐시 (토큰 검증 결과와 사용자 정보, 토큰 만료 시각을 넘기지 않는다)
+    auth_cache_enabled: bool = True
+    auth_cache_max_entries: int = 1024
+    auth_cache_ttl_seconds: int = 300
+    
+    # SQL 계측 (요청별 쿼리 수와 DB 시간을 Server-Timing 헤더로, 느린 쿼리는 실행 계획과 함께 로그)
+    # 기본값은 모두 꺼져 있어 쿼리마다 이벤트가 실행되지 않는다 (필요할 때 환경 변수로 켠다)
+    server_timing_enabled: bool = False  # 모든 응답에 Server-Timing 헤더 추가
+    server_timing_admin_header: bool = False  # 관리자 토큰과 X-Server-Timing 헤더를 보낸 요청에만 추가
+    slow_query_ms: int = 0  # 이 시간 이상 걸린 쿼리를 로그에 남긴다 (0이면 끔)
+    slow_query_explain: bool = True  # 느린 쿼리 로그에 실행 계획(EXPLAIN QUERY PLAN) 포함
+    
+    # 응답 압축 (/api/*, Accept-Encoding에 따라 br 또는 gzip, brotli는 패키지가 있을 때만)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # 이보다 작은 본문은 압축하지 않는다 (바이트)
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    
+    # 메트릭 (GET /metrics, 워커별로 기록하고 스냅샷 파일로 합산)
+    metrics_enabled: bool = True
+    metrics_dir: str = "./database/metrics"
+    metrics_flush_seconds: float = 5.0  # 다른 워커 값이 늦어질 수 있는 최대 시간
     
     # 서버 설정
     host: str = "0.0.0.0"
@@ -0,0 +1,193 @@
+"""응답 캐시
+
+워커 프로세스마다 LRU + TTL 캐시를 두고, 모든 워커가 공유하는 세대(generation) 카운터로 무효화한다.
+쓰기 요청이 커밋되면 세대를 올리고, 각 워커는 캐시 항목을 꺼낼 때 저장 당시 세대와 비교해
+달라졌으면 버린다. 세대 카운터는 파일을 mmap으로 공유하므로 읽기에 DB 조회나 락이 필요 없다.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from app.config import settings
+from app.core.metrics import cache_requests, register_collector
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 파일 락 없이 동작
+    fcntl = None
+
+class SharedGeneration:
+    """워커 프로세스 간 공유 세대 카운터 (파일 기반 mmap)"""
+
+    SLOT_SIZE = 8
+    SLOT_COUNT = 8
+
+    # 카운터 슬롯
+    REVIEWS = 0
+    USERS = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mm = None
+        self._fd = None
+        self._open_lock = threading.Lock()
+
+    def _map(self):
+        if self._mm is not None:
+            return self._mm
+        with self._open_lock:
+            if self._mm is None:
+                size = self.SLOT_SIZE * self.SLOT_COUNT
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._fd = fd
+                self._mm = mmap.mmap(fd, size)
+        return self._mm
+
+    def get(self, slot: int = REVIEWS) -> int:
+        """현재 세대 값"""
+        return struct.unpack_from("<Q", self._map(), slot * self.SLOT_SIZE)[0]
+
+    def bump(self, slot: int = REVIEWS) -> int:
+        """세대 증가 (모든 워커의 해당 캐시 무효화)"""
+        mm = self._map()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            value = struct.unpack_from("<Q", mm, slot * self.SLOT_SIZE)[0] + 1
+            struct.pack_into("<Q", mm, slot * self.SLOT_SIZE, value)
+            return value
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+class _Entry:
+    __slots__ = ("value", "generation", "expires_at")
+
+    def __init__(self, value: Any, generation: int, expires_at: float):
+        self.value = value
+        self.generation = generation
+        self.expires_at = expires_at
+
+class ResponseCache:
+    """크기 제한 LRU + TTL 캐시 (공유 세대 카운터로 무효화)"""
+
+    def __init__(
+        self,
+        generations: SharedGeneration,
+        slot: int,
+        max_entries: int,
+        ttl_seconds: float,
+        enabled: bool = True
+    ):
+        self.generations = generations
+        self.slot = slot
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        """현재 세대 (응답을 만들기 전에 읽어서 set()에 넘긴다)"""
+        return self.generations.get(self.slot)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (만료되었거나 세대가 바뀐 항목은 버린다)"""
+        if not self.enabled:
+            return None
+
+        generation = self.generation()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.generation != generation or entry.expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, generation: int, ttl: Optional[float] = None) -> None:
+        """캐시 저장 (generation은 응답 생성 전에 읽은 값, ttl을 주면 기본 TTL보다 짧게만 줄인다)"""
+        if not self.enabled:
+            return
+        
+        ttl = self.ttl_seconds if ttl is None else min(ttl, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        # 응답을 만드는 사이에 쓰기가 있었다면 이미 낡은 값이므로 저장하지 않는다
+        if generation != self.generation():
+            return
+
+        with self._lock:
+            self._entries[key] = _Entry(value, generation, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """모든 워커의 캐시 무효화"""
+        self.generations.bump(self.slot)
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+# 전역 세대 카운터 및 리뷰 응답 캐시
+generations = SharedGeneration(settings.cache_generation_file)
+
+review_cache = ResponseCache(
+    generations,
+    SharedGeneration.REVIEWS,
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+    enabled=settings.response_cache_enabled
+)
+
+# 인증 캐시 (토큰 -> 검증된 클레임, 사용자 ID -> 사용자 정보)
+# 사용자가 수정/삭제되면 USERS 세대를 올려 모든 워커에서 무효화한다
+token_cache = ResponseCache(
+    generations,
+    SharedGeneration.USERS,
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    enabled=settings.auth_cache_enabled
+)
+
+user_cache = ResponseCache(
+    generations,
+    SharedGeneration.USERS,
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    enabled=settings.auth_cache_enabled
+)
+
+def _cache_samples():
+    """캐시 조회 수 (메트릭 스냅샷 시점 값)"""
+    for name, cache in (("reviews", review_cache), ("tokens", token_cache), ("users", user_cache)):
+        yield cache_requests.name, (name, "hit"), cache.hits
+        yield cache_requests.name, (name, "miss"), cache.misses
+
+register_collector(_cache_samples)
@@ -0,0 +1,148 @@
+"""API 응답 압축 (gzip, brotli)
+
+/api/* 응답 중 JSON/텍스트 본문이 COMPRESSION_MIN_SIZE 이상이면 Accept-Encoding에 따라 압축한다.
+brotli는 brotli 패키지가 설치되어 있을 때만 사용한다.
+
+- 압축한 응답의 ETag에는 인코딩을 붙여(-gzip, -br) 표현마다 다른 강한 ETag가 되게 하고,
+  조건부 요청에서는 붙인 부분을 떼고 비교한다 (app.core.conditional).
+- 응답 캐시에 저장된 본문(CachedBody)은 인코딩별 압축 결과를 함께 저장해 캐시 적중마다 다시 압축하지 않는다.
+- 스트리밍 응답(여러 번에 나눠 보내는 본문)과 no_compression을 붙인 라우트는 압축하지 않는다.
+"""
+import gzip
+from typing import Callable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 압축하는 Content-Type (매개변수 제외)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/plain",
+    "text/csv",
+    "text/html",
+)
+
+def available_encodings() -> tuple:
+    """서버가 지원하는 인코딩 (선호 순)"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding에서 사용할 인코딩 선택 (q 값이 가장 큰 것, 같으면 br 우선, 없으면 None)"""
+    if not settings.compression_enabled or not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+def should_compress(body: bytes) -> bool:
+    return settings.compression_enabled and len(body) >= settings.compression_min_size
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """압축한 표현의 ETag ("abc" -> "abc-gzip")"""
+    prefix = "W/" if etag.startswith("W/") else ""
+    return f'{prefix}{etag[len(prefix):-1]}-{encoding}"'
+
+def strip_encoding(etag: str) -> str:
+    """인코딩을 붙인 ETag에서 원래 ETag 구하기"""
+    for encoding in ("gzip", "br"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+def no_compression(endpoint: Callable) -> Callable:
+    """응답을 압축하지 않을 라우트 (비밀 값과 요청 입력이 함께 담기는 응답 등, BREACH 대응)"""
+    endpoint.skip_compression = True
+    return endpoint
+
+def _route_skipped(scope: Scope) -> bool:
+    route = scope.get("route")
+    return getattr(getattr(route, "endpoint", None), "skip_compression", False)
+
+def _compressible(scope: Scope, start: Message, headers: MutableHeaders) -> bool:
+    if start["status"] != 200 or "content-encoding" in headers or _route_skipped(scope):
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return content_type in COMPRESSIBLE_TYPES
+
+class CompressionMiddleware:
+    """/api/* 응답 압축 ASGI 미들웨어 (한 번에 보내는 본문만)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # 본문 크기를 알 때까지 헤더를 보내지 않는다
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            headers = MutableHeaders(scope=held)
+            body = message.get("body", b"")
+            if not _compressible(scope, held, headers):
+                await send(held)
+                await send(message)
+                return
+
+            add_vary(headers)
+            if encoding is None or message.get("more_body", False) or not should_compress(body):
+                await send(held)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], encoding)
+            await send(held)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,113 @@
+"""조건부 GET (ETag / Last-Modified / 304)
+
+검증자(ETag, Last-Modified)는 응답 본문을 만들기 전에 리뷰 행만으로 계산하고,
+클라이언트가 가진 값과 같으면 이미지 조회와 직렬화 없이 304를 돌려준다.
+압축한 응답의 ETag(-gzip, -br)는 원래 ETag와 같은 것으로 비교한다.
+
+200과 304는 같은 표현 헤더(협상한 인코딩을 붙인 ETag, Vary: Accept-Encoding)를 보낸다.
+304를 만들 때는 본문 크기를 모르므로, 인코딩을 붙인 ETag는 본문이 작아 실제로 압축하지 않은 200에도 붙인다
+(본문이 ETag로 정해지므로 같은 ETag는 항상 같은 바이트다).
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from fastapi import Request, Response
+from app.config import settings
+from app.core.compression import choose_encoding, compress, encoded_etag, should_compress, strip_encoding
+
+# 공개 조회 응답은 저장하되 매번 재검증하도록 한다
+CACHE_CONTROL = "no-cache"
+
+class CachedBody:
+    """직렬화된 응답 본문과 검증자 (인코딩별 압축 결과를 함께 보관)"""
+    __slots__ = ("body", "etag", "last_modified", "encoded")
+
+    def __init__(self, body: bytes, etag: str, last_modified: Optional[datetime]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.encoded: Dict[str, bytes] = {}
+
+    def encode(self, encoding: str) -> bytes:
+        """압축한 본문 (처음 요청될 때 한 번만 압축)"""
+        body = self.encoded.get(encoding)
+        if body is None:
+            body = self.encoded[encoding] = compress(self.body, encoding)
+        return body
+
+def make_etag(*parts) -> str:
+    """강한 ETag 생성"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+def latest(values) -> Optional[datetime]:
+    """가장 최근 시각 (None 제외)"""
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite CURRENT_TIMESTAMP는 타임존 없는 UTC 값으로 돌아온다
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def http_date(value: datetime) -> str:
+    """HTTP 날짜 형식"""
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    """200/304 응답에 공통으로 붙는 헤더"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """요청의 조건부 헤더와 검증자 비교 (If-None-Match가 있으면 그것만 본다)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return any(strip_encoding(tag.removeprefix("W/")) == etag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+
+    return False
+
+def representation_headers(request: Request, etag: str, last_modified: Optional[datetime]) -> Tuple[dict, Optional[str]]:
+    """200/304 응답 헤더와 협상한 인코딩 (인코딩을 붙인 ETag, Vary)"""
+    headers = validator_headers(etag, last_modified)
+    if not settings.compression_enabled:
+        return headers, None
+    
+    headers["Vary"] = "Accept-Encoding"
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        headers["ETag"] = encoded_etag(etag, encoding)
+    return headers, encoding
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> Response:
+    """304 응답 (같은 요청의 200과 같은 ETag, Vary)"""
+    headers, _ = representation_headers(request, etag, last_modified)
+    return Response(status_code=304, headers=headers)
+
+def cached_response(request: Request, cached: CachedBody) -> Response:
+    """캐시된 본문으로 200 또는 304 응답 (Accept-Encoding에 맞춰 압축한 본문을 재사용)"""
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified(request, cached.etag, cached.last_modified)
+    
+    headers, encoding = representation_headers(request, cached.etag, cached.last_modified)
+    if encoding is None or not should_compress(cached.body):
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=cached.encode(encoding), media_type="application/json", headers=headers)
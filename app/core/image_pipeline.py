@@ -0,0 +1,192 @@
+"""업로드 후 이미지 최적화 파이프라인
+
+리뷰 이미지가 커밋된 뒤 BackgroundTasks로 실행된다. 실제 디코딩/인코딩은 프로세스 풀에서 돌리므로
+요청 처리 워커를 막지 않고, 이미지 여러 장은 코어 수만큼 병렬로 처리된다.
+처리 결과(최적화 파일, 크기, MIME 타입, 해상도, 미리보기, WebP 파일)는 ReviewImage에 기록한다.
+
+업로드한 파일명(image_filename, image_url)은 바꾸지 않는다. 생성/수정 응답, 응답 캐시, 클라이언트 캐시에
+이미 나간 URL이고 immutable로 캐시되므로, 최적화 결과는 다른 이름으로 저장해 optimized_filename에 둔다.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional
+from sqlalchemy import select, func, update
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.image import ReviewImage, ImageBlob
+from app.models.review import Review
+from app.core.cache import review_cache
+from app.core.metrics import image_process_duration
+from app.utils.file_handler import get_file_path, delete_file, store_file
+from app.utils.image_processor import optimize_image
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ProcessPoolExecutor:
+    """이미지 처리용 프로세스 풀 (처음 사용할 때 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = settings.image_process_workers or os.cpu_count() or 1
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+def shutdown_executor() -> None:
+    """프로세스 풀 종료"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+async def run_optimize(filename: str) -> dict:
+    """프로세스 풀에서 이미지 한 장 최적화"""
+    loop = asyncio.get_running_loop()
+    job = partial(
+        optimize_image,
+        get_file_path(filename),
+        settings.upload_dir,
+        max_dimension=settings.image_max_dimension,
+        jpeg_quality=settings.image_jpeg_quality,
+        webp_quality=settings.image_webp_quality,
+        placeholder_size=settings.image_placeholder_size
+    )
+    started = time.perf_counter()
+    result = "error"
+    try:
+        output = await loop.run_in_executor(get_executor(), job)
+        result = "ok"
+        return output
+    finally:
+        image_process_duration.observe(time.perf_counter() - started, (result,))
+
+def _store_outputs(result: dict) -> dict:
+    """최적화 결과 파일을 저장소에 등록 (content 모드면 해시 경로로 이동)"""
+    if not result["filename"]:
+        return result
+    
+    filename = store_file(get_file_path(result["filename"]), os.path.splitext(result["filename"])[1])
+    webp_filename = result["webp_filename"]
+    if settings.upload_storage_mode == "content":
+        # WebP 변형은 결과 파일과 같은 위치, 같은 이름으로 둔다
+        target = os.path.splitext(filename)[0] + ".webp"
+        if os.path.exists(get_file_path(target)):
+            os.remove(get_file_path(webp_filename))
+        else:
+            os.replace(get_file_path(webp_filename), get_file_path(target))
+        webp_filename = target
+    
+    return {**result, "filename": filename, "webp_filename": webp_filename}
+
+def _existing_results(known: dict) -> dict:
+    return {
+        source: result for source, result in known.items()
+        if not result["filename"] or os.path.exists(get_file_path(result["filename"]))
+    }
+
+async def process_review_images(image_ids: List[int]) -> None:
+    """리뷰 이미지 최적화 후 메타데이터 기록 (BackgroundTasks용)
+
+    같은 파일을 참조하는 행은 한 번만 처리하고, 이미 최적화한 원본(image_blobs에 결과가 기록된 파일)은
+    다시 처리하지 않고 결과만 복사한다.
+    """
+    if not settings.image_optimize_enabled or not image_ids:
+        return
+    
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(ReviewImage.id, ReviewImage.image_filename).where(ReviewImage.id.in_(image_ids))
+        )).all()
+        filenames = {row.id: row.image_filename for row in rows}
+        known = {
+            blob.filename: {
+                "filename": blob.optimized_filename,
+                "webp_filename": blob.webp_filename,
+                "image_size": blob.image_size,
+                "image_mime_type": blob.image_mime_type,
+                "image_width": blob.image_width,
+                "image_height": blob.image_height,
+                "placeholder": blob.placeholder,
+            }
+            for blob in (await db.execute(
+                select(ImageBlob).where(
+                    ImageBlob.filename.in_(set(filenames.values())),
+                    ImageBlob.image_width.isnot(None)
+                )
+            )).scalars()
+        }
+    
+    # 결과 파일이 지워진 원본은 다시 처리한다
+    known = await run_in_threadpool(_existing_results, known)
+    pending = sorted(set(filenames.values()) - set(known))
+    results = await asyncio.gather(*(run_optimize(filename) for filename in pending), return_exceptions=True)
+    
+    outputs = {}
+    for filename, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            logger.warning("image optimization failed for %s: %s", filename, result)
+            continue
+        outputs[filename] = await run_in_threadpool(_store_outputs, result)
+    
+    applied = set()
+    discarded = set()
+    async with AsyncSessionLocal() as db:
+        review_ids = set()
+        for image_id, filename in filenames.items():
+            result = known.get(filename) or outputs.get(filename)
+            if result is None:
+                continue
+            
+            image = await db.get(ReviewImage, image_id)
+            if image is None or image.image_filename != filename:
+                # 처리 중에 삭제되었거나 바뀐 이미지는 결과를 버린다
+                if filename in outputs:
+                    discarded.update(name for name in (result["filename"], result["webp_filename"]) if name)
+                continue
+            
+            applied.add(filename)
+            image.optimized_filename = result["filename"]
+            image.webp_filename = result["webp_filename"]
+            image.image_size = result["image_size"]
+            image.image_mime_type = result["image_mime_type"]
+            image.image_width = result["image_width"]
+            image.image_height = result["image_height"]
+            image.placeholder = result["placeholder"]
+            review_ids.add(image.review_id)
+        
+        if review_ids:
+            for review in (await db.execute(select(Review).where(Review.id.in_(review_ids)))).scalars():
+                review.updated_at = func.now()
+            # flush에서 결과 파일의 참조 수가 늘어난다
+            await db.flush()
+            
+            # 원본 -> 결과 파일과 메타데이터 기록 (같은 원본을 다시 올리면 재사용)
+            blobs = ImageBlob.__table__
+            for source, result in outputs.items():
+                if source not in applied:
+                    continue
+                await db.execute(update(blobs).where(blobs.c.filename == source).values(
+                    optimized_filename=result["filename"],
+                    webp_filename=result["webp_filename"],
+                    image_size=result["image_size"],
+                    image_mime_type=result["image_mime_type"],
+                    image_width=result["image_width"],
+                    image_height=result["image_height"],
+                    placeholder=result["placeholder"]
+                ))
+            await db.commit()
+            review_cache.invalidate()
+    
+    # 쓰이지 않은 결과 파일은 커밋 뒤에 지운다 (다른 행이 참조하면 남는다)
+    for filename in discarded:
+        await run_in_threadpool(delete_file, filename)
@@ -0,0 +1,212 @@
+"""이미지 크기 변형 (GET /api/images/{filename}?w=&fmt=)
+
+처음 요청될 때 이미지 처리 프로세스 풀에서 만들어 변형 캐시 디렉토리에 저장하고, 이후에는 디스크에서 바로 응답한다.
+너비는 IMAGE_VARIANT_WIDTHS에 있는 값만 허용해 만들 수 있는 변형 수를 제한한다.
+
+- 같은 변형을 동시에 요청하면 워커 안에서는 작업 하나를 함께 기다리고,
+  워커 사이에서는 파일 락으로 한 프로세스만 만들고 나머지는 만들어진 파일을 쓴다.
+- 전체 크기가 IMAGE_VARIANT_CACHE_BYTES를 넘으면 오래 쓰지 않은(mtime) 변형부터 지운다.
+  캐시 적중 때 mtime을 갱신하되 TOUCH_INTERVAL_SECONDS에 한 번만 쓴다.
+- 업로드 파일명은 바뀌지 않으므로 변형도 바뀌지 않는다 (immutable 캐시, 파일명 기반 ETag).
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.image_pipeline import get_executor
+from app.utils.file_handler import resolve_upload_path
+from app.utils.image_processor import render_variant
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 파일 락 없이 동작
+    fcntl = None
+
+# 변형 포맷 (쿼리 값 -> Pillow 포맷, 확장자, MIME 타입)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", ".webp", "image/webp"),
+    "jpeg": ("JPEG", ".jpg", "image/jpeg"),
+    "png": ("PNG", ".png", "image/png"),
+}
+
+# 캐시 적중 시 마지막 사용 시각(mtime)을 갱신하는 최소 간격
+TOUCH_INTERVAL_SECONDS = 3600
+
+# 다른 워커가 만든 변형까지 포함해 실제 사용량을 다시 계산하는 간격
+RESCAN_INTERVAL_SECONDS = 60
+
+# 용량을 넘으면 이 비율까지 줄인다 (매번 조금씩 지우지 않도록)
+EVICT_TARGET_RATIO = 0.9
+
+# 워커 간 생성 락 파일 수 (변형마다 락 파일을 만들지 않고 해시로 나눠 쓴다)
+LOCK_STRIPES = 64
+
+# 다른 워커가 같은 락으로 변형을 만드는 중일 때 다시 시도하는 간격
+LOCK_POLL_SECONDS = 0.05
+
+class VariantCache:
+    """크기 제한 디스크 캐시 (LRU, 워커 간 공유)"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._estimated: Optional[int] = None
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def variant_name(self, filename: str, width: int, fmt: str) -> str:
+        """변형 파일명 (원본 파일명, 너비, 포맷, 품질로 결정)"""
+        quality = settings.image_webp_quality if fmt == "webp" else settings.image_jpeg_quality
+        digest = hashlib.sha1(f"{filename}|{width}|{fmt}|{quality}".encode("utf-8")).hexdigest()
+        return f"{digest[:2]}/{digest}-w{width}{VARIANT_FORMATS[fmt][1]}"
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def lookup(self, path: str) -> Optional[os.stat_result]:
+        """캐시된 변형 확인 (있으면 사용 시각 갱신)"""
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if time.time() - stat_result.st_mtime > TOUCH_INTERVAL_SECONDS:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+        return stat_result
+
+    def _stripe_path(self, name: str) -> str:
+        stripe = int(hashlib.sha1(name.encode("utf-8")).hexdigest()[:8], 16) % LOCK_STRIPES
+        return os.path.join(self.directory, ".locks", f"{stripe}.lock")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """캐시 파일 목록 (mtime, 크기, 경로), 숨김 파일(쓰는 중인 임시 파일, 락)은 제외"""
+        entries = []
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat_result = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat_result.st_mtime, stat_result.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """용량을 넘었으면 오래 쓰지 않은 변형부터 삭제 (지운 파일 수)
+
+        다른 워커가 정리 중이면 건너뛴다.
+        """
+        lock_path = os.path.join(self.directory, ".locks", "evict.lock")
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return 0
+
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            if total > self.max_bytes:
+                target = self.max_bytes * EVICT_TARGET_RATIO
+                for _, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    removed += 1
+
+            with self._lock:
+                self._estimated = total
+                self._scanned_at = time.monotonic()
+            return removed
+
+    def record(self, size: int) -> None:
+        """새 변형 크기 반영 (추정 사용량이 넘었거나 오래되었으면 정리)"""
+        with self._lock:
+            if self._estimated is not None:
+                self._estimated += size
+            due = (
+                self._estimated is None
+                or self._estimated > self.max_bytes
+                or time.monotonic() - self._scanned_at > RESCAN_INTERVAL_SECONDS
+            )
+        if due:
+            self.evict()
+
+    def _open_lock(self, name: str):
+        """변형 생성 락 파일 열기 (디렉토리가 없으면 만든다), 스레드에서 실행"""
+        os.makedirs(os.path.dirname(self.path_for(name)), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, ".locks"), exist_ok=True)
+        return open(self._stripe_path(name), "a")
+
+    async def _generate(self, source_path: str, name: str, width: int, fmt: str) -> os.stat_result:
+        """워커 간 락을 잡고 (다른 워커가 만들지 않았으면) 변형 생성
+
+        락을 기다리거나 프로세스 풀 작업을 기다리는 동안 스레드를 붙잡지 않도록
+        락은 non-blocking으로 다시 시도하고 작업 결과는 이벤트 루프에서 기다린다.
+        """
+        path = self.path_for(name)
+        lock_file = await run_in_threadpool(self._open_lock, name)
+        try:
+            if fcntl is not None:
+                while True:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(LOCK_POLL_SECONDS)
+            stat_result = await run_in_threadpool(self.lookup, path)
+            if stat_result is not None:
+                return stat_result
+
+            quality = settings.image_webp_quality if fmt == "webp" else settings.image_jpeg_quality
+            job = partial(render_variant, source_path, path, width, VARIANT_FORMATS[fmt][0], quality)
+            await asyncio.wrap_future(get_executor().submit(job))
+            stat_result = await run_in_threadpool(os.stat, path)
+        finally:
+            lock_file.close()
+
+        await run_in_threadpool(self.record, stat_result.st_size)
+        return stat_result
+
+    def _find(self, filename: str, path: str) -> Tuple[Optional[str], Optional[os.stat_result]]:
+        """원본 경로(없거나 업로드 디렉토리 밖이면 None)와 캐시된 변형 stat, 스레드에서 실행"""
+        source_path = resolve_upload_path(filename)
+        if source_path is None or not os.path.isfile(source_path):
+            return None, None
+        return source_path, self.lookup(path)
+
+    async def get_or_create(self, filename: str, width: int, fmt: str) -> Optional[Tuple[str, os.stat_result]]:
+        """변형 경로와 stat (원본이 없으면 None, 없으면 만들고, 같은 변형을 만드는 중이면 함께 기다린다)"""
+        name = self.variant_name(filename, width, fmt)
+        path = self.path_for(name)
+        source_path, stat_result = await run_in_threadpool(self._find, filename, path)
+        if source_path is None:
+            return None
+        if stat_result is not None:
+            return path, stat_result
+
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(source_path, name, width, fmt))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        # 먼저 요청한 클라이언트가 끊겨도 기다리는 다른 요청을 위해 작업은 계속한다
+        return path, await asyncio.shield(task)
+
+variant_cache = VariantCache(settings.image_variant_dir, settings.image_variant_cache_bytes)
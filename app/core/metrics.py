@@ -0,0 +1,438 @@
+"""프로세스 간 합산되는 메트릭 (Prometheus 텍스트 형식, GET /metrics)
+
+기록은 스레드별 저장소(threading.local)에 쓰므로 요청 처리 경로에서 락을 잡지 않는다.
+각 워커는 주기적으로(METRICS_FLUSH_SECONDS) 자기 값을 METRICS_DIR/worker-<pid>-<token>.json에 스냅샷으로 쓰고,
+/metrics를 처리하는 워커는 자기 최신 값과 다른 워커들의 스냅샷을 합산한다.
+따라서 다른 워커의 값은 최대 한 주기만큼 늦을 수 있다.
+
+- counter, histogram: 종료된 워커의 값도 계속 합산한다 (합계가 줄어들지 않도록).
+  종료된 워커의 스냅샷은 archive.json으로 합쳐 파일 수가 늘어나지 않게 한다.
+- gauge: 살아 있는 워커의 값만 합산한다.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 파일 락 없이 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+IMAGE_PROCESS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+ARCHIVE_FILE = "archive.json"
+LOCK_FILE = ".lock"
+
+class _ThreadToken:
+    """스레드 종료를 알기 위한 객체 (스레드 로컬에만 두므로 스레드가 끝나면 사라진다)"""
+    __slots__ = ("__weakref__",)
+
+class MetricsRegistry:
+    """메트릭 정의와 스레드별 값 저장소
+
+    스레드풀 스레드는 쉬면 종료되고 새 스레드로 바뀌므로, 종료된 스레드의 저장소는
+    retired로 합쳐서 저장소 목록과 collect() 비용이 프로세스 수명 동안 늘어나지 않게 한다.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, "Metric"] = {}
+        self.collectors: List[Callable[[], Iterable[Tuple[str, LabelValues, float]]]] = []
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._retired: Dict[Tuple[str, LabelValues], object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        self.metrics[metric.name] = metric
+
+    def shard(self) -> dict:
+        """현재 스레드의 값 저장소 (스레드마다 하나, 해당 스레드만 쓴다)"""
+        values = getattr(self._local, "values", None)
+        if values is None:
+            values = self._local.values = {}
+            token = self._local.token = _ThreadToken()
+            weakref.finalize(token, self._retire, values)
+            with self._lock:
+                self._shards.append(values)
+        return values
+
+    def _retire(self, values: dict) -> None:
+        """종료된 스레드의 값을 retired에 합치고 저장소 목록에서 뺀다"""
+        with self._lock:
+            self._shards.remove(values)
+            for key, value in values.items():
+                merge_value(self._retired, key, value)
+
+    def collect(self) -> Dict[Tuple[str, LabelValues], object]:
+        """현재 프로세스의 값 (종료된 스레드 값, 스레드별 값, 수집 함수 결과 합산)"""
+        merged: Dict[Tuple[str, LabelValues], object] = {}
+        with self._lock:
+            shards = list(self._shards)
+            for key, value in self._retired.items():
+                merge_value(merged, key, value)
+        for shard in shards:
+            for key, value in list(shard.items()):
+                merge_value(merged, key, value)
+        for collector in self.collectors:
+            try:
+                for name, labels, value in collector():
+                    merge_value(merged, (name, tuple(labels)), value)
+            except Exception as e:
+                logger.warning("metrics collector failed: %s", e)
+        return merged
+
+registry = MetricsRegistry()
+
+def merge_value(merged: dict, key, value) -> None:
+    current = merged.get(key)
+    if current is None:
+        merged[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(value, list):
+        merged[key] = [a + b for a, b in zip(current, value)]
+    else:
+        merged[key] = current + value
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        shard = registry.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+class Gauge(Metric):
+    """값을 더하고 빼는 gauge (종료된 워커의 값은 합산하지 않는다)"""
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        shard = registry.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        self.inc(-amount, labels)
+
+class Histogram(Metric):
+    """구간별 관측 수와 합계 (저장 형식: [구간별 수..., +Inf 구간 수, 합계])"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        shard = registry.shard()
+        key = (self.name, labels)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+def register_collector(collector: Callable[[], Iterable[Tuple[str, LabelValues, float]]]) -> None:
+    """스냅샷을 만들 때 호출할 수집 함수 등록 (커넥션 풀 크기, 캐시 통계처럼 읽기만 하면 되는 값)"""
+    registry.collectors.append(collector)
+
+# 요청
+http_requests_in_flight = Gauge("http_requests_in_flight", "처리 중인 요청 수")
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "요청 처리 시간", ("method", "route", "status")
+)
+
+# 커넥션 풀
+db_pool_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "커넥션 풀에서 연결을 얻기까지 기다린 시간", ("pool",), POOL_WAIT_BUCKETS
+)
+db_pool_connections = Gauge("db_pool_connections", "커넥션 풀 연결 수", ("pool", "state"))
+
+# 업로드와 이미지 처리
+upload_files = Counter("upload_files_total", "업로드 파일 수", ("result",))
+upload_bytes = Counter("upload_bytes_total", "저장된 업로드 파일 크기 합계")
+image_process_duration = Histogram(
+    "image_process_seconds", "이미지 최적화 시간 (프로세스 풀 대기 포함)", ("result",), IMAGE_PROCESS_BUCKETS
+)
+
+# 캐시
+cache_requests = Counter("cache_requests_total", "캐시 조회 수", ("cache", "result"))
+cache_hit_ratio = Gauge("cache_hit_ratio", "캐시 적중률 (모든 워커 합산)", ("cache",))
+
+# --- 워커 간 합산 ---
+
+def _metrics_dir() -> str:
+    return os.path.abspath(settings.metrics_dir)
+
+# 스냅샷을 쓰는 프로세스 (pid, 임의 토큰)
+_instance: Tuple[int, str] = (0, "")
+
+def _snapshot_name() -> str:
+    """현재 프로세스의 스냅샷 파일명
+
+    PID가 재사용돼도 종료된 이전 프로세스의 스냅샷을 덮어쓰지 않도록 프로세스마다 임의 토큰을 붙인다.
+    fork된 워커는 PID가 바뀌므로 새 토큰을 만든다.
+    """
+    global _instance
+    pid = os.getpid()
+    if _instance[0] != pid:
+        _instance = (pid, uuid.uuid4().hex[:12])
+    return f"worker-{pid}-{_instance[1]}.json"
+
+def _snapshot_pid(entry: str) -> Optional[int]:
+    """스냅샷 파일명의 PID (스냅샷 파일이 아니면 None)"""
+    if not (entry.startswith("worker-") and entry.endswith(".json")):
+        return None
+    return int(entry[len("worker-"):-len(".json")].split("-")[0])
+
+def _encode(values: dict) -> list:
+    return [[name, list(labels), value] for (name, labels), value in values.items()]
+
+def _decode(samples: list) -> dict:
+    return {(name, tuple(labels)): value for name, labels, value in samples}
+
+def _write_json(path: str, data) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def _read_json(path: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _is_gauge(name: str) -> bool:
+    metric = registry.metrics.get(name)
+    return metric is not None and metric.kind == "gauge"
+
+class _DirectoryLock:
+    """스냅샷 디렉토리 락 (읽기는 공유, 보관 파일 정리는 배타)"""
+
+    def __init__(self, exclusive: bool, blocking: bool = True):
+        self.flags = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) if fcntl else 0
+        if fcntl and not blocking:
+            self.flags |= fcntl.LOCK_NB
+        self.fd = None
+
+    def __enter__(self) -> bool:
+        if fcntl is None:
+            return True
+        self.fd = os.open(os.path.join(_metrics_dir(), LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self.fd, self.flags)
+        except BlockingIOError:
+            os.close(self.fd)
+            self.fd = None
+            return False
+        return True
+
+    def __exit__(self, *exc) -> None:
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+
+def _archive_dead_workers() -> None:
+    """종료된 워커의 스냅샷을 보관 파일로 합치기 (다른 워커가 정리 중이면 건너뛴다)"""
+    with _DirectoryLock(exclusive=True, blocking=False) as locked:
+        if not locked:
+            return
+        directory = _metrics_dir()
+        dead = []
+        for entry in os.listdir(directory):
+            pid = _snapshot_pid(entry)
+            if pid is not None and not _process_alive(pid):
+                dead.append(os.path.join(directory, entry))
+        if not dead:
+            return
+
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        archived = _decode((_read_json(archive_path) or {}).get("samples", []))
+        for path in dead:
+            for key, value in _decode((_read_json(path) or {}).get("samples", [])).items():
+                if not _is_gauge(key[0]):
+                    merge_value(archived, key, value)
+        _write_json(archive_path, {"samples": _encode(archived)})
+        for path in dead:
+            os.remove(path)
+
+def write_snapshot() -> None:
+    """현재 워커의 값을 스냅샷 파일로 저장"""
+    os.makedirs(_metrics_dir(), exist_ok=True)
+    path = os.path.join(_metrics_dir(), _snapshot_name())
+    _write_json(path, {"pid": os.getpid(), "written_at": time.time(), "samples": _encode(registry.collect())})
+    _archive_dead_workers()
+
+def aggregate() -> dict:
+    """모든 워커의 값 합산 (현재 워커는 최신 값 사용)"""
+    os.makedirs(_metrics_dir(), exist_ok=True)
+    merged: dict = {}
+    own = registry.collect()
+    own_name = _snapshot_name()
+    with _DirectoryLock(exclusive=False):
+        directory = _metrics_dir()
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            pid = _snapshot_pid(entry)
+            if entry == ARCHIVE_FILE:
+                samples = _decode((_read_json(path) or {}).get("samples", []))
+                alive = False
+            elif pid is not None:
+                if entry == own_name:
+                    continue
+                samples = _decode((_read_json(path) or {}).get("samples", []))
+                alive = _process_alive(pid)
+            else:
+                continue
+            for key, value in samples.items():
+                if alive or not _is_gauge(key[0]):
+                    merge_value(merged, key, value)
+    for key, value in own.items():
+        merge_value(merged, key, value)
+
+    # 적중률은 합산한 조회 수로 계산한다
+    for (name, labels), value in list(merged.items()):
+        if name == cache_requests.name and labels[1] == "hit":
+            misses = merged.get((name, (labels[0], "miss")), 0.0)
+            total = value + misses
+            merged[(cache_hit_ratio.name, (labels[0],))] = value / total if total else 0.0
+    return merged
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def render(values: dict) -> str:
+    """Prometheus 텍스트 형식 (0.0.4)"""
+    by_name: Dict[str, list] = {}
+    for (name, labels), value in values.items():
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(by_name):
+        metric = registry.metrics.get(name)
+        if metric is None:
+            continue
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(by_name[name]):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{_labels(metric.labelnames, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + (float("inf"),), value[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{name}_bucket{_labels(metric.labelnames, labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(metric.labelnames, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(metric.labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+def render_metrics() -> str:
+    """/metrics 응답 본문 (파일을 읽으므로 스레드풀에서 호출)"""
+    return render(aggregate())
+
+_flush_task: Optional[asyncio.Task] = None
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.metrics_flush_seconds)
+        try:
+            write_snapshot()
+        except OSError as e:
+            logger.warning("metrics snapshot failed: %s", e)
+
+def start_metrics() -> None:
+    """주기적 스냅샷 시작 (앱 시작 시)"""
+    global _flush_task
+    if settings.metrics_enabled and _flush_task is None:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_loop())
+
+def stop_metrics() -> None:
+    """주기적 스냅샷 중지 후 마지막 값 저장 (앱 종료 시)"""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        _flush_task = None
+        try:
+            write_snapshot()
+        except OSError as e:
+            logger.warning("metrics snapshot failed: %s", e)
+
+def route_label(scope: Scope) -> str:
+    """경로 템플릿 (/api/reviews/{review_id}), 라우트가 없으면 고정 값 (레이블 수가 늘어나지 않게)"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("path", "").startswith("/uploads/"):
+        return "/uploads"
+    return "unmatched"
+
+class MetricsMiddleware:
+    """요청 처리 시간과 처리 중인 요청 수 기록 (ASGI 미들웨어)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            http_request_duration.observe(
+                time.perf_counter() - started, (scope["method"], route_label(scope), str(status_code))
+            )
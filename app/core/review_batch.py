@@ -0,0 +1,280 @@
+"""리뷰 일괄 쓰기 (POST /api/reviews/batch)
+
+이전 사이트 데이터 이전처럼 대량으로 쓸 때 사용한다. 항목을 청크 단위 트랜잭션으로 나눠 적용하고,
+청크 안에서 같은 연산이 이어지는 구간은 ORM 객체를 만들지 않고 Core INSERT/UPDATE/DELETE로 묶어 실행한다.
+ORM 이벤트를 거치지 않으므로 지역 컬럼, 집계(adjust_review_aggregates), 파일 참조 수(adjust_blob_refs),
+응답 조각(render_review_fragments)은 여기서 직접 갱신한다. 검색 인덱스는 트리거로 갱신된다.
+"""
+import itertools
+import json
+import logging
+from typing import Any, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models.review import Review
+from app.models.image import IMAGE_FILE_COLUMNS, ReviewImage, adjust_blob_refs
+from app.models.aggregate import adjust_review_aggregates
+from app.core.review_fragments import delete_review_fragments, render_review_fragments
+from app.schemas.review import ReviewBatchItem, ReviewCreate
+from app.utils.file_handler import get_file_url, stored_file_exists
+from app.utils.region import extract_region
+
+logger = logging.getLogger(__name__)
+
+# reviews.status 제약 조건과 같은 값
+REVIEW_STATUSES = ("draft", "published", "deleted")
+
+# 일괄 쓰기에서 지정할 수 있는 리뷰 컬럼 (ReviewUpdate 필드)
+REVIEW_FIELDS = (
+    "team", "title", "content", "from_location", "to_location", "from_date", "to_date", "rating", "status"
+)
+
+# 수정/삭제 전에 읽어 두는 컬럼 (집계 증감용)
+AGGREGATE_COLUMNS = (Review.id, Review.status, Review.team, Review.rating, Review.from_region, Review.to_region)
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+class BatchEntry:
+    """검증을 통과한 항목"""
+    __slots__ = ("index", "op", "review_id", "values", "images")
+
+    def __init__(self, index: int, op: str, review_id: Optional[int], values: dict, images: Optional[List[str]]):
+        self.index = index
+        self.op = op
+        self.review_id = review_id
+        self.values = values
+        self.images = images
+
+class BatchOutcome:
+    """일괄 쓰기 결과 (항목별 결과와 커밋 후 처리할 작업)"""
+
+    def __init__(self, size: int):
+        self.results: List[Optional[dict]] = [None] * size
+        self.new_image_ids: List[int] = []
+        self.removed_files: List[str] = []
+        self.committed = False
+
+    def succeed(self, entry: BatchEntry, review_id: int) -> None:
+        self.results[entry.index] = {"index": entry.index, "op": entry.op, "success": True, "id": review_id}
+
+    def fail(self, index: int, op: Optional[str], error: str, review_id: Optional[int] = None) -> None:
+        self.results[index] = {"index": index, "op": op, "success": False, "id": review_id, "error": error}
+
+    def summary(self) -> dict:
+        counts = {"created": 0, "updated": 0, "deleted": 0, "failed": 0}
+        for result in self.results:
+            if not result["success"]:
+                counts["failed"] += 1
+            else:
+                counts[{"create": "created", "update": "updated", "delete": "deleted"}[result["op"]]] += 1
+        return counts
+
+def parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """요청 본문을 항목 목록으로 변환 (JSON 배열, {"items": [...]}, NDJSON)
+
+    형식이 잘못되면 ValueError.
+    """
+    text = body.decode("utf-8")
+    if content_type.split(";")[0].strip().lower() in NDJSON_TYPES:
+        items = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{line_number}번째 줄이 올바른 JSON이 아닙니다: {e.msg}") from e
+        return items
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"올바른 JSON이 아닙니다: {e.msg}") from e
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise ValueError("JSON 배열 또는 {\"items\": [...]} 형식이어야 합니다.")
+    return data
+
+def _format_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+def validate_item(index: int, raw: Any, outcome: BatchOutcome) -> Optional[BatchEntry]:
+    """항목 하나 검증 (실패하면 결과에 기록하고 None)"""
+    op = raw.get("op") if isinstance(raw, dict) else None
+    try:
+        item = ReviewBatchItem.model_validate(raw)
+    except ValidationError as e:
+        outcome.fail(index, op, _format_errors(e))
+        return None
+
+    values = item.model_dump(include=set(REVIEW_FIELDS), exclude_none=True)
+    if item.op == "create":
+        try:
+            values = ReviewCreate(**values).model_dump()
+        except ValidationError as e:
+            outcome.fail(index, item.op, _format_errors(e))
+            return None
+    elif item.id is None:
+        outcome.fail(index, item.op, "id가 필요합니다.")
+        return None
+
+    if "status" in values and values["status"] not in REVIEW_STATUSES:
+        outcome.fail(index, item.op, f"status는 {', '.join(REVIEW_STATUSES)} 중 하나여야 합니다.", item.id)
+        return None
+
+    if item.images:
+        missing = [filename for filename in item.images if not stored_file_exists(filename)]
+        if missing:
+            outcome.fail(index, item.op, f"업로드되지 않은 이미지: {', '.join(missing)}", item.id)
+            return None
+
+    return BatchEntry(index, item.op, item.id, values, item.images)
+
+def _with_regions(values: dict) -> dict:
+    """지역 컬럼 추가 (ORM 훅 대신)"""
+    values = dict(values)
+    if "from_location" in values:
+        values["from_region"] = extract_region(values["from_location"])
+    if "to_location" in values:
+        values["to_region"] = extract_region(values["to_location"])
+    return values
+
+def _insert_images(connection, images: List[dict]) -> List[int]:
+    """이미지 행 일괄 INSERT (파일 참조 수 포함), 새 id 목록 반환"""
+    if not images:
+        return []
+    image_ids = connection.execute(
+        insert(ReviewImage).returning(ReviewImage.id, sort_by_parameter_order=True), images
+    ).scalars().all()
+    adjust_blob_refs(connection, [image["image_filename"] for image in images], 1)
+    return list(image_ids)
+
+def _image_rows(review_id: int, filenames: List[str]) -> List[dict]:
+    return [
+        {"review_id": review_id, "image_url": get_file_url(filename), "image_filename": filename, "sort_order": i}
+        for i, filename in enumerate(filenames)
+    ]
+
+def _remove_images(connection, review_ids, removed_files: List[str]) -> None:
+    """리뷰들의 이미지 행 삭제 (파일 참조 수 포함, 파일은 커밋 후 지운다)"""
+    files = [
+        filename
+        for row in connection.execute(
+            select(*(getattr(ReviewImage, column) for column in IMAGE_FILE_COLUMNS)).where(ReviewImage.review_id.in_(review_ids))
+        )
+        for filename in row
+        if filename
+    ]
+    if not files:
+        return
+    connection.execute(delete(ReviewImage).where(ReviewImage.review_id.in_(review_ids)))
+    adjust_blob_refs(connection, files, -1)
+    removed_files.extend(files)
+
+def _load_current(connection, review_ids) -> dict:
+    rows = connection.execute(select(*AGGREGATE_COLUMNS).where(Review.id.in_(set(review_ids)))).mappings()
+    return {row["id"]: dict(row) for row in rows}
+
+def _create_run(connection, entries: List[BatchEntry], user_id: int, outcome: BatchOutcome, staged: dict) -> None:
+    rows = [{**_with_regions(entry.values), "user_id": user_id} for entry in entries]
+    review_ids = connection.execute(
+        insert(Review).returning(Review.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    adjust_review_aggregates(connection, rows, 1)
+
+    images = []
+    for entry, review_id in zip(entries, review_ids):
+        images.extend(_image_rows(review_id, entry.images or []))
+    staged["image_ids"].extend(_insert_images(connection, images))
+    render_review_fragments(connection, review_ids)
+
+    for entry, review_id in zip(entries, review_ids):
+        outcome.succeed(entry, review_id)
+
+def _update_run(connection, entries: List[BatchEntry], outcome: BatchOutcome, staged: dict) -> None:
+    current = _load_current(connection, [entry.review_id for entry in entries])
+    before, after = [], []
+    for entry in entries:
+        old = current.get(entry.review_id)
+        if old is None:
+            outcome.fail(entry.index, entry.op, "리뷰를 찾을 수 없습니다.", entry.review_id)
+            continue
+
+        values = _with_regions(entry.values)
+        connection.execute(
+            update(Review).where(Review.id == entry.review_id).values(**values, updated_at=func.now())
+        )
+        new = {**old, **{key: value for key, value in values.items() if key in old}}
+        before.append(old)
+        after.append(new)
+        current[entry.review_id] = new
+
+        if entry.images is not None:
+            _remove_images(connection, [entry.review_id], staged["removed_files"])
+            staged["image_ids"].extend(_insert_images(connection, _image_rows(entry.review_id, entry.images)))
+
+        outcome.succeed(entry, entry.review_id)
+
+    adjust_review_aggregates(connection, before, -1)
+    adjust_review_aggregates(connection, after, 1)
+    render_review_fragments(connection, [values["id"] for values in after])
+
+def _delete_run(connection, entries: List[BatchEntry], outcome: BatchOutcome, staged: dict) -> None:
+    current = _load_current(connection, [entry.review_id for entry in entries])
+    deleted = {}
+    for entry in entries:
+        if entry.review_id not in current or entry.review_id in deleted:
+            outcome.fail(entry.index, entry.op, "리뷰를 찾을 수 없습니다.", entry.review_id)
+            continue
+        deleted[entry.review_id] = current[entry.review_id]
+        outcome.succeed(entry, entry.review_id)
+
+    if not deleted:
+        return
+    _remove_images(connection, list(deleted), staged["removed_files"])
+    connection.execute(delete(Review).where(Review.id.in_(list(deleted))))
+    delete_review_fragments(connection, deleted)
+    adjust_review_aggregates(connection, deleted.values(), -1)
+
+RUNNERS = {"update": _update_run, "delete": _delete_run}
+
+def apply_review_batch(db: Session, raw_items: List[Any], user_id: int, chunk_size: int) -> BatchOutcome:
+    """항목 목록을 청크 단위 트랜잭션으로 적용
+
+    청크 하나가 실패하면(제약 조건 위반 등) 그 청크만 롤백하고 청크의 모든 항목을 실패로 기록한다.
+    동기 세션을 사용하므로 스레드풀에서 호출한다.
+    """
+    outcome = BatchOutcome(len(raw_items))
+    entries = [validate_item(index, raw, outcome) for index, raw in enumerate(raw_items)]
+    entries = [entry for entry in entries if entry is not None]
+
+    for start in range(0, len(entries), chunk_size):
+        chunk = entries[start:start + chunk_size]
+        staged = {"image_ids": [], "removed_files": []}
+        try:
+            connection = db.connection()
+            # 연산 순서를 지키기 위해 같은 연산이 이어지는 구간 단위로 묶는다
+            for op, run in itertools.groupby(chunk, key=lambda entry: entry.op):
+                run = list(run)
+                if op == "create":
+                    _create_run(connection, run, user_id, outcome, staged)
+                else:
+                    RUNNERS[op](connection, run, outcome, staged)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("review batch chunk failed: %s", e)
+            for entry in chunk:
+                outcome.fail(entry.index, entry.op, f"트랜잭션 실패: {e.__class__.__name__}", entry.review_id)
+            continue
+
+        outcome.committed = True
+        outcome.new_image_ids.extend(staged["image_ids"])
+        outcome.removed_files.extend(staged["removed_files"])
+
+    return outcome
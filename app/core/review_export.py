@@ -0,0 +1,128 @@
+"""리뷰 내보내기 (GET /api/reviews/export)
+
+id 순서로 일정 개수씩 끊어 읽고(keyset), 각 묶음의 이미지를 IN 쿼리 한 번으로 붙여 바로 내보낸다.
+메모리에는 한 묶음만 올라가므로 리뷰 수와 관계없이 사용량이 일정하다.
+묶음마다 세션을 새로 열어 긴 읽기 트랜잭션이 WAL 체크포인트를 막지 않게 한다.
+모든 행에 id가 있고 id 순서로 내보내므로, 끊긴 다운로드는 마지막으로 받은 id를 after_id로 넘겨 이어받을 수 있다.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models.review import Review
+from app.models.image import ReviewImage
+from app.utils.file_handler import get_file_url
+
+# 내보내는 리뷰 컬럼 (순서대로 CSV 헤더가 된다)
+EXPORT_COLUMNS = (
+    Review.id,
+    Review.user_id,
+    Review.status,
+    Review.team,
+    Review.title,
+    Review.content,
+    Review.from_location,
+    Review.to_location,
+    Review.from_region,
+    Review.to_region,
+    Review.from_date,
+    Review.to_date,
+    Review.rating,
+    Review.created_at,
+    Review.updated_at,
+)
+CSV_HEADER = [column.key for column in EXPORT_COLUMNS] + ["images"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+async def _export_images(db, review_ids: List[int]) -> Dict[int, List[dict]]:
+    images: Dict[int, List[dict]] = {review_id: [] for review_id in review_ids}
+    stmt = select(
+        ReviewImage.review_id,
+        ReviewImage.id,
+        ReviewImage.image_filename,
+        ReviewImage.optimized_filename,
+        ReviewImage.webp_filename,
+        ReviewImage.sort_order,
+        ReviewImage.image_width,
+        ReviewImage.image_height,
+    ).where(ReviewImage.review_id.in_(review_ids))\
+        .order_by(ReviewImage.review_id, ReviewImage.sort_order, ReviewImage.id)
+    for row in await db.execute(stmt):
+        images[row.review_id].append({
+            "id": row.id,
+            "image_url": get_file_url(row.image_filename),
+            "optimized_url": get_file_url(row.optimized_filename) if row.optimized_filename else None,
+            "webp_url": get_file_url(row.webp_filename) if row.webp_filename else None,
+            "sort_order": row.sort_order,
+            "width": row.image_width,
+            "height": row.image_height,
+        })
+    return images
+
+async def iter_export_batches(
+    after_id: int,
+    status_filter: Optional[str],
+    batch_size: int
+) -> AsyncIterator[List[dict]]:
+    """id 순서로 리뷰를 묶음 단위로 읽기 (이미지 포함)"""
+    while True:
+        async with AsyncSessionLocal() as db:
+            stmt = select(*EXPORT_COLUMNS).where(Review.id > after_id).order_by(Review.id).limit(batch_size)
+            if status_filter is not None:
+                stmt = stmt.where(Review.status == status_filter)
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                return
+            images = await _export_images(db, [row.id for row in rows])
+
+        yield [
+            {**{key: _value(value) for key, value in row._mapping.items()}, "images": images[row.id]}
+            for row in rows
+        ]
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1].id
+
+async def stream_ndjson(after_id: int, status_filter: Optional[str], batch_size: int) -> AsyncIterator[bytes]:
+    """NDJSON (한 줄에 리뷰 하나, 이미지는 images 배열)"""
+    async for batch in iter_export_batches(after_id, status_filter, batch_size):
+        yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch).encode("utf-8")
+
+async def stream_csv(after_id: int, status_filter: Optional[str], batch_size: int) -> AsyncIterator[bytes]:
+    """CSV (images 열은 이미지 URL을 sort_order 순서로 '|'로 연결)
+
+    처음부터 받을 때만 헤더를 쓰고, 이어받을 때(after_id > 0)는 이전 파일 뒤에 붙일 수 있게 생략한다.
+    엑셀에서 한글이 깨지지 않도록 처음부터 받을 때는 BOM을 붙인다.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if after_id == 0:
+        buffer.write("\ufeff")
+        writer.writerow(CSV_HEADER)
+
+    async for batch in iter_export_batches(after_id, status_filter, batch_size):
+        for record in batch:
+            writer.writerow(
+                [record[key] for key in CSV_HEADER[:-1]] + ["|".join(image["image_url"] for image in record["images"])]
+            )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+STREAMERS = {
+    "ndjson": stream_ndjson,
+    "csv": stream_csv,
+}
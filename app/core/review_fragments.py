@@ -0,0 +1,174 @@
+"""리뷰 응답 JSON 조각 (review_fragments)
+
+목록/상세 응답의 리뷰 항목은 관리자가 쓸 때만 바뀌므로, 쓰기 트랜잭션에서 한 번 JSON으로 만들어 저장하고
+조회할 때는 저장된 바이트를 이어 붙이기만 한다. 요청마다 dict를 만들고 jsonable_encoder로 변환하지 않는다.
+
+- ORM 쓰기는 Session after_flush 이벤트가 바뀐 리뷰의 조각을 같은 트랜잭션에서 다시 만든다.
+- ORM을 거치지 않는 쓰기(일괄 INSERT 등)는 render_review_fragments / delete_review_fragments를 직접 호출해야 한다.
+- 조각이 없거나 FRAGMENT_VERSION이 다르면 조회할 때 그 자리에서 만들어 응답한다.
+
+orjson이 설치되어 있으면 직렬화에 사용한다 (없으면 표준 json으로 같은 형식을 만든다).
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Sequence
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, delete, event, func, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.review import Review
+from app.models.image import ReviewImage
+from app.models.fragment import ReviewFragment
+from app.core.review_reader import (
+    REVIEW_COLUMNS, build_detail, build_image, build_list_item, fetch_images, fetch_review_row, images_statement
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 응답 형식(build_list_item, build_detail, build_image, get_file_url)이 바뀌면 올린다
+FRAGMENT_VERSION = 2
+
+# 한 번에 다시 만드는 리뷰 수 (IN 목록 크기)
+RENDER_CHUNK_SIZE = 500
+
+def dumps(value) -> bytes:
+    """JSONResponse와 같은 형식(공백 없음, UTF-8)으로 직렬화"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def render_fragment(row, images: List[dict]) -> dict:
+    """리뷰 행과 이미지로 review_fragments 행 생성"""
+    return {
+        "review_id": row.id,
+        "version": FRAGMENT_VERSION,
+        "list_json": dumps(jsonable_encoder(build_list_item(row, images))),
+        "detail_json": dumps(jsonable_encoder(build_detail(row, images))),
+    }
+
+def render_review_fragments(connection, review_ids: Iterable[int]) -> int:
+    """리뷰들의 조각을 다시 만들기 (호출한 트랜잭션에서, 없는 리뷰는 조각만 지운다)"""
+    review_ids = sorted(set(review_ids))
+    table = ReviewFragment.__table__
+    rendered = 0
+    for start in range(0, len(review_ids), RENDER_CHUNK_SIZE):
+        chunk = review_ids[start:start + RENDER_CHUNK_SIZE]
+        rows = connection.execute(select(*REVIEW_COLUMNS).where(Review.id.in_(chunk))).all()
+        images: Dict[int, List[dict]] = {review_id: [] for review_id in chunk}
+        for row in connection.execute(images_statement(chunk)):
+            images[row.review_id].append(build_image(row))
+
+        connection.execute(delete(table).where(table.c.review_id.in_(chunk)))
+        if rows:
+            connection.execute(insert(table), [render_fragment(row, images[row.id]) for row in rows])
+        rendered += len(rows)
+    return rendered
+
+def delete_review_fragments(connection, review_ids: Iterable[int]) -> None:
+    """삭제된 리뷰의 조각 지우기"""
+    review_ids = list(set(review_ids))
+    table = ReviewFragment.__table__
+    for start in range(0, len(review_ids), RENDER_CHUNK_SIZE):
+        connection.execute(delete(table).where(table.c.review_id.in_(review_ids[start:start + RENDER_CHUNK_SIZE])))
+
+def stale_review_ids(connection) -> List[int]:
+    """조각이 없거나 FRAGMENT_VERSION이 다른 리뷰 id 목록"""
+    fragments = ReviewFragment.__table__
+    reviews = Review.__table__
+    return connection.execute(
+        select(reviews.c.id)
+        .outerjoin(fragments, and_(fragments.c.review_id == reviews.c.id, fragments.c.version == FRAGMENT_VERSION))
+        .where(fragments.c.review_id.is_(None))
+    ).scalars().all()
+
+def initialize_review_fragments(connection) -> int:
+    """조각이 없거나 형식이 바뀐 리뷰 (도입 전 데이터) 채우기
+
+    시작할 때마다 호출되므로 개수가 맞으면 리뷰 전체를 훑지 않고 끝낸다.
+    """
+    review_count = connection.execute(select(func.count()).select_from(Review.__table__)).scalar()
+    fragment_count = connection.execute(
+        select(func.count()).select_from(ReviewFragment.__table__).where(ReviewFragment.version == FRAGMENT_VERSION)
+    ).scalar()
+    if review_count == fragment_count:
+        return 0
+    return render_review_fragments(connection, stale_review_ids(connection))
+
+@event.listens_for(Session, "after_flush")
+def _render_flushed(session, flush_context):
+    """flush된 리뷰/이미지 변경을 같은 트랜잭션에서 조각에 반영
+
+    after_flush에서는 new/dirty/deleted가 flush 전 상태 그대로이고 DB에는 이미 반영되어 있으므로,
+    바뀐 리뷰 id만 모아 DB 값(서버 기본값인 created_at/updated_at 포함)으로 다시 만든다.
+    """
+    changed = set()
+    removed = set()
+    for target in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(target, Review):
+            review_id = inspect(target).dict.get("id")
+            (removed if target in session.deleted else changed).add(review_id)
+        elif isinstance(target, ReviewImage):
+            changed.add(inspect(target).dict.get("review_id"))
+
+    changed.discard(None)
+    removed.discard(None)
+    if not changed and not removed:
+        return
+
+    connection = session.connection()
+    if removed:
+        delete_review_fragments(connection, removed)
+    if changed - removed:
+        render_review_fragments(connection, changed - removed)
+
+async def fetch_list_fragments(db: AsyncSession, review_ids: Sequence[int]) -> Dict[int, bytes]:
+    """목록 항목 조각 조회 (조각이 없는 리뷰는 그 자리에서 만든다)"""
+    if not review_ids:
+        return {}
+
+    fragments = dict((await db.execute(
+        select(ReviewFragment.review_id, ReviewFragment.list_json).where(
+            ReviewFragment.review_id.in_(review_ids),
+            ReviewFragment.version == FRAGMENT_VERSION
+        )
+    )).all())
+
+    missing = [review_id for review_id in review_ids if review_id not in fragments]
+    if missing:
+        rows = (await db.execute(select(*REVIEW_COLUMNS).where(Review.id.in_(missing)))).all()
+        images = await fetch_images(db, missing)
+        for row in rows:
+            fragments[row.id] = dumps(jsonable_encoder(build_list_item(row, images[row.id])))
+    return fragments
+
+async def fetch_detail_fragment(db: AsyncSession, review_id: int):
+    """상세 조각과 검증자용 컬럼 조회 (리뷰가 없으면 None, 조각이 없으면 detail_json이 None)"""
+    stmt = select(Review.id, Review.updated_at, ReviewFragment.detail_json)\
+        .outerjoin(ReviewFragment, and_(
+            ReviewFragment.review_id == Review.id,
+            ReviewFragment.version == FRAGMENT_VERSION
+        ))\
+        .where(Review.id == review_id)
+    return (await db.execute(stmt)).first()
+
+async def render_detail(db: AsyncSession, review_id: int) -> Optional[bytes]:
+    """조각이 없는 리뷰의 상세 JSON을 그 자리에서 만들기"""
+    row = await fetch_review_row(db, review_id)
+    if row is None:
+        return None
+    images = await fetch_images(db, [row.id])
+    return dumps(jsonable_encoder(build_detail(row, images[row.id])))
+
+def list_body(fragments: Iterable[bytes], pagination: dict, **extra) -> bytes:
+    """목록 응답 본문 ({"success": true, "data": {**extra, "reviews": [...], "pagination": {...}}})"""
+    parts = [b'{"success":true,"data":{']
+    for key, value in extra.items():
+        parts.append(dumps(key) + b":" + dumps(value) + b",")
+    parts += [b'"reviews":[', b",".join(fragments), b'],"pagination":', dumps(pagination), b"}}"]
+    return b"".join(parts)
+
+def detail_body(fragment: bytes) -> bytes:
+    """상세 응답 본문 ({"success": true, "data": {...}})"""
+    return b'{"success":true,"data":' + fragment + b"}"
@@ -0,0 +1,335 @@
+"""리뷰 조회 전용 경로
+
+목록/상세 응답에 필요한 컬럼만 선택하고 ORM 객체를 만들지 않는다.
+이미지는 리뷰마다 지연 로딩하지 않고 한 번의 IN 쿼리로 묶어서 가져온다.
+비동기 세션(AsyncSession)으로 조회하므로 이벤트 루프를 막지 않는다.
+"""
+import base64
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import select, desc, func, or_, and_, String, type_coerce, table, column, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.review import Review, SEARCH_TABLE, SEARCH_COLUMNS, search_index_exists
+from app.models.image import ReviewImage
+from app.models.aggregate import ReviewFacetCount, ReviewStats, FACET_COLUMNS, RATING_COLUMNS
+from app.utils.file_handler import get_file_url
+
+# 목록/상세 응답에서 사용하는 리뷰 컬럼
+REVIEW_COLUMNS = (
+    Review.id,
+    Review.user_id,
+    Review.team,
+    Review.title,
+    Review.content,
+    Review.from_location,
+    Review.to_location,
+    Review.from_date,
+    Review.to_date,
+    Review.rating,
+    Review.status,
+    Review.created_at,
+    Review.updated_at,
+)
+
+def created_at_key(dialect_name: str):
+    """커서 비교용 created_at (SQLite는 저장된 문자열, 다른 DB는 timestamp 컬럼 그대로)
+
+    SQLite는 날짜를 문자열로 저장하므로 원본 문자열끼리 비교해야 경계 행이 중복되지 않는다.
+    다른 DB는 timestamp 타입이라 문자열과 비교할 수 없으므로 컬럼과 datetime 값을 비교한다.
+    """
+    if dialect_name == "sqlite":
+        return type_coerce(Review.created_at, String)
+    return Review.created_at
+
+def encode_cursor(created_at_raw, review_id: int) -> str:
+    """(created_at, id)를 불투명한 커서 문자열로 인코딩"""
+    if isinstance(created_at_raw, datetime):
+        created_at_raw = created_at_raw.isoformat()
+    raw = f"{created_at_raw}|{review_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """커서 문자열 디코딩 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_raw, review_id = base64.urlsafe_b64decode(padded).decode("utf-8").rsplit("|", 1)
+        datetime.fromisoformat(created_at_raw)
+        return created_at_raw, int(review_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+def next_cursor_for(rows) -> Optional[str]:
+    """페이지 마지막 행 기준 다음 커서"""
+    if not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at_raw, last.id)
+
+def apply_filters(stmt, filters: Optional[Mapping] = None):
+    """필터 조건 적용 (값이 None인 항목은 무시, 컬럼은 FACET_COLUMNS 중 하나)
+
+    (status, 필터 컬럼, created_at, id) 인덱스가 있어 필터 하나와 최신순 정렬을 인덱스로 처리한다.
+    """
+    for name, value in (filters or {}).items():
+        if value is not None:
+            stmt = stmt.where(getattr(Review, name) == value)
+    return stmt
+
+async def count_reviews(db: AsyncSession, status_filter: str, filters: Optional[Mapping] = None) -> int:
+    """상태별 리뷰 개수
+
+    필터가 없거나 하나뿐이면 집계 테이블(review_stats, review_facet_counts)에서 바로 읽고,
+    필터가 여러 개일 때만 인덱스로 센다.
+    """
+    active = {name: value for name, value in (filters or {}).items() if value is not None}
+    if not active:
+        stmt = select(ReviewStats.review_count).where(ReviewStats.status == status_filter)
+        return (await db.execute(stmt)).scalar() or 0
+    if len(active) == 1:
+        (facet, value), = active.items()
+        stmt = select(ReviewFacetCount.count).where(
+            ReviewFacetCount.status == status_filter,
+            ReviewFacetCount.facet == facet,
+            ReviewFacetCount.value == str(value)
+        )
+        return (await db.execute(stmt)).scalar() or 0
+    
+    stmt = select(func.count()).select_from(Review).where(Review.status == status_filter)
+    return (await db.execute(apply_filters(stmt, active))).scalar_one()
+
+async def fetch_review_rows(
+    db: AsyncSession,
+    status_filter: str,
+    offset: int,
+    limit: int,
+    cursor: Optional[Tuple[str, int]] = None,
+    filters: Optional[Mapping] = None,
+    columns: Sequence = REVIEW_COLUMNS
+) -> list:
+    """리뷰 목록 페이지 조회 (행 튜플)
+
+    cursor가 주어지면 OFFSET 대신 (created_at, id) 기준으로 이어서 조회한다.
+    (status, created_at, id) 인덱스를 타므로 페이지 깊이와 무관하게 비용이 같다.
+    columns로 선택할 리뷰 컬럼을 줄일 수 있다 (커서용 created_at 원본 값은 항상 포함).
+    """
+    dialect_name = db.get_bind().dialect.name
+    created_at = created_at_key(dialect_name)
+    stmt = select(*columns, created_at.label("created_at_raw"))\
+        .where(Review.status == status_filter)\
+        .order_by(desc(Review.created_at), desc(Review.id))\
+        .limit(limit)
+    stmt = apply_filters(stmt, filters)
+
+    if cursor is not None:
+        created_at_raw, review_id = cursor
+        if dialect_name != "sqlite":
+            created_at_raw = datetime.fromisoformat(created_at_raw)
+        stmt = stmt.where(or_(
+            created_at < created_at_raw,
+            and_(created_at == created_at_raw, Review.id < review_id)
+        ))
+    else:
+        stmt = stmt.offset(offset)
+
+    return (await db.execute(stmt)).all()
+
+async def fetch_review_row(db: AsyncSession, review_id: int):
+    """리뷰 한 건 조회 (행 튜플)"""
+    stmt = select(*REVIEW_COLUMNS).where(Review.id == review_id)
+    return (await db.execute(stmt)).first()
+
+async def fetch_facet_counts(db: AsyncSession, status_filter: str) -> Dict[str, List[dict]]:
+    """필터 항목별 리뷰 수 (집계 테이블에서 조회, 많은 순)"""
+    facets: Dict[str, List[dict]] = {facet: [] for facet in FACET_COLUMNS}
+    stmt = select(ReviewFacetCount.facet, ReviewFacetCount.value, ReviewFacetCount.count)\
+        .where(ReviewFacetCount.status == status_filter, ReviewFacetCount.count > 0)\
+        .order_by(ReviewFacetCount.facet, desc(ReviewFacetCount.count), ReviewFacetCount.value)
+    for row in await db.execute(stmt):
+        value = int(row.value) if row.facet == "rating" else row.value
+        facets[row.facet].append({"value": value, "count": row.count})
+    return facets
+
+async def fetch_review_stats(db: AsyncSession, status_filter: str) -> dict:
+    """상태별 리뷰 요약 (개수, 평균 평점, 평점 분포, 최근 작성 시각)"""
+    stats = (await db.execute(
+        select(ReviewStats).where(ReviewStats.status == status_filter)
+    )).scalars().first()
+    review_count = stats.review_count if stats else 0
+    
+    return {
+        "status": status_filter,
+        "review_count": review_count,
+        "average_rating": round(stats.rating_sum / review_count, 2) if review_count else None,
+        "rating_histogram": {
+            str(rating): getattr(stats, column) if stats else 0
+            for rating, column in RATING_COLUMNS.items()
+        },
+        "latest_created_at": stats.latest_created_at if stats and review_count else None,
+    }
+
+# 검색 인덱스 (FTS5 external content 테이블)
+search_table = table(SEARCH_TABLE, column("rowid"))
+
+# trigram 토크나이저는 3글자 미만 검색어를 색인으로 찾을 수 없다
+TRIGRAM_MIN_LENGTH = 3
+
+# bm25 컬럼 가중치 (SEARCH_COLUMNS 순서: 제목, 내용, 팀, 출발지, 도착지)
+SEARCH_WEIGHTS = (5.0, 1.0, 3.0, 2.0, 2.0)
+
+_search_index_available: Optional[bool] = None
+
+async def search_index_available(db: AsyncSession) -> bool:
+    """검색 인덱스 사용 가능 여부 (프로세스마다 한 번 확인)"""
+    global _search_index_available
+    if _search_index_available is None:
+        connection = await db.connection()
+        _search_index_available = await connection.run_sync(search_index_exists)
+    return _search_index_available
+
+def split_search_terms(query: str) -> Tuple[List[str], List[str]]:
+    """검색어를 색인 검색어(3글자 이상)와 LIKE 검색어(3글자 미만)로 분리"""
+    terms = list(dict.fromkeys(query.split()))
+    indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    scanned = [term for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+    return indexed, scanned
+
+def _search_statement(columns, query: str, status_filter: str, use_index: bool):
+    """검색 조건이 적용된 SELECT와 정렬 기준 (모든 검색어를 포함하는 리뷰)"""
+    indexed, scanned = split_search_terms(query)
+    if not use_index:
+        indexed, scanned = [], indexed + scanned
+    
+    stmt = select(*columns).select_from(Review).where(Review.status == status_filter)
+    for term in scanned:
+        stmt = stmt.where(or_(*(
+            getattr(Review, name).contains(term, autoescape=True) for name in SEARCH_COLUMNS
+        )))
+    
+    if not indexed:
+        return stmt, (desc(Review.created_at), desc(Review.id))
+    
+    # 각 검색어를 구문으로 감싸 FTS 연산자로 해석되지 않게 한다
+    match = " AND ".join('"{}"'.format(term.replace('"', '""')) for term in indexed)
+    stmt = stmt.join(search_table, search_table.c.rowid == Review.id)\
+        .where(literal_column(SEARCH_TABLE).op("MATCH")(match))
+    rank = func.bm25(literal_column(SEARCH_TABLE), *SEARCH_WEIGHTS)
+    return stmt, (rank, desc(Review.created_at), desc(Review.id))
+
+async def count_search_results(
+    db: AsyncSession,
+    query: str,
+    status_filter: str,
+    use_index: Optional[bool] = None
+) -> int:
+    """검색 결과 개수"""
+    if use_index is None:
+        use_index = await search_index_available(db)
+    stmt, _ = _search_statement((func.count(),), query, status_filter, use_index)
+    return (await db.execute(stmt)).scalar_one()
+
+async def search_review_rows(
+    db: AsyncSession,
+    query: str,
+    status_filter: str,
+    offset: int,
+    limit: int,
+    use_index: Optional[bool] = None,
+    columns: Sequence = REVIEW_COLUMNS
+) -> list:
+    """리뷰 검색 (행 튜플, 관련도순)
+
+    3글자 이상 검색어는 FTS5 인덱스로 찾아 bm25 점수로 정렬하고,
+    3글자 미만 검색어만 있거나 인덱스가 없으면 LIKE 스캔 후 최신순으로 정렬한다.
+    """
+    if use_index is None:
+        use_index = await search_index_available(db)
+    stmt, order_by = _search_statement(columns, query, status_filter, use_index)
+    stmt = stmt.order_by(*order_by).offset(offset).limit(limit)
+    return (await db.execute(stmt)).all()
+
+def images_statement(review_ids: Sequence[int]):
+    """여러 리뷰의 이미지 조회 SELECT (리뷰별 sort_order 순)"""
+    return select(
+        ReviewImage.review_id,
+        ReviewImage.id,
+        ReviewImage.image_filename,
+        ReviewImage.sort_order,
+        ReviewImage.optimized_filename,
+        ReviewImage.webp_filename,
+        ReviewImage.image_width,
+        ReviewImage.image_height,
+        ReviewImage.placeholder,
+    ).where(ReviewImage.review_id.in_(review_ids))\
+        .order_by(ReviewImage.review_id, ReviewImage.sort_order, ReviewImage.id)
+
+def build_image(row) -> dict:
+    """응답의 이미지 항목 생성"""
+    return {
+        "id": row.id,
+        "image_url": get_file_url(row.image_filename),
+        "sort_order": row.sort_order,
+        # 최적화 파이프라인이 채우는 값 (처리 전에는 None)
+        "optimized_url": get_file_url(row.optimized_filename) if row.optimized_filename else None,
+        "webp_url": get_file_url(row.webp_filename) if row.webp_filename else None,
+        "width": row.image_width,
+        "height": row.image_height,
+        "placeholder": row.placeholder
+    }
+
+async def fetch_images(db: AsyncSession, review_ids: Sequence[int]) -> Dict[int, List[dict]]:
+    """여러 리뷰의 이미지를 한 번에 조회"""
+    images: Dict[int, List[dict]] = {review_id: [] for review_id in review_ids}
+    if not review_ids:
+        return images
+
+    for row in await db.execute(images_statement(review_ids)):
+        images[row.review_id].append(build_image(row))
+    return images
+
+def build_list_item(row, images: List[dict]) -> dict:
+    """목록 응답 항목 생성"""
+    # 메인 이미지 (첫 번째 이미지)
+    main_image = images[0]["image_url"] if images else ""
+
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "team": row.team,
+        "title": row.title,
+        "content": row.content,
+        "from_location": row.from_location,
+        "to_location": row.to_location,
+        "from_date": row.from_date,
+        "to_date": row.to_date,
+        "rating": row.rating,
+        "status": row.status,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "userName": f"**님",  # 개인정보 보호
+        "date": "2일전",  # 실제로는 created_at에서 계산
+        "image": main_image,
+        "images": [img["image_url"] for img in images],
+        "images_detail": images
+    }
+
+def build_detail(row, images: List[dict]) -> dict:
+    """상세 응답 생성"""
+    main_image = images[0]["image_url"] if images else ""
+
+    return {
+        "id": row.id,
+        "team": row.team,
+        "title": row.title,
+        "userName": f"**님",
+        "date": "2일전",
+        "fromLocation": row.from_location,
+        "toLocation": row.to_location,
+        "fromDate": row.from_date,
+        "toDate": row.to_date,
+        "rating": row.rating,
+        "image": main_image,
+        "images": [img["image_url"] for img in images],
+        "content": row.content,
+        "created_at": row.created_at,
+        "images_detail": images
+    }
@@ -1,13 +1,30 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.config import settings
 import hashlib
 
+def build_crypt_context() -> CryptContext:
+    """설정된 해시 방식과 비용으로 CryptContext 생성
+
+    설정된 방식 외의 기존 방식(sha256_crypt)도 검증은 되도록 남겨 두고 deprecated로 표시하므로,
+    방식이나 비용이 바뀌면 로그인 성공 시 needs_update로 감지해 다시 해싱할 수 있다.
+    """
+    scheme = settings.password_hash_scheme
+    schemes = [scheme] + [legacy for legacy in ("sha256_crypt",) if legacy != scheme]
+    options = {}
+    if settings.password_hash_rounds:
+        options[f"{scheme}__rounds"] = settings.password_hash_rounds
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
 # 비밀번호 해싱 (bcrypt 대신 SHA-256 사용)
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+pwd_context = build_crypt_context()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
@@ -17,6 +34,58 @@ def get_password_hash(password: str) -> str:
     """비밀번호 해싱"""
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """비밀번호 검증 후 해시 방식/비용이 바뀌었으면 새 해시도 반환"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# 해싱 전용 프로세스 풀
+# passlib sha256_crypt는 순수 파이썬 구현이라 GIL을 잡고 있으므로 스레드로는 이벤트 루프를 보호할 수 없다.
+# 대기 중인 작업 수를 제한해 로그인 폭주 시 줄을 세우지 않고 바로 503을 돌려준다.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_slots = threading.BoundedSemaphore(max(1, settings.password_hash_queue_limit))
+_hash_executor_lock = threading.Lock()
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    """비밀번호 해싱용 프로세스 풀 (처음 사용할 때 생성)"""
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=max(1, settings.password_hash_workers),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _hash_executor
+
+def shutdown_hash_executor() -> None:
+    """해싱 프로세스 풀 종료"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+async def run_password_job(func, *args):
+    """해싱 작업을 프로세스 풀에서 실행 (대기열이 가득 차면 503)"""
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        _hash_slots.release()
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password의 비동기 버전 (프로세스 풀에서 실행)"""
+    return await run_password_job(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash의 비동기 버전 (프로세스 풀에서 실행)"""
+    return await run_password_job(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """JWT 토큰 생성"""
     to_encode = data.copy()
@@ -0,0 +1,81 @@
+"""Server-Timing 응답 헤더 (요청별 SQL 통계)
+
+계측할 요청에만 QueryStats를 컨텍스트 변수로 설정하고, 응답 헤더를 보낼 때 다음 항목을 추가한다.
+
+- db: 쿼리 수와 총 DB 시간
+- db-slowest: 가장 느린 쿼리 시간과 문장 앞부분
+- app: 응답 시작까지 걸린 시간
+
+SERVER_TIMING_ENABLED면 모든 요청, SERVER_TIMING_ADMIN_HEADER면 관리자 토큰과 함께
+X-Server-Timing 헤더를 보낸 요청만 계측한다. 계측하지 않는 요청은 그대로 통과한다.
+스트리밍 응답은 헤더를 먼저 보내므로 본문을 만드는 쿼리는 포함되지 않는다.
+"""
+import time
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.database import QueryStats, query_stats
+
+REQUEST_HEADER = "x-server-timing"
+
+# desc에 넣는 문장 길이
+STATEMENT_PREVIEW_LENGTH = 80
+
+def _quote(value: str) -> str:
+    """Server-Timing desc 값 (quoted-string)"""
+    value = " ".join(value.split())[:STATEMENT_PREVIEW_LENGTH]
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def server_timing_header(stats: QueryStats, elapsed: float) -> str:
+    metrics = [f'db;dur={stats.total * 1000:.1f};desc="{stats.count} queries"']
+    if stats.slowest_statement is not None:
+        metrics.append(f"db-slowest;dur={stats.slowest * 1000:.1f};desc={_quote(stats.slowest_statement)}")
+    metrics.append(f"app;dur={elapsed * 1000:.1f}")
+    return ", ".join(metrics)
+
+def _is_admin_request(headers: Headers) -> bool:
+    """관리자 토큰과 함께 계측을 요청했는지 (토큰의 role 클레임으로 판단)"""
+    from app.api.auth import verify_token_cached
+
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        return verify_token_cached(token).get("role") == "admin"
+    except Exception:
+        return False
+
+def timing_requested(scope: Scope) -> bool:
+    if settings.server_timing_enabled:
+        return True
+    if not settings.server_timing_admin_header:
+        return False
+    headers = Headers(scope=scope)
+    return REQUEST_HEADER in headers and _is_admin_request(headers)
+
+class ServerTimingMiddleware:
+    """요청별 SQL 통계를 Server-Timing 헤더로 반환하는 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not timing_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", server_timing_header(stats, time.perf_counter() - started)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
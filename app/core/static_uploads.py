@@ -0,0 +1,80 @@
+"""업로드 파일 서빙 (/uploads)
+
+업로드 파일은 고유한 이름(UUID 또는 내용 해시)으로 원자적으로 쓰고 다시 쓰지 않으므로,
+같은 URL은 항상 같은 내용이다. 그래서 길게 캐시하고(immutable) 파일명으로 강한 ETag를 만든다.
+mtime을 쓰지 않으므로 서버를 옮기거나 백업에서 복원해도 ETag가 바뀌지 않는다.
+
+UPLOADS_SERVE_MODE
+- app: 앱이 직접 전송 (Range/206, If-Range, 304 처리는 FileResponse)
+- x-accel-redirect: nginx internal location으로 넘기고 앱은 헤더만 응답 (디스크를 읽지 않는다)
+- x-sendfile: Apache(mod_xsendfile)/lighttpd에 파일 경로를 넘긴다
+
+이미지는 이미 압축된 형식이라 미리 압축한 파일(.gz/.br)은 두지 않는다.
+"""
+import hashlib
+import os
+from urllib.parse import quote
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+from app.config import settings
+
+SERVE_MODES = ("app", "x-accel-redirect", "x-sendfile")
+
+def cache_control() -> str:
+    return f"public, max-age={settings.uploads_max_age}, immutable"
+
+def upload_etag(relative_path: str, size: int) -> str:
+    """파일명과 크기로 만든 강한 ETag"""
+    digest = hashlib.sha1(f"{relative_path}:{size}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+class UploadFiles(StaticFiles):
+    """업로드 디렉토리 서빙 (immutable 캐시, 강한 ETag, 프록시 위임 모드)"""
+
+    def __init__(self, directory: str, mode: str = "app"):
+        if mode not in SERVE_MODES:
+            raise ValueError(f"unknown uploads serve mode: {mode}")
+        super().__init__(directory=directory, check_dir=False)
+        self.mode = mode
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # 숨김 파일(쓰는 중인 임시 파일, 잠금 파일)은 서빙하지 않는다
+        if any(part.startswith(".") and part not in (".", "..") for part in path.split(os.sep)):
+            raise HTTPException(status_code=404)
+        if self.mode == "app":
+            return await super().get_response(path, scope)
+
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        # get_path가 '.'/'..'를 정리하므로 남은 '..'는 디렉토리 밖을 가리킨다
+        if path == "." or path.startswith("..") or os.path.isabs(path):
+            raise HTTPException(status_code=404)
+        return self.offload_response(path.replace(os.sep, "/"))
+
+    def offload_response(self, relative_path: str) -> Response:
+        """전송을 프록시에 넘기는 빈 응답 (파일이 없으면 프록시가 404를 응답한다)"""
+        headers = {"Cache-Control": cache_control()}
+        if self.mode == "x-accel-redirect":
+            headers["X-Accel-Redirect"] = settings.uploads_accel_prefix.rstrip("/") + "/" + quote(relative_path)
+        else:
+            headers["X-Sendfile"] = os.path.join(os.path.abspath(self.directory), relative_path)
+        return Response(headers=headers)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        relative_path = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            headers={
+                "ETag": upload_etag(relative_path, stat_result.st_size),
+                "Cache-Control": cache_control(),
+            }
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
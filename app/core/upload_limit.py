@@ -0,0 +1,53 @@
+"""multipart 요청 본문 크기 제한 (업로드)
+
+업로드 라우트는 Starlette가 multipart 본문을 임시 파일로 모두 받은 뒤에 실행되므로,
+파일별 크기 제한(MAX_FILE_SIZE)은 이미 받은 파일을 복사하면서 확인된다.
+이 미들웨어는 본문을 받기 전에 요청 전체 크기(MAX_UPLOAD_REQUEST_SIZE)를 제한한다.
+
+- Content-Length가 제한보다 크면 본문을 한 바이트도 읽지 않고 413
+- Content-Length 없이(chunked) 보내면 받은 바이트를 세다가 넘는 순간 읽기를 멈추고 413
+
+오류는 라우트가 본문을 읽을 때 HTTPException으로 일으키므로 다른 오류와 같은 JSON 형식으로 응답한다.
+"""
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body too large (max {max_size} bytes)"
+    )
+
+class UploadSizeLimitMiddleware:
+    """multipart/form-data 요청 본문 크기를 제한하는 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        declared = int(content_length) if content_length.isdigit() else None
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            if declared is not None and declared > self.max_size:
+                raise _too_large(self.max_size)
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise _too_large(self.max_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
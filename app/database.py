@@ -1,16 +1,260 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.config import settings
+from app.core.metrics import db_pool_wait, db_pool_connections, register_collector
+
+# 비동기 드라이버 매핑 (동기 URL -> 비동기 URL)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """동기 데이터베이스 URL을 비동기 드라이버 URL로 변환"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def require_driver(url: str) -> None:
+    """URL의 DB 드라이버가 설치되어 있는지 확인 (없으면 설치 방법과 함께 오류)
+
+    requirements.txt에는 SQLite 드라이버만 있으므로 PostgreSQL은 requirements-postgres.txt로 설치한다
+    (동기 엔진은 psycopg2, 비동기 엔진은 asyncpg).
+    """
+    parsed = make_url(url)
+    try:
+        parsed.get_dialect().import_dbapi()
+    except ImportError as e:
+        raise RuntimeError(
+            f"DATABASE_URL({parsed.drivername})에 필요한 드라이버 '{e.name}'가 설치되어 있지 않습니다. "
+            "PostgreSQL은 pip install -r requirements-postgres.txt로 설치하세요."
+        ) from e
+
+def is_memory_sqlite(url: str) -> bool:
+    """메모리 SQLite 여부 (커넥션 풀과 WAL을 쓰지 않는다)"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+class _CheckoutTimer:
+    """풀에서 연결을 얻기까지 기다린 시간 기록 (새 연결을 만드는 시간 포함)"""
+    metrics_label = ""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started, (self.metrics_label,))
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    metrics_label = "sync"
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+def pool_class_option(url: str) -> dict:
+    """메트릭을 켜면 대기 시간을 기록하는 커넥션 풀 사용"""
+    if not settings.metrics_enabled:
+        return {}
+    is_async = make_url(url).get_dialect().is_async
+    return {"poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool}
+
+def engine_options(url: str) -> dict:
+    """백엔드별 create_engine 인자 (커넥션 풀 크기, 드라이버 연결 인자)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    
+    if backend == "sqlite":
+        if is_memory_sqlite(url):
+            return {"connect_args": {"check_same_thread": False}}
+        # busy timeout은 PRAGMA로 지정하므로 드라이버 기본값(5초)은 끈다
+        return {
+            "connect_args": {"check_same_thread": False, "timeout": 0},
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            **pool_class_option(url),
+        }
+    
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+        **pool_class_option(url),
+    }
+    if backend == "postgresql":
+        if parsed.get_driver_name() == "asyncpg":
+            server_settings = {"application_name": settings.postgres_application_name}
+            if settings.postgres_statement_timeout_ms:
+                server_settings["statement_timeout"] = str(settings.postgres_statement_timeout_ms)
+            options["connect_args"] = {"server_settings": server_settings}
+        else:
+            connect_args = {"application_name": settings.postgres_application_name}
+            if settings.postgres_statement_timeout_ms:
+                connect_args["options"] = f"-c statement_timeout={settings.postgres_statement_timeout_ms}"
+            options["connect_args"] = connect_args
+    return options
+
+def sqlite_pragmas() -> list:
+    """연결마다 실행할 PRAGMA 목록"""
+    return [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA journal_mode = {settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+    ]
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """새 SQLite 연결에 PRAGMA 적용 (connect 이벤트)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
 # SQLAlchemy 엔진 생성
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+require_driver(settings.database_url)
+require_driver(async_database_url(settings.database_url))
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+
+# 비동기 엔진 생성 (aiosqlite / asyncpg)
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    **engine_options(async_database_url(settings.database_url))
 )
 
+# SQLite는 두 엔진의 모든 연결에 같은 PRAGMA를 적용한다
+if engine.dialect.name == "sqlite" and not is_memory_sqlite(settings.database_url):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+def _pool_samples():
+    """커넥션 풀 상태 (메트릭 스냅샷 시점 값)"""
+    for label, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        if isinstance(pool, QueuePool):
+            yield db_pool_connections.name, (label, "size"), pool.size()
+            yield db_pool_connections.name, (label, "checked_out"), pool.checkedout()
+            yield db_pool_connections.name, (label, "idle"), pool.checkedin()
+            yield db_pool_connections.name, (label, "overflow"), max(pool.overflow(), 0)
+
+register_collector(_pool_samples)
+
+# 요청별 SQL 통계 (미들웨어가 계측할 요청에만 설정한다)
+class QueryStats:
+    """요청 하나에서 실행된 쿼리 수, 총 DB 시간, 가장 느린 쿼리"""
+    __slots__ = ("count", "total", "slowest", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed >= self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# 느린 쿼리 실행 계획 (같은 문장은 프로세스마다 한 번만 EXPLAIN)
+EXPLAIN_CACHE_SIZE = 256
+_explained: Dict[str, str] = {}
+
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# 로그에 남기는 문장 길이 (IN 목록이 긴 문장 등)
+SLOW_QUERY_LOG_LENGTH = 2000
+
+def _format_plan(dialect: str, rows) -> str:
+    if dialect != "sqlite":
+        return "\n".join(str(row[0]) for row in rows)
+    # (id, parent, notused, detail)를 트리 들여쓰기로
+    depth = {0: 0}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append("  " * (depth[node_id] - 1) + detail)
+    return "\n".join(lines)
+
+def explain_statement(conn, statement: str, parameters) -> Optional[str]:
+    """쿼리 실행 계획 (같은 연결에서 실행, 지원하지 않는 문장이면 None)"""
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    if statement in _explained:
+        return _explained[statement]
+
+    # DBAPI 커서를 직접 써서 계측 이벤트가 다시 발생하지 않게 한다
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        plan = _format_plan(conn.dialect.name, cursor.fetchall())
+    except Exception as e:
+        return f"(실행 계획을 가져오지 못했습니다: {e})"
+    finally:
+        cursor.close()
+
+    if len(_explained) >= EXPLAIN_CACHE_SIZE:
+        _explained.pop(next(iter(_explained)))
+    _explained[statement] = plan
+    return plan
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+        plan = None
+        if settings.slow_query_explain:
+            plan = explain_statement(conn, statement, parameters[0] if executemany else parameters)
+        if len(statement) > SLOW_QUERY_LOG_LENGTH:
+            statement = statement[:SLOW_QUERY_LOG_LENGTH] + "..."
+        slow_query_logger.warning(
+            "slow query (%.1f ms): %s%s", elapsed * 1000, statement, f"\nplan:\n{plan}" if plan else ""
+        )
+
+def sql_instrumentation_enabled() -> bool:
+    """SQL 계측이 필요한지 (모두 꺼져 있으면 이벤트를 등록하지 않는다)"""
+    return bool(settings.server_timing_enabled or settings.server_timing_admin_header or settings.slow_query_ms)
+
+def instrument_engine(target) -> None:
+    """엔진에 쿼리 시간 측정 이벤트 등록"""
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+if sql_instrumentation_enabled():
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # 베이스 클래스
 Base = declarative_base()
@@ -22,3 +266,45 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 비동기 데이터베이스 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def add_missing_columns(bind):
+    """기존 테이블에 새로 추가된 nullable 컬럼 생성 (ALTER TABLE ADD COLUMN)"""
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+def init_db(bind=None):
+    """테이블, 컬럼, 인덱스 생성
+
+    create_all은 이미 존재하는 테이블에 새로 추가된 컬럼과 인덱스를 만들지 않으므로
+    기존 데이터베이스에도 누락된 nullable 컬럼과 인덱스를 생성한다.
+    SQLite에서는 리뷰 검색 인덱스(FTS5)와 트리거도 만들고, 도입 전 리뷰의 작성 시각 형식을 맞추고
+    파생 컬럼과 집계, 응답 조각을 채운다.
+    """
+    from app.models.review import create_search_index, backfill_regions, normalize_timestamps
+    from app.models.aggregate import initialize_review_aggregates
+    from app.core.review_fragments import initialize_review_fragments
+    
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    add_missing_columns(bind)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    with bind.begin() as conn:
+        create_search_index(conn)
+        normalize_timestamps(conn)
+        backfill_regions(conn)
+        initialize_review_aggregates(conn)
+        initialize_review_fragments(conn)
@@ -1,14 +1,18 @@
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api import auth, reviews, images
-from app.database import engine
+from app.database import engine, async_engine, init_db
 from app.models import User, Review, ReviewImage, AdminSession
 from app.config import settings
+from app.core.server_timing import ServerTimingMiddleware
+from app.core.static_uploads import UploadFiles
+from app.core.compression import CompressionMiddleware
+from app.core.upload_limit import UploadSizeLimitMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics, start_metrics, stop_metrics
 
 import os
 
@@ -42,15 +46,31 @@ app.add_middleware(
         "Content-Type",
         "Range"
     ],
-    expose_headers=["Content-Length", "Content-Range"]
+    expose_headers=["Content-Length", "Content-Range", "ETag", "Last-Modified", "Server-Timing"]
 )
 
+# 업로드 요청 전체 크기 제한 (multipart 본문을 임시 파일로 받기 전에 413)
+if settings.max_upload_request_size:
+    app.add_middleware(UploadSizeLimitMiddleware, max_size=settings.max_upload_request_size)
+
+# /api/* 응답 압축 (gzip, brotli)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# 요청별 SQL 통계 (Server-Timing 헤더, 설정이 모두 꺼져 있으면 등록하지 않는다)
+if settings.server_timing_enabled or settings.server_timing_admin_header:
+    app.add_middleware(ServerTimingMiddleware)
+
+# 요청 처리 시간과 처리 중인 요청 수 (가장 바깥에서 측정)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # 항상 JSON 응답을 보장하는 예외 핸들러 (API 경로에 한함)
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     if request.url.path.startswith("/api/"):
-        return JSONResponse({"success": False, "detail": exc.detail}, status_code=exc.status_code)
-    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+        return JSONResponse({"success": False, "detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+    return JSONResponse({"error": exc.detail}, status_code=exc.status_code, headers=exc.headers)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -64,9 +84,12 @@ async def generic_exception_handler(request: Request, exc: Exception):
         return JSONResponse({"success": False, "detail": "internal server error"}, status_code=500)
     return JSONResponse({"error": "internal server error"}, status_code=500)
 
-# 정적 파일 서빙 (업로드된 이미지)
-_uploads_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "uploads"))
-app.mount("/uploads", StaticFiles(directory=_uploads_dir), name="uploads")
+# 정적 파일 서빙 (업로드된 이미지, 파일을 저장하는 upload_dir과 같은 디렉토리)
+app.mount(
+    "/uploads",
+    UploadFiles(directory=os.path.abspath(settings.upload_dir), mode=settings.uploads_serve_mode),
+    name="uploads"
+)
 
 # API 라우터 등록
 app.include_router(auth.router, prefix="/api/auth", tags=["인증"])
@@ -76,9 +99,9 @@ app.include_router(images.router, prefix="/api", tags=["이미지"])
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 실행"""
-    # 데이터베이스 테이블 생성
-    from app.database import Base
-    Base.metadata.create_all(bind=engine)
+    # 데이터베이스 테이블 및 인덱스 생성
+    init_db(engine)
+    start_metrics()
     
     # 기본 관리자 계정 생성
     from app.database import SessionLocal
@@ -100,6 +123,16 @@ async def startup_event():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 실행"""
+    from app.core.image_pipeline import shutdown_executor
+    from app.core.security import shutdown_hash_executor
+    shutdown_executor()
+    shutdown_hash_executor()
+    stop_metrics()
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -114,6 +147,16 @@ async def health_check():
     """헬스 체크"""
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 메트릭 (모든 워커 합산)
+
+    외부에 공개하지 않도록 nginx에서 내부 주소만 허용한다.
+    """
+    if not settings.metrics_enabled:
+        return JSONResponse({"error": "Not Found"}, status_code=404)
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,5 +1,7 @@
 from .user import User
 from .review import Review
-from .image import ReviewImage, AdminSession
+from .image import ReviewImage, ImageBlob, AdminSession
+from .aggregate import ReviewFacetCount, ReviewStats
+from .fragment import ReviewFragment
 
-__all__ = ["User", "Review", "ReviewImage", "AdminSession"]
+__all__ = ["User", "Review", "ReviewImage", "ImageBlob", "AdminSession", "ReviewFacetCount", "ReviewStats", "ReviewFragment"]
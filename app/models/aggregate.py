@@ -0,0 +1,220 @@
+from typing import Dict, Iterable, List, Mapping, Tuple
+from sqlalchemy import Column, Integer, String, DateTime, event, update, insert, delete, select, func, inspect, case
+from app.database import Base
+from app.models.review import Review
+from app.utils.region import extract_region
+
+class ReviewFacetCount(Base):
+    """필터 항목별 리뷰 수 (리뷰 쓰기와 같은 트랜잭션에서 증감)"""
+    __tablename__ = "review_facet_counts"
+    
+    status = Column(String, primary_key=True)
+    facet = Column(String, primary_key=True)  # 'team', 'rating', 'from_region', 'to_region'
+    value = Column(String, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+class ReviewStats(Base):
+    """상태별 리뷰 요약 (개수, 평점 합계와 분포, 최근 작성 시각)"""
+    __tablename__ = "review_stats"
+    
+    status = Column(String, primary_key=True)
+    review_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_1 = Column(Integer, default=0, nullable=False)
+    rating_2 = Column(Integer, default=0, nullable=False)
+    rating_3 = Column(Integer, default=0, nullable=False)
+    rating_4 = Column(Integer, default=0, nullable=False)
+    rating_5 = Column(Integer, default=0, nullable=False)
+    latest_created_at = Column(DateTime(timezone=True), nullable=True)
+
+# 평점 분포 컬럼
+RATING_COLUMNS = {rating: f"rating_{rating}" for rating in range(1, 6)}
+STATS_COUNT_COLUMNS = ("review_count", "rating_sum") + tuple(RATING_COLUMNS.values())
+
+# 집계하는 리뷰 컬럼 (status별로 센다)
+FACET_COLUMNS = ("team", "rating", "from_region", "to_region")
+
+def facet_keys(values: Mapping) -> list:
+    """리뷰 한 건이 속하는 (status, facet, value) 목록"""
+    return [
+        (values["status"], facet, str(values[facet]))
+        for facet in FACET_COLUMNS
+        if values.get(facet) is not None
+    ]
+
+def adjust_facet_counts(connection, reviews: Iterable[Mapping], delta: int) -> None:
+    """리뷰 목록만큼 필터 항목별 리뷰 수 증감
+
+    ORM을 거치지 않는 쓰기(일괄 INSERT 등)에서는 이 함수를 직접 호출해야 한다.
+    """
+    changes = {}
+    for values in reviews:
+        for key in facet_keys(values):
+            changes[key] = changes.get(key, 0) + delta
+    
+    table = ReviewFacetCount.__table__
+    for (status, facet, value), change in changes.items():
+        if change == 0:
+            continue
+        result = connection.execute(
+            update(table)
+            .where(table.c.status == status, table.c.facet == facet, table.c.value == value)
+            .values(count=case((table.c.count + change < 0, 0), else_=table.c.count + change))
+        )
+        if result.rowcount == 0 and change > 0:
+            connection.execute(insert(table).values(status=status, facet=facet, value=value, count=change))
+
+def adjust_review_stats(connection, reviews: Iterable[Mapping], delta: int) -> None:
+    """리뷰 목록만큼 상태별 요약 증감 (최근 작성 시각은 인덱스로 다시 구한다)
+
+    ORM을 거치지 않는 쓰기(일괄 INSERT 등)에서는 이 함수를 직접 호출해야 한다.
+    """
+    changes: Dict[str, Dict[str, int]] = {}
+    for values in reviews:
+        change = changes.setdefault(values["status"], dict.fromkeys(STATS_COUNT_COLUMNS, 0))
+        change["review_count"] += delta
+        change["rating_sum"] += delta * values["rating"]
+        change[RATING_COLUMNS[values["rating"]]] += delta
+    
+    table = ReviewStats.__table__
+    reviews_table = Review.__table__
+    for status, change in changes.items():
+        latest = select(func.max(reviews_table.c.created_at))\
+            .where(reviews_table.c.status == status).scalar_subquery()
+        result = connection.execute(
+            update(table).where(table.c.status == status).values(
+                latest_created_at=latest,
+                **{
+                    column: case((table.c[column] + value < 0, 0), else_=table.c[column] + value)
+                    for column, value in change.items()
+                }
+            )
+        )
+        if result.rowcount == 0 and change["review_count"] > 0:
+            connection.execute(insert(table).values(status=status, latest_created_at=latest, **change))
+
+def adjust_review_aggregates(connection, reviews: Iterable[Mapping], delta: int) -> None:
+    """리뷰 쓰기에 맞춰 모든 집계(상태별 요약, 필터 항목별 수) 증감"""
+    reviews = list(reviews)
+    adjust_review_stats(connection, reviews, delta)
+    adjust_facet_counts(connection, reviews, delta)
+
+def compute_facet_counts(connection) -> Dict[Tuple[str, str, str], int]:
+    """reviews 전체를 GROUP BY로 집계한 필터 항목별 리뷰 수"""
+    reviews = Review.__table__
+    counts = {}
+    for facet in FACET_COLUMNS:
+        column = reviews.c[facet]
+        rows = connection.execute(
+            select(reviews.c.status, column, func.count())
+            .where(column.isnot(None))
+            .group_by(reviews.c.status, column)
+        ).all()
+        for status, value, count in rows:
+            counts[(status, facet, str(value))] = count
+    return counts
+
+def compute_review_stats(connection) -> Dict[str, dict]:
+    """reviews 전체를 GROUP BY로 집계한 상태별 요약"""
+    reviews = Review.__table__
+    rows = connection.execute(
+        select(
+            reviews.c.status,
+            func.count().label("review_count"),
+            func.coalesce(func.sum(reviews.c.rating), 0).label("rating_sum"),
+            *(
+                func.count(case((reviews.c.rating == rating, 1))).label(column)
+                for rating, column in RATING_COLUMNS.items()
+            ),
+            func.max(reviews.c.created_at).label("latest_created_at"),
+        ).group_by(reviews.c.status)
+    ).mappings().all()
+    return {row["status"]: dict(row) for row in rows}
+
+def rebuild_review_aggregates(connection) -> None:
+    """reviews 전체로 집계 테이블 다시 계산"""
+    connection.execute(delete(ReviewFacetCount.__table__))
+    connection.execute(delete(ReviewStats.__table__))
+    
+    facet_counts = compute_facet_counts(connection)
+    if facet_counts:
+        connection.execute(insert(ReviewFacetCount.__table__), [
+            {"status": status, "facet": facet, "value": value, "count": count}
+            for (status, facet, value), count in facet_counts.items()
+        ])
+    stats = compute_review_stats(connection)
+    if stats:
+        connection.execute(insert(ReviewStats.__table__), list(stats.values()))
+
+def check_review_aggregates(connection) -> List[str]:
+    """집계 테이블과 reviews의 GROUP BY 결과 비교 (어긋난 항목 설명 목록, 일치하면 빈 목록)"""
+    problems = []
+    
+    expected_facets = compute_facet_counts(connection)
+    stored_facets = {
+        (row.status, row.facet, row.value): row.count
+        for row in connection.execute(select(ReviewFacetCount.__table__)).all()
+        if row.count
+    }
+    for key in sorted(set(expected_facets) | set(stored_facets)):
+        if expected_facets.get(key, 0) != stored_facets.get(key, 0):
+            problems.append(f"facet {key}: 저장 {stored_facets.get(key, 0)}, 실제 {expected_facets.get(key, 0)}")
+    
+    expected_stats = compute_review_stats(connection)
+    stored_stats = {
+        row["status"]: dict(row)
+        for row in connection.execute(select(ReviewStats.__table__)).mappings().all()
+        if row["review_count"]
+    }
+    for status in sorted(set(expected_stats) | set(stored_stats)):
+        expected = expected_stats.get(status, {})
+        stored = stored_stats.get(status, {})
+        for column in STATS_COUNT_COLUMNS + ("latest_created_at",):
+            if expected.get(column) != stored.get(column):
+                problems.append(f"stats {status}.{column}: 저장 {stored.get(column)}, 실제 {expected.get(column)}")
+    
+    return problems
+
+def initialize_review_aggregates(connection) -> None:
+    """집계 테이블이 비어 있는데 리뷰가 있으면 (도입 전 데이터) 다시 계산"""
+    has_stats = connection.execute(select(ReviewStats.__table__.c.status).limit(1)).first()
+    has_reviews = connection.execute(select(Review.__table__.c.id).limit(1)).first()
+    if has_reviews and not has_stats:
+        rebuild_review_aggregates(connection)
+
+def _review_values(target) -> dict:
+    return {column: getattr(target, column) for column in ("status",) + FACET_COLUMNS}
+
+# 수정 전 값을 알아야 집계를 옮길 수 있으므로, 값이 로드되지 않은 상태에서 바뀌어도 이전 값을 읽어 두게 한다
+def _load_old_value(target, value, oldvalue, initiator):
+    pass
+
+for _column in ("status", "team", "rating", "from_location", "to_location"):
+    event.listen(getattr(Review, _column), "set", _load_old_value, active_history=True)
+
+@event.listens_for(Review, "after_insert")
+def _review_inserted(mapper, connection, target):
+    adjust_review_aggregates(connection, [_review_values(target)], 1)
+
+@event.listens_for(Review, "after_delete")
+def _review_deleted(mapper, connection, target):
+    adjust_review_aggregates(connection, [_review_values(target)], -1)
+
+@event.listens_for(Review, "after_update")
+def _review_updated(mapper, connection, target):
+    state = inspect(target)
+    new_values = _review_values(target)
+    old_values = dict(new_values)
+    for column in ("status", "team", "rating"):
+        history = state.attrs[column].history
+        if history.deleted:
+            old_values[column] = history.deleted[0]
+    # 지역은 주소에서 파생되므로 이전 주소로 이전 지역을 구한다
+    for column, region in (("from_location", "from_region"), ("to_location", "to_region")):
+        history = state.attrs[column].history
+        if history.deleted:
+            old_values[region] = extract_region(history.deleted[0])
+    
+    if old_values != new_values:
+        adjust_review_aggregates(connection, [old_values], -1)
+        adjust_review_aggregates(connection, [new_values], 1)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey
+from app.database import Base
+
+class ReviewFragment(Base):
+    """리뷰 한 건의 공개 응답 JSON (이미지 포함, 리뷰/이미지 쓰기와 같은 트랜잭션에서 다시 만든다)"""
+    __tablename__ = "review_fragments"
+    
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    # 응답 형식이 바뀌면 올리는 번호 (다른 번호의 조각은 없는 것으로 본다)
+    version = Column(Integer, nullable=False)
+    list_json = Column(LargeBinary, nullable=False)  # 목록 응답의 reviews 항목
+    detail_json = Column(LargeBinary, nullable=False)  # 상세 응답의 data
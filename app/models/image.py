@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, event, update, insert, case, inspect
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -7,17 +7,39 @@ class ReviewImage(Base):
     __tablename__ = "review_images"
     
     id = Column(Integer, primary_key=True, index=True)
-    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False)
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False, index=True)
     image_url = Column(String, nullable=False)
     image_filename = Column(String, nullable=False)
     image_size = Column(Integer, nullable=True)
     image_mime_type = Column(String, nullable=True)
+    image_width = Column(Integer, nullable=True)
+    image_height = Column(Integer, nullable=True)
+    # 최적화 파이프라인 결과 파일 (업로드한 image_filename은 URL이 이미 나갔으므로 바꾸지 않는다)
+    optimized_filename = Column(String, nullable=True)
+    webp_filename = Column(String, nullable=True)
+    placeholder = Column(Text, nullable=True)  # 저화질 미리보기 (data URI)
     sort_order = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # 관계 설정
     review = relationship("Review", back_populates="images")
 
+class ImageBlob(Base):
+    """업로드 파일 참조 수 (같은 파일을 여러 ReviewImage가 공유할 수 있다)"""
+    __tablename__ = "image_blobs"
+    
+    filename = Column(String, primary_key=True)
+    ref_count = Column(Integer, default=0, nullable=False)
+    # 원본 파일의 최적화 결과 파일과 메타데이터 (같은 원본을 참조하는 행은 다시 처리하지 않는다)
+    optimized_filename = Column(String, nullable=True)
+    image_size = Column(Integer, nullable=True)
+    image_mime_type = Column(String, nullable=True)
+    image_width = Column(Integer, nullable=True)
+    image_height = Column(Integer, nullable=True)
+    webp_filename = Column(String, nullable=True)
+    placeholder = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class AdminSession(Base):
     __tablename__ = "admin_sessions"
     
@@ -29,3 +51,37 @@ class AdminSession(Base):
     
     # 관계 설정
     user = relationship("User")
+
+# ReviewImage가 참조하는 파일 컬럼
+IMAGE_FILE_COLUMNS = ("image_filename", "optimized_filename", "webp_filename")
+
+def adjust_blob_refs(connection, filenames, delta: int) -> None:
+    """파일 참조 수 증감 (ReviewImage 쓰기와 같은 트랜잭션에서 실행)"""
+    table = ImageBlob.__table__
+    for filename in filenames:
+        if not filename:
+            continue
+        result = connection.execute(
+            update(table)
+            .where(table.c.filename == filename)
+            .values(ref_count=case((table.c.ref_count + delta < 0, 0), else_=table.c.ref_count + delta))
+        )
+        if result.rowcount == 0 and delta > 0:
+            connection.execute(insert(table).values(filename=filename, ref_count=delta))
+
+@event.listens_for(ReviewImage, "after_insert")
+def _image_inserted(mapper, connection, target):
+    adjust_blob_refs(connection, [getattr(target, column) for column in IMAGE_FILE_COLUMNS], 1)
+
+@event.listens_for(ReviewImage, "after_delete")
+def _image_deleted(mapper, connection, target):
+    adjust_blob_refs(connection, [getattr(target, column) for column in IMAGE_FILE_COLUMNS], -1)
+
+@event.listens_for(ReviewImage, "after_update")
+def _image_updated(mapper, connection, target):
+    state = inspect(target)
+    for column in IMAGE_FILE_COLUMNS:
+        history = state.attrs[column].history
+        if history.has_changes():
+            adjust_blob_refs(connection, history.deleted, -1)
+            adjust_blob_refs(connection, history.added, 1)
@@ -1,7 +1,20 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint
+import logging
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint, Index, event, select, update, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.utils.region import extract_region
+
+logger = logging.getLogger(__name__)
+
+# 작성/수정 시각 (SQLite에서는 서버 기본값 CURRENT_TIMESTAMP와 같은 초 단위 문자열로 저장)
+# 앱에서 넣은 값과 서버 기본값의 형식이 같아야 저장된 문자열 순서가 시각 순서와 일치한다 (목록 커서 비교)
+SQLITE_TIMESTAMP_FORMAT = "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(timezone=True, storage_format=SQLITE_TIMESTAMP_FORMAT), "sqlite"
+)
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -13,12 +26,15 @@ class Review(Base):
     content = Column(Text, nullable=False)
     from_location = Column(String, nullable=False)
     to_location = Column(String, nullable=False)
+    # 필터/집계용 지역 (from_location/to_location에서 자동 추출)
+    from_region = Column(String, nullable=True)
+    to_region = Column(String, nullable=True)
     from_date = Column(String, nullable=False)
     to_date = Column(String, nullable=False)
     rating = Column(Integer, nullable=False)
     status = Column(String, default="published", nullable=False)  # 'draft', 'published', 'deleted'
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
     
     # 관계 설정
     user = relationship("User", back_populates="reviews")
@@ -28,4 +44,102 @@ class Review(Base):
     __table_args__ = (
         CheckConstraint("rating >= 1 AND rating <= 5", name="check_rating_range"),
         CheckConstraint("status IN ('draft', 'published', 'deleted')", name="check_status"),
+        # 목록 조회 (상태별 최신순, 커서 페이지네이션)
+        Index("ix_reviews_status_created_at_id", "status", "created_at", "id"),
+        # 필터 조회 (상태 + 필터 컬럼별 최신순)
+        Index("ix_reviews_status_team_created_at_id", "status", "team", "created_at", "id"),
+        Index("ix_reviews_status_rating_created_at_id", "status", "rating", "created_at", "id"),
+        Index("ix_reviews_status_from_region_created_at_id", "status", "from_region", "created_at", "id"),
+        Index("ix_reviews_status_to_region_created_at_id", "status", "to_region", "created_at", "id"),
     )
+
+@event.listens_for(Review, "before_insert")
+@event.listens_for(Review, "before_update")
+def _derive_regions(mapper, connection, target):
+    target.from_region = extract_region(target.from_location)
+    target.to_region = extract_region(target.to_location)
+
+def backfill_regions(connection) -> int:
+    """지역 컬럼이 비어 있는 기존 리뷰 채우기 (컬럼 추가 전 데이터)"""
+    table = Review.__table__
+    rows = connection.execute(
+        select(table.c.id, table.c.from_location, table.c.to_location).where(table.c.from_region.is_(None))
+    ).all()
+    for row in rows:
+        connection.execute(update(table).where(table.c.id == row.id).values(
+            from_region=extract_region(row.from_location),
+            to_region=extract_region(row.to_location),
+            updated_at=table.c.updated_at  # 응답 검증자(Last-Modified)가 바뀌지 않도록 유지
+        ))
+    return len(rows)
+
+def normalize_timestamps(connection) -> int:
+    """SQLite에 마이크로초까지 저장된 기존 작성/수정 시각을 초 단위로 맞추기 (바꾼 행 수)"""
+    if connection.dialect.name != "sqlite":
+        return 0
+    result = connection.execute(text(
+        "UPDATE reviews SET created_at = substr(created_at, 1, 19), updated_at = substr(updated_at, 1, 19) "
+        "WHERE length(created_at) > 19 OR length(updated_at) > 19"
+    ))
+    return result.rowcount
+
+# 리뷰 검색 인덱스 (SQLite FTS5, trigram 토크나이저)
+# reviews를 원본으로 하는 external content 테이블이라 본문을 중복 저장하지 않으며,
+# 트리거가 reviews의 INSERT/UPDATE/DELETE와 같은 트랜잭션에서 인덱스를 갱신한다.
+# trigram은 형태소 분석 없이 3글자 단위로 색인하므로 한국어("노원구", "27팀") 부분 일치 검색이 가능하다.
+SEARCH_TABLE = "reviews_fts"
+SEARCH_COLUMNS = ("title", "content", "team", "from_location", "to_location")
+
+_search_columns = ", ".join(SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+SEARCH_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"{_search_columns}, content='reviews', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON reviews BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, {_search_columns}) VALUES (new.id, {_new_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON reviews BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {_search_columns}) VALUES ('delete', old.id, {_old_values}); END",
+    # 검색 대상 컬럼이 바뀔 때만 다시 색인 (updated_at만 바뀌는 수정은 건너뜀)
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF {_search_columns} ON reviews BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {_search_columns}) VALUES ('delete', old.id, {_old_values}); "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, {_search_columns}) VALUES (new.id, {_new_values}); END",
+)
+
+def search_index_exists(connection) -> bool:
+    """검색 인덱스 테이블 존재 여부"""
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+    ).first() is not None
+
+def rebuild_search_index(connection) -> None:
+    """reviews 전체로 검색 인덱스 다시 만들기"""
+    connection.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+
+def check_search_index(connection) -> None:
+    """검색 인덱스가 reviews와 일치하는지 검사 (어긋나면 예외)"""
+    connection.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES ('integrity-check', 1)"))
+
+def create_search_index(connection) -> bool:
+    """검색 인덱스와 트리거 생성 (SQLite 전용, 새로 만들면 기존 리뷰도 색인)
+
+    FTS5나 trigram 토크나이저를 지원하지 않는 SQLite에서는 만들지 않고 False를 반환한다.
+    이 경우 검색은 LIKE 스캔으로 동작한다.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    
+    existed = search_index_exists(connection)
+    try:
+        for statement in SEARCH_DDL:
+            connection.execute(text(statement))
+    except OperationalError as e:
+        logger.warning("review search index unavailable: %s", e)
+        return False
+    
+    if not existed:
+        rebuild_search_index(connection)
+    return True
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, event
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, Session, object_session
 from app.database import Base
+from app.core.cache import user_cache
 
 class User(Base):
     __tablename__ = "users"
@@ -16,3 +17,21 @@ class User(Base):
     
     # 관계 설정
     reviews = relationship("Review", back_populates="user")
+
+# 사용자가 바뀌면(역할, 비밀번호 등) 커밋 후 모든 워커의 인증 캐시를 무효화한다
+# 커밋 전에 무효화하면 다른 요청이 아직 커밋되지 않은 변경 전 값을 다시 캐시할 수 있다
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info["users_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_user_cache(session):
+    if session.info.pop("users_changed", False):
+        user_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("users_changed", None)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 
 class ReviewImageBase(BaseModel):
@@ -71,3 +71,10 @@ class ReviewResponse(BaseModel):
 class ReviewListResponse(BaseModel):
     success: bool = True
     data: ReviewList
+
+class ReviewBatchItem(ReviewUpdate):
+    """일괄 쓰기 항목 (create는 ReviewCreate 필드가 모두 필요, update/delete는 id가 필요)"""
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    # 이미 업로드한 파일명 (POST /api/images/upload 응답의 filename), update에서는 기존 이미지를 교체
+    images: Optional[List[str]] = None
@@ -1,12 +1,39 @@
+import hashlib
 import os
+import threading
 import uuid
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
 from fastapi import UploadFile, HTTPException, status
+from sqlalchemy import delete, select
 from app.config import settings
-from PIL import Image
+from app.database import engine
+from app.core.metrics import upload_files, upload_bytes
+from app.models.image import ImageBlob
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 프로세스 안에서만 잠근다
+    fcntl = None
+
+# content 저장 모드에서 MIME 타입별 확장자 (같은 내용이면 같은 파일명이 되도록 통일)
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+# 파일명별 잠금 수 (파일마다 잠금 파일을 만들지 않고 해시로 나눠 쓴다)
+LOCK_STRIPES = 64
+_stripe_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
 
 def validate_image_file(file: UploadFile) -> bool:
-    """이미지 파일 유효성 검사"""
+    """이미지 파일 유효성 검사
+
+    file.size는 클라이언트가 보내지 않으면 비어 있으므로 크기 제한은 저장하면서 다시 확인한다.
+    """
     if file.content_type not in settings.allowed_file_types:
         return False
     
@@ -15,57 +42,280 @@ def validate_image_file(file: UploadFile) -> bool:
     
     return True
 
-def save_uploaded_file(file: UploadFile) -> str:
-    """업로드된 파일 저장"""
+def get_file_path(filename: str) -> str:
+    """업로드 파일 경로"""
+    return os.path.join(settings.upload_dir, filename)
+
+def content_filename(digest: str, extension: str) -> str:
+    """content 저장 모드 파일명 (해시 앞 4자리로 두 단계 하위 디렉토리에 나눠 저장)"""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+def _read_chunks(file: UploadFile):
+    """업로드 파일을 청크 단위로 읽으면서 크기 제한 확인
+
+    Starlette가 이미 받아 둔(spooled) 파일을 읽으므로 여기서의 413은 파일별 제한이다.
+    요청 전체 크기는 본문을 받기 전에 UploadSizeLimitMiddleware가 제한한다.
+    """
+    read = 0
+    while True:
+        chunk = file.file.read(settings.upload_chunk_size)
+        if not chunk:
+            break
+        read += len(chunk)
+        if read > settings.max_file_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File too large"
+            )
+        yield chunk
+
+def _write_temp(file: UploadFile, directory: str, name: str) -> Tuple[str, str]:
+    """임시 파일에 청크 단위로 쓰면서 SHA-256 계산 (임시 파일 경로, 해시), 실패 시 임시 파일 삭제"""
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    try:
+        with open(temp_path, "wb") as buffer:
+            for chunk in _read_chunks(file):
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest()
+
+def _write_upload(file: UploadFile, file_path: str) -> None:
+    """임시 파일에 청크 단위로 쓴 뒤 원자적으로 이름 변경 (실패 시 임시 파일 삭제)"""
+    temp_path, _ = _write_temp(file, os.path.dirname(file_path), os.path.basename(file_path))
+    try:
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def _stripe(filename: str) -> int:
+    return int(hashlib.sha1(filename.encode("utf-8")).hexdigest()[:8], 16) % LOCK_STRIPES
+
+@contextmanager
+def file_locks(filenames: Iterable[str]) -> Iterator[None]:
+    """파일명별 잠금 (워커 간 파일 락, fcntl이 없으면 프로세스 안에서만)
+
+    같은 내용의 파일을 재사용하는 업로드(있는지 확인 ~ 참조하는 행 커밋)와
+    delete_file(참조 수 확인 ~ 삭제)이 겹치지 않게 한다. 교착을 피하려고 잠금 번호 순서대로 잡는다.
+    """
+    stripes = sorted({_stripe(filename) for filename in filenames})
+    with ExitStack() as stack:
+        if stripes and fcntl is not None:
+            lock_dir = os.path.join(settings.upload_dir, ".locks")
+            os.makedirs(lock_dir, exist_ok=True)
+        for stripe in stripes:
+            if fcntl is None:
+                stack.enter_context(_stripe_locks[stripe])
+            else:
+                lock_file = stack.enter_context(open(os.path.join(lock_dir, f"{stripe}.lock"), "a"))
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def _reject_invalid(file: UploadFile) -> None:
     if not validate_image_file(file):
+        upload_files.inc(labels=("rejected",))
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type or size"
+            detail=f"Invalid file type or size: {file.filename}"
         )
+
+def _stage_file(file: UploadFile) -> Tuple[str, Optional[str]]:
+    """검사를 마친 파일 쓰기 (파일명, content 모드면 아직 옮기지 않은 임시 파일 경로)
+
+    content 모드는 업로드를 한 번만 읽는다. 임시 파일에 쓰면서 해시를 계산하고,
+    해시 경로로 옮기는 것은 잠금을 잡고 _place_staged에서 한다.
+    """
+    try:
+        if settings.upload_storage_mode == "content":
+            temp_path, digest = _write_temp(file, settings.upload_dir, "upload")
+            extension = CONTENT_TYPE_EXTENSIONS.get(file.content_type) or os.path.splitext(file.filename)[1].lower()
+            return content_filename(digest, extension), temp_path
+        
+        # 고유한 파일명 생성
+        file_extension = os.path.splitext(file.filename)[1]
+        filename = f"{uuid.uuid4()}{file_extension}"
+        
+        # 파일 저장 (청크 단위 스트리밍)
+        _write_upload(file, get_file_path(filename))
+        return filename, None
+    except HTTPException:
+        upload_files.inc(labels=("rejected",))
+        raise
+
+def _place_staged(filename: str, temp_path: Optional[str]) -> bool:
+    """임시 파일을 해시 경로로 옮기기 (같은 파일이 이미 있으면 버린다), 새로 썼는지 반환
+
+    file_locks를 잡고 호출한다. 이미 있던 파일은 잠금을 놓기 전에 참조하는 행을 커밋해야
+    그 사이에 delete_file이 지우지 않는다.
+    """
+    if temp_path is None:
+        return True
+    file_path = get_file_path(filename)
+    if os.path.exists(file_path):
+        os.remove(temp_path)
+        return False
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    os.replace(temp_path, file_path)
+    return True
+
+def _remove_staged(staged: List[Tuple[str, Optional[str]]]) -> None:
+    """옮기지 않은 임시 파일 지우기"""
+    for _, temp_path in staged:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def save_uploaded_file(file: UploadFile) -> str:
+    """업로드된 파일 저장
+
+    고정 크기 청크로 임시 파일에 쓰면서 크기 제한을 확인하고, 다 쓰면 원자적으로 이름을 바꾼다.
+    제한을 넘거나 실패하면 쓰던 임시 파일을 지운다. 동기 함수이므로 스레드풀(def 라우트)에서 호출한다.
+    upload_storage_mode가 content이면 내용 해시로 저장하고 같은 파일은 다시 쓰지 않는다.
+    """
+    with upload_batch([file]) as filenames:
+        return filenames[0]
+
+def store_file(path: str, extension: str) -> str:
+    """업로드 디렉토리에 이미 쓴 파일을 저장소에 등록하고 파일명 반환
+
+    content 저장 모드에서는 해시 경로로 옮기고, 같은 내용이 이미 있으면 새 파일을 버린다.
+    """
+    if settings.upload_storage_mode != "content":
+        return os.path.relpath(path, settings.upload_dir).replace(os.sep, "/")
     
-    # 고유한 파일명 생성
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(settings.upload_dir, unique_filename)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(settings.upload_chunk_size), b""):
+            digest.update(chunk)
     
-    # 파일 저장
-    with open(file_path, "wb") as buffer:
-        content = file.file.read()
-        buffer.write(content)
+    filename = content_filename(digest.hexdigest(), extension)
+    target = get_file_path(filename)
+    if os.path.exists(target):
+        os.remove(path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+    return filename
+
+_upload_executor: Optional[ThreadPoolExecutor] = None
+_upload_executor_lock = threading.Lock()
+
+def _get_upload_executor() -> ThreadPoolExecutor:
+    """여러 파일 저장용 스레드 풀 (처음 사용할 때 생성)"""
+    global _upload_executor
+    with _upload_executor_lock:
+        if _upload_executor is None:
+            _upload_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.upload_workers), thread_name_prefix="upload"
+            )
+        return _upload_executor
+
+def _discard_created(filenames: List[str]) -> None:
+    """이번 요청에서 새로 쓴 파일 지우기 (다른 행이 이미 참조하면 delete_file이 남겨 둔다)"""
+    for filename in set(filenames):
+        delete_file(filename)
+
+def _stage_all(files: List[UploadFile]) -> List[Tuple[str, Optional[str]]]:
+    """여러 파일을 동시에 쓰기 (요청 순서의 _stage_file 결과)
+
+    하나라도 실패하면 나머지가 끝나기를 기다려 쓴 파일을 모두 지우고 첫 번째 오류를 다시 일으킨다.
+    """
+    futures = [_get_upload_executor().submit(_stage_file, file) for file in files]
+    staged, errors = [], []
+    for future in futures:
+        try:
+            staged.append(future.result())
+        except BaseException as e:
+            errors.append(e)
     
-    return unique_filename
+    if errors:
+        _remove_staged(staged)
+        _discard_created([filename for filename, temp_path in staged if temp_path is None])
+        raise errors[0]
+    return staged
 
-def save_multiple_files(files: List[UploadFile]) -> List[str]:
-    """여러 파일 저장"""
-    saved_files = []
+@contextmanager
+def upload_batch(files: List[UploadFile]) -> Iterator[List[str]]:
+    """여러 파일을 저장하고 블록 안에서 ReviewImage 행을 커밋 (블록이 실패하면 새로 쓴 파일을 지운다)
+
+    잘못된 파일이 있으면 아무것도 쓰지 않고 400, 저장 중 실패하면 이미 쓴 파일을 지우고 오류를 그대로 일으킨다.
+    content 모드에서는 블록이 끝날 때까지 파일 잠금을 잡고 있으므로, 이미 있던 파일을 재사용해도
+    행을 커밋하기 전에 다른 요청이 그 파일을 지우지 못한다. 이미 있던 파일은 실패해도 지우지 않는다.
+
+        with upload_batch(images) as filenames:
+            ... ReviewImage 추가
+            db.commit()
+    """
+    # 쓰기 전에 전부 검사해 잘못된 파일이 있으면 아무것도 쓰지 않는다
     for file in files:
-        if validate_image_file(file):
-            filename = save_uploaded_file(file)
-            saved_files.append(filename)
+        _reject_invalid(file)
+    staged = _stage_all(files) if files else []
     
-    return saved_files
+    created = []
+    try:
+        with file_locks(filename for filename, temp_path in staged if temp_path is not None):
+            for filename, temp_path in staged:
+                if _place_staged(filename, temp_path):
+                    created.append(filename)
+                upload_files.inc(labels=("saved",))
+                upload_bytes.inc(os.path.getsize(get_file_path(filename)))
+            yield [filename for filename, _ in staged]
+    except BaseException:
+        # 잠금을 놓은 뒤에 지운다 (delete_file이 같은 잠금을 잡는다)
+        _remove_staged(staged)
+        _discard_created(created)
+        raise
+
+def file_ref_count(filename: str) -> int:
+    """파일을 참조하는 ReviewImage 수"""
+    with engine.connect() as conn:
+        return conn.execute(
+            select(ImageBlob.ref_count).where(ImageBlob.filename == filename)
+        ).scalar() or 0
+
+def resolve_upload_path(filename: str) -> Optional[str]:
+    """업로드 디렉토리 안의 실제 경로 (디렉토리 밖을 가리키면 None)"""
+    upload_root = os.path.realpath(settings.upload_dir)
+    file_path = os.path.realpath(get_file_path(filename))
+    if not file_path.startswith(upload_root + os.sep):
+        return None
+    return file_path
+
+def stored_file_exists(filename: str) -> bool:
+    """이미 업로드된 파일인지 확인 (일괄 API에서 파일명으로 이미지를 참조할 때)"""
+    file_path = resolve_upload_path(filename)
+    return file_path is not None and os.path.isfile(file_path)
 
 def delete_file(filename: str) -> bool:
-    """파일 삭제"""
-    file_path = os.path.join(settings.upload_dir, filename)
-    try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            return True
-        return False
-    except Exception:
+    """파일 삭제 (아직 참조하는 행이 있으면 지우지 않는다)
+
+    같은 파일을 여러 행이 공유할 수 있으므로 행을 지우고 커밋한 뒤에 호출한다.
+    참조 수 확인과 삭제는 파일 잠금 안에서 하고, 파일을 지우면 참조 수 0인 image_blobs 행도 지운다.
+    """
+    file_path = resolve_upload_path(filename)
+    if file_path is None:
         return False
+    with file_locks([filename]):
+        try:
+            with engine.begin() as conn:
+                table = ImageBlob.__table__
+                ref_count = conn.execute(select(table.c.ref_count).where(table.c.filename == filename)).scalar()
+                if ref_count:
+                    return False
+                # 행이 없으면(커밋되지 않은 업로드를 되돌릴 때) 쓰기 트랜잭션을 열지 않는다
+                if ref_count is not None:
+                    conn.execute(delete(table).where(table.c.filename == filename, table.c.ref_count == 0))
+                if not os.path.exists(file_path):
+                    return False
+                os.remove(file_path)
+                return True
+        except Exception:
+            return False
 
 def get_file_url(filename: str) -> str:
     """파일 URL 생성"""
     return f"/uploads/{filename}"
-
-def resize_image(file_path: str, max_size: tuple = (800, 600)) -> str:
-    """이미지 리사이징"""
-    try:
-        with Image.open(file_path) as img:
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
-            img.save(file_path, optimize=True, quality=85)
-        return file_path
-    except Exception:
-        return file_path
@@ -0,0 +1,126 @@
+"""이미지 최적화 (프로세스 풀 워커에서 실행)
+
+이 모듈의 함수는 별도 프로세스에서 실행되므로 Pillow와 표준 라이브러리만 사용하고,
+필요한 설정 값은 모두 인자로 받는다.
+"""
+import base64
+import io
+import os
+import uuid
+from PIL import Image, ImageOps
+
+# 저장 포맷별 MIME 타입
+MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+}
+
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+
+def _placeholder(img: Image.Image, size: int) -> str:
+    """아주 작은 저화질 미리보기 (data URI)"""
+    thumb = img.convert("RGB")
+    thumb.thumbnail((size, size))
+    buffer = io.BytesIO()
+    thumb.save(buffer, "JPEG", quality=40, optimize=True)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def _atomic_save(img: Image.Image, path: str, fmt: str, **options) -> None:
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.part")
+    try:
+        img.save(temp_path, fmt, **options)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def optimize_image(
+    src_path: str,
+    dst_dir: str,
+    max_dimension: int = 1920,
+    jpeg_quality: int = 85,
+    webp_quality: int = 80,
+    placeholder_size: int = 16
+) -> dict:
+    """원본 이미지를 정리해 새 파일로 저장
+
+    EXIF 방향을 적용한 뒤 EXIF를 제거하고, 긴 변이 max_dimension을 넘지 않게 줄여 다시 인코딩한다.
+    WebP 변형과 목록에 바로 넣을 수 있는 작은 미리보기도 만든다.
+    애니메이션 GIF는 다시 인코딩하지 않고 메타데이터와 미리보기만 만든다.
+    """
+    with Image.open(src_path) as source:
+        if getattr(source, "is_animated", False):
+            return {
+                "filename": None,
+                "webp_filename": None,
+                "image_size": os.path.getsize(src_path),
+                "image_mime_type": MIME_TYPES.get(source.format, "image/gif"),
+                "image_width": source.width,
+                "image_height": source.height,
+                "placeholder": _placeholder(source, placeholder_size),
+            }
+
+        img = ImageOps.exif_transpose(source)
+        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+        # 투명도가 있으면 PNG, 아니면 JPEG (EXIF는 넘기지 않으므로 저장 시 제거된다)
+        stem = str(uuid.uuid4())
+        if _has_alpha(img):
+            fmt, extension = "PNG", ".png"
+            img = img.convert("RGBA")
+            options = {"optimize": True}
+        else:
+            fmt, extension = "JPEG", ".jpg"
+            img = img.convert("RGB")
+            options = {"quality": jpeg_quality, "optimize": True, "progressive": True}
+
+        filename = f"{stem}{extension}"
+        webp_filename = f"{stem}.webp"
+        file_path = os.path.join(dst_dir, filename)
+
+        _atomic_save(img, file_path, fmt, **options)
+        _atomic_save(img, os.path.join(dst_dir, webp_filename), "WEBP", quality=webp_quality, method=4)
+
+        return {
+            "filename": filename,
+            "webp_filename": webp_filename,
+            "image_size": os.path.getsize(file_path),
+            "image_mime_type": MIME_TYPES[fmt],
+            "image_width": img.width,
+            "image_height": img.height,
+            "placeholder": _placeholder(img, placeholder_size),
+        }
+
+def render_variant(src_path: str, dst_path: str, width: int, fmt: str, quality: int) -> dict:
+    """원본 이미지를 너비 width로 줄인 변형 저장 (원본보다 크게 늘리지 않는다)
+
+    fmt는 'WEBP', 'JPEG', 'PNG' 중 하나다. 애니메이션 GIF는 첫 프레임만 사용하고,
+    투명도가 있는 이미지를 JPEG로 만들면 흰 배경에 합성한다.
+    """
+    with Image.open(src_path) as source:
+        img = ImageOps.exif_transpose(source)
+        if width < img.width:
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+
+        if fmt == "JPEG":
+            if _has_alpha(img):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            else:
+                img = img.convert("RGB")
+            options = {"quality": quality, "optimize": True, "progressive": True}
+        elif fmt == "PNG":
+            img = img.convert("RGBA" if _has_alpha(img) else "RGB")
+            options = {"optimize": True}
+        else:
+            img = img.convert("RGBA" if _has_alpha(img) else "RGB")
+            options = {"quality": quality, "method": 4}
+
+        _atomic_save(img, dst_path, fmt, **options)
+        return {"size": os.path.getsize(dst_path), "width": img.width, "height": img.height}
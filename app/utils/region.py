@@ -0,0 +1,18 @@
+from typing import Optional
+
+def extract_region(location: Optional[str]) -> Optional[str]:
+    """주소 문자열에서 필터/집계용 지역(구/군, 없으면 시) 추출
+
+    "서울 노원구" -> "노원구", "서울특별시 강남구 역삼동" -> "강남구", "경기 수원시" -> "수원시"
+    """
+    if not location:
+        return None
+    
+    tokens = location.split()
+    if not tokens:
+        return None
+    for suffixes in (("구", "군"), ("시",)):
+        for token in tokens:
+            if len(token) > 1 and token.endswith(suffixes):
+                return token
+    return tokens[0]
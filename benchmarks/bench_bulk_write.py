@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+리뷰 대량 쓰기 벤치마크
+
+같은 수의 리뷰를 기존 방식(POST /api/reviews를 한 건씩)과 일괄 API(POST /api/reviews/batch)로
+생성해 초당 리뷰 수를 비교한다. 일괄 API는 청크 크기별로 측정한다.
+
+사용법: python -m benchmarks.bench_bulk_write --reviews 2000 --chunk-sizes 100,500,2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import configure_environment, print_table
+
+def review_fields(i: int) -> dict:
+    return {
+        "team": f"{i % 40 + 1}팀",
+        "title": f"이전 사이트 리뷰 {i}",
+        "content": "포장부터 정리까지 꼼꼼하게 해주셨어요. " * 5,
+        "from_location": "서울 노원구",
+        "to_location": "경기 수원시",
+        "from_date": "2024-01-01",
+        "to_date": "2024-01-02",
+        "rating": i % 5 + 1,
+    }
+
+async def one_by_one(client, headers: dict, count: int) -> float:
+    """기존 생성 API로 한 건씩 생성, 소요 시간(초)"""
+    started = time.perf_counter()
+    for i in range(count):
+        fields = review_fields(i)
+        response = await client.post("/api/reviews", headers=headers, data={
+            "team": fields["team"],
+            "title": fields["title"],
+            "userName": "migration",
+            "fromLocation": fields["from_location"],
+            "toLocation": fields["to_location"],
+            "fromDate": fields["from_date"],
+            "toDate": fields["to_date"],
+            "rating": fields["rating"],
+            "content": fields["content"],
+        })
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+async def batch(client, headers: dict, count: int, chunk_size: int) -> float:
+    """일괄 API로 생성 (NDJSON), 소요 시간(초)"""
+    body = "\n".join(json.dumps({"op": "create", **review_fields(i)}, ensure_ascii=False) for i in range(count))
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/reviews/batch",
+        params={"chunk_size": chunk_size},
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content=body.encode("utf-8"),
+    )
+    response.raise_for_status()
+    assert response.json()["data"]["created"] == count
+    return time.perf_counter() - started
+
+async def run(count: int, chunk_sizes) -> dict:
+    import httpx
+    from app.main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            login = await client.post("/api/auth/login", json={"username": "tony", "password": "test0723"})
+            headers = {"Authorization": f"Bearer {login.json()['data']['token']}"}
+
+            elapsed = await one_by_one(client, headers, count)
+            results["one-by-one"] = {"seconds": elapsed, "reviews_per_sec": count / elapsed}
+            for chunk_size in chunk_sizes:
+                elapsed = await batch(client, headers, count, chunk_size)
+                results[f"batch (chunk {chunk_size})"] = {"seconds": elapsed, "reviews_per_sec": count / elapsed}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰 대량 쓰기 벤치마크")
+    parser.add_argument("--reviews", type=int, default=2000, help="방식별 생성할 리뷰 수")
+    parser.add_argument("--chunk-sizes", default="100,500,2000", help="일괄 API 청크 크기 (쉼표 구분)")
+    args = parser.parse_args()
+
+    configure_environment(image_optimize_enabled=False)
+    results = asyncio.run(run(args.reviews, [int(size) for size in args.chunk_sizes.split(",")]))
+    print_table(f"리뷰 {args.reviews}건 생성", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+이벤트 루프 차단 벤치마크
+
+느린 쿼리와 빠른 쿼리가 섞여 들어올 때 빠른 요청의 꼬리 지연(p95/p99)을 측정한다.
+
+- blocking: async def 라우트에서 동기 Session 사용 (기존 방식)
+- threadpool: def 라우트에서 동기 Session 사용 (이식 전 라우트의 기본 동작)
+- async: async def 라우트에서 AsyncSession 사용 (get_async_db)
+
+느린 쿼리는 SQLite 사용자 함수 bench_sleep(ms)로 흉내 낸다.
+
+사용법: python -m benchmarks.bench_event_loop --duration 5 --slow-ms 200
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure_environment, print_table, summarize
+
+def build_app():
+    """모드별 느린/빠른 라우트를 가진 벤치마크용 앱"""
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import event, text
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+    from app.database import async_engine, engine, get_async_db, get_db
+
+    def _register(dbapi_connection, connection_record):
+        dbapi_connection.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000) or 1)
+
+    event.listen(engine, "connect", _register)
+    event.listen(async_engine.sync_engine, "connect", _register)
+
+    app = FastAPI()
+
+    @app.get("/blocking/query")
+    async def blocking_query(ms: int = 0, db: Session = Depends(get_db)):
+        return {"value": db.execute(text("SELECT bench_sleep(:ms)"), {"ms": ms}).scalar()}
+
+    @app.get("/threadpool/query")
+    def threadpool_query(ms: int = 0, db: Session = Depends(get_db)):
+        return {"value": db.execute(text("SELECT bench_sleep(:ms)"), {"ms": ms}).scalar()}
+
+    @app.get("/async/query")
+    async def async_query(ms: int = 0, db: AsyncSession = Depends(get_async_db)):
+        return {"value": (await db.execute(text("SELECT bench_sleep(:ms)"), {"ms": ms})).scalar()}
+
+    return app
+
+async def run_mode(app, mode: str, duration: float, slow_ms: int, slow_clients: int, fast_clients: int) -> dict:
+    """한 모드 실행 후 빠른 요청 지연 요약"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    fast_latencies = []
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def slow_worker():
+            while time.perf_counter() < deadline:
+                await client.get(f"/{mode}/query", params={"ms": slow_ms})
+
+        async def fast_worker():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get(f"/{mode}/query", params={"ms": 0})
+                fast_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(slow_worker() for _ in range(slow_clients)),
+            *(fast_worker() for _ in range(fast_clients))
+        )
+        elapsed = time.perf_counter() - started
+
+    # 비동기 커넥션은 이벤트 루프에 묶이므로 모드마다 정리한다
+    from app.database import async_engine
+    await async_engine.dispose()
+
+    return summarize(fast_latencies, elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description="이벤트 루프 차단 벤치마크")
+    parser.add_argument("--duration", type=float, default=5.0, help="모드별 측정 시간(초)")
+    parser.add_argument("--slow-ms", type=int, default=200, help="느린 쿼리 소요 시간(ms)")
+    parser.add_argument("--slow-clients", type=int, default=4, help="느린 요청 동시 클라이언트 수")
+    parser.add_argument("--fast-clients", type=int, default=2, help="빠른 요청 동시 클라이언트 수")
+    parser.add_argument("--modes", default="blocking,threadpool,async", help="측정할 모드 (쉼표 구분)")
+    args = parser.parse_args()
+
+    configure_environment()
+    app = build_app()
+
+    from app.database import init_db
+    init_db()
+
+    results = {}
+    for mode in args.modes.split(","):
+        results[mode] = asyncio.run(
+            run_mode(app, mode, args.duration, args.slow_ms, args.slow_clients, args.fast_clients)
+        )
+
+    print_table(f"빠른 요청 지연 (느린 쿼리 {args.slow_ms}ms x {args.slow_clients} 동시)", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+리뷰 목록 응답 생성 벤치마크 (dict + jsonable_encoder vs 미리 만든 JSON 조각)
+
+더미 데이터(create_dummy_data.py)를 넣고 같은 페이지들을 두 방식으로 만들어 요청당 CPU 시간과 지연을 비교한다.
+응답 캐시를 거치지 않고 목록 조회 경로(리뷰 조회 + 본문 생성)만 측정한다.
+
+- dict: 리뷰 전체 컬럼 + 이미지 조회 후 build_list_item, jsonable_encoder, JSONResponse (도입 전 방식)
+- fragment: id/updated_at만 조회하고 review_fragments의 조각을 이어 붙임 (현재 GET /api/reviews)
+
+사용법: python -m benchmarks.bench_list_render --reviews 10000 --limits 6,20,50 --iterations 300
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ROOT_DIR, configure_environment, print_table, summarize
+
+def seed(review_count: int) -> None:
+    """더미 데이터 생성 (응답 조각 포함)"""
+    subprocess.run(
+        [
+            sys.executable, os.path.join(ROOT_DIR, "create_dummy_data.py"),
+            "--reviews", str(review_count),
+            "--seed", "42",
+            "--end-date", "2025-12-31",
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+async def dict_page(db, offset: int, limit: int) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from app.core.review_reader import build_list_item, fetch_images, fetch_review_rows
+
+    rows = await fetch_review_rows(db, "published", offset, limit)
+    images = await fetch_images(db, [row.id for row in rows])
+    return JSONResponse(jsonable_encoder({
+        "success": True,
+        "data": {
+            "reviews": [build_list_item(row, images[row.id]) for row in rows],
+            "pagination": {"items_per_page": limit}
+        }
+    })).body
+
+async def fragment_page(db, offset: int, limit: int) -> bytes:
+    from app.api.reviews import PAGE_COLUMNS
+    from app.core.review_fragments import fetch_list_fragments, list_body
+    from app.core.review_reader import fetch_review_rows
+
+    rows = await fetch_review_rows(db, "published", offset, limit, columns=PAGE_COLUMNS)
+    fragments = await fetch_list_fragments(db, [row.id for row in rows])
+    return list_body((fragments[row.id] for row in rows if row.id in fragments), {"items_per_page": limit})
+
+RENDERERS = {"dict": dict_page, "fragment": fragment_page}
+
+async def measure(render, limit: int, iterations: int, pages: int) -> dict:
+    """페이지를 돌아가며 iterations번 만들고 요청당 CPU 시간과 지연 요약"""
+    from app.database import AsyncSessionLocal
+
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        await render(db, 0, limit)  # 준비 (연결, 문장 컴파일 캐시)
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for i in range(iterations):
+            request_started = time.perf_counter()
+            await render(db, (i % pages) * limit, limit)
+            latencies.append(time.perf_counter() - request_started)
+        cpu = time.process_time() - cpu_started
+        elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies, elapsed)
+    summary["cpu_us_per_req"] = cpu / iterations * 1e6
+    return summary
+
+async def run(limits, iterations: int, pages: int) -> dict:
+    from app.database import AsyncSessionLocal, async_engine
+
+    results = {}
+    for limit in limits:
+        # 두 방식의 본문이 같은지 먼저 확인
+        async with AsyncSessionLocal() as db:
+            for page in range(pages):
+                if await dict_page(db, page * limit, limit) != await fragment_page(db, page * limit, limit):
+                    raise SystemExit(f"limit={limit} page={page + 1}: 두 방식의 응답 본문이 다릅니다.")
+        for name, render in RENDERERS.items():
+            results[f"{name} (limit={limit})"] = await measure(render, limit, iterations, pages)
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰 목록 응답 생성 벤치마크 (dict vs JSON 조각)")
+    parser.add_argument("--reviews", type=int, default=10000, help="더미 리뷰 수")
+    parser.add_argument("--limits", default="6,20,50", help="페이지 크기 (쉼표 구분)")
+    parser.add_argument("--iterations", type=int, default=300, help="방식/페이지 크기별 요청 수")
+    parser.add_argument("--pages", type=int, default=20, help="돌아가며 조회할 앞쪽 페이지 수")
+    args = parser.parse_args()
+
+    configure_environment(response_cache_enabled=False, metrics_enabled=False)
+    started = time.perf_counter()
+    seed(args.reviews)
+    print(f"리뷰 {args.reviews}건 생성: {time.perf_counter() - started:.1f}s")
+
+    limits = [int(limit) for limit in args.limits.split(",")]
+    results = asyncio.run(run(limits, args.iterations, args.pages))
+    print_table(f"목록 응답 생성 (리뷰 {args.reviews}건, 요청당)", results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+리뷰 검색 벤치마크
+
+대량의 합성 리뷰를 넣고 같은 검색어로 FTS5(trigram) 인덱스 검색과 LIKE 스캔의
+지연(개수 + 첫 페이지 조회)을 비교한다.
+
+사용법: python -m benchmarks.bench_search --reviews 100000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.common import configure_environment, print_table, summarize
+
+DISTRICTS = [
+    "서울 노원구", "서울 강남구", "서울 마포구", "서울 송파구", "서울 은평구",
+    "경기 수원시", "경기 성남시", "경기 고양시", "인천 부평구", "부산 해운대구",
+]
+PHRASES = [
+    "포장이 꼼꼼했어요", "기사님들이 친절하셨습니다", "보관 상태가 깨끗했어요",
+    "시간 약속을 잘 지켜주셨어요", "가구 조립까지 해주셨습니다", "견적이 합리적이었어요",
+]
+
+def seed(review_count: int) -> None:
+    """합성 리뷰 삽입 (트리거가 검색 인덱스를 함께 갱신한다)"""
+    from sqlalchemy import insert
+    from app.database import engine, init_db
+    from app.models.review import Review
+    from app.models.user import User
+
+    init_db()
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(id=1, username="bench", password_hash="-", role="admin"))
+        batch = []
+        for i in range(review_count):
+            batch.append({
+                "user_id": 1,
+                "team": f"{rng.randint(1, 40)}팀",
+                "title": f"{rng.choice(PHRASES)} ({i})",
+                "content": " ".join(rng.choice(PHRASES) for _ in range(8)),
+                "from_location": rng.choice(DISTRICTS),
+                "to_location": rng.choice(DISTRICTS),
+                "from_date": "2024-01-01",
+                "to_date": "2024-01-02",
+                "rating": rng.randint(1, 5),
+                "status": "published",
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Review), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Review), batch)
+
+async def measure(query: str, use_index: bool, iterations: int) -> dict:
+    """검색어 하나를 반복 실행해 지연 요약"""
+    from app.database import AsyncSessionLocal
+    from app.core.review_reader import count_search_results, search_review_rows
+
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await count_search_results(db, query, "published", use_index=use_index)
+            await search_review_rows(db, query, "published", 0, 6, use_index=use_index)
+            latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+async def run(queries, iterations: int) -> dict:
+    from app.database import async_engine
+
+    results = {}
+    for query in queries:
+        for use_index in (True, False):
+            label = f"{query} ({'fts' if use_index else 'like'})"
+            results[label] = await measure(query, use_index, iterations)
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰 검색 벤치마크 (FTS5 vs LIKE)")
+    parser.add_argument("--reviews", type=int, default=100000, help="합성 리뷰 수")
+    parser.add_argument("--iterations", type=int, default=20, help="검색어별 반복 횟수")
+    parser.add_argument("--queries", default="노원구,27팀,해운대구 친절,깨끗했어요", help="검색어 (쉼표 구분)")
+    args = parser.parse_args()
+
+    configure_environment()
+    started = time.perf_counter()
+    seed(args.reviews)
+    print(f"리뷰 {args.reviews}건 삽입 및 색인: {time.perf_counter() - started:.1f}s")
+
+    results = asyncio.run(run(args.queries.split(","), args.iterations))
+    print_table(f"검색 지연 (리뷰 {args.reviews}건, 개수 + 첫 페이지)", results)
+
+if __name__ == "__main__":
+    main()
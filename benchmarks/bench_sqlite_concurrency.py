@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+SQLite 동시성 벤치마크
+
+쓰기가 계속 들어오는 동안 여러 프로세스(gunicorn 워커 흉내)의 읽기 처리량과 지연,
+"database is locked" 오류 수를 엔진 프로필별로 비교한다.
+
+- legacy: 롤백 저널, synchronous=FULL, mmap 없음, 기본 캐시 (이전 기본값)
+- tuned: app.config 기본값 (WAL, synchronous=NORMAL, mmap, 큰 캐시, busy timeout)
+
+app 설정은 import 시점에 읽히므로 프로필마다 별도 프로세스에서 실행한다.
+
+사용법: python -m benchmarks.bench_sqlite_concurrency --duration 5 --readers 4 --writers 1
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from benchmarks.common import configure_environment, print_table, summarize
+
+PROFILES = {
+    "legacy": {
+        "sqlite_journal_mode": "delete",
+        "sqlite_synchronous": "full",
+        "sqlite_mmap_size": 0,
+        "sqlite_cache_size": -2000,
+        "sqlite_busy_timeout_ms": 5000,
+    },
+    "tuned": {},
+}
+
+def seed(review_count: int) -> None:
+    """테이블 생성 후 리뷰 데이터 삽입"""
+    from sqlalchemy import insert
+    from app.database import engine, init_db
+    from app.models.review import Review
+    from app.models.user import User
+
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(id=1, username="bench", password_hash="-", role="admin"))
+        conn.execute(insert(Review), [
+            {
+                "user_id": 1,
+                "team": f"팀{i % 10}",
+                "title": f"리뷰 {i}",
+                "content": "내용 " * 50,
+                "from_location": "서울",
+                "to_location": "부산",
+                "from_date": "2024-01-01",
+                "to_date": "2024-01-02",
+                "rating": i % 5 + 1,
+                "status": "published",
+            }
+            for i in range(review_count)
+        ])
+
+def reader(duration: float, barrier, results) -> None:
+    """목록 조회와 같은 쿼리(카운트 + 최신순 페이지)를 반복"""
+    from sqlalchemy import func, select
+    from sqlalchemy.exc import OperationalError
+    from app.database import engine
+    from app.models.review import Review
+
+    latencies = []
+    errors = 0
+    page = select(Review.id, Review.title, Review.created_at).where(
+        Review.status == "published"
+    ).order_by(Review.created_at.desc(), Review.id.desc()).limit(10)
+    count = select(func.count(Review.id)).where(Review.status == "published")
+
+    deadline = _start(barrier, duration)
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(count).scalar()
+                conn.execute(page.offset(random.randint(0, 100) * 10)).all()
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    results.put(("read", latencies, errors))
+
+def writer(duration: float, review_count: int, barrier, results) -> None:
+    """관리자 수정처럼 리뷰 한 건을 고치고 커밋하기를 반복"""
+    from sqlalchemy import func, update
+    from sqlalchemy.exc import OperationalError
+    from app.database import engine
+    from app.models.review import Review
+
+    latencies = []
+    errors = 0
+    deadline = _start(barrier, duration)
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(update(Review).where(Review.id == random.randint(1, review_count)).values(
+                    content="수정 " * random.randint(10, 100),
+                    updated_at=func.now()
+                ))
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.001)
+
+    results.put(("write", latencies, errors))
+
+def run_profile(args, results) -> None:
+    """프로필 하나 실행 (별도 프로세스, 환경 변수는 부모가 지정)"""
+    seed(args.reviews)
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    # 모든 프로세스가 준비(import, 쿼리 구성)를 마치면 함께 시작한다 (기동 시간과 무관)
+    barrier = context.Barrier(args.readers + args.writers)
+    processes = [context.Process(target=reader, args=(args.duration, barrier, queue)) for _ in range(args.readers)]
+    processes += [
+        context.Process(target=writer, args=(args.duration, args.reviews, barrier, queue))
+        for _ in range(args.writers)
+    ]
+    for process in processes:
+        process.start()
+
+    collected = {"read": ([], 0), "write": ([], 0)}
+    for _ in processes:
+        kind, latencies, errors = queue.get()
+        previous, previous_errors = collected[kind]
+        collected[kind] = (previous + latencies, previous_errors + errors)
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for kind, (latencies, errors) in collected.items():
+        summary[kind] = {**summarize(latencies, args.duration), "errors": errors}
+    results.put(summary)
+
+def _start(barrier, duration: float) -> float:
+    """다른 프로세스가 모두 준비될 때까지 기다린 뒤 종료 시각 반환"""
+    barrier.wait()
+    return time.time() + duration
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 동시성 벤치마크")
+    parser.add_argument("--duration", type=float, default=5.0, help="프로필별 측정 시간(초)")
+    parser.add_argument("--readers", type=int, default=4, help="읽기 프로세스 수")
+    parser.add_argument("--writers", type=int, default=1, help="쓰기 프로세스 수")
+    parser.add_argument("--reviews", type=int, default=5000, help="미리 넣을 리뷰 수")
+    parser.add_argument("--profiles", default="legacy,tuned", help="측정할 프로필 (쉼표 구분)")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    read_rows, write_rows = {}, {}
+    for name in args.profiles.split(","):
+        # 자식 프로세스는 부모의 환경 변수를 물려받으므로 이전 프로필 값을 지운다
+        for key in {key for profile in PROFILES.values() for key in profile}:
+            os.environ.pop(key.upper(), None)
+        configure_environment(**PROFILES[name])
+        queue = context.Queue()
+        process = context.Process(target=run_profile, args=(args, queue))
+        process.start()
+        summary = queue.get()
+        process.join()
+        read_rows[name] = summary["read"]
+        write_rows[name] = summary["write"]
+
+    print_table(f"읽기 (읽기 {args.readers} 프로세스, 쓰기 {args.writers} 프로세스)", read_rows)
+    print_table("쓰기", write_rows)
+
+    # 한 번도 실행하지 못한 프로필이 있으면 비교할 수 없는 결과이므로 실패로 끝낸다
+    empty = [
+        name for name in read_rows
+        if (args.readers and not read_rows[name]["count"]) or (args.writers and not write_rows[name]["count"])
+    ]
+    if empty:
+        print(f"\n측정된 작업이 없는 프로필: {', '.join(empty)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+벤치마크 공통 유틸리티
+
+app 모듈은 import 시점에 설정을 읽으므로, 벤치마크 스크립트는 app을 import하기 전에
+configure_environment()로 임시 데이터베이스/업로드 경로를 지정해야 한다.
+"""
+
+import math
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+def configure_environment(work_dir: Optional[str] = None, **overrides) -> str:
+    """임시 작업 디렉토리를 만들고 app 설정을 환경 변수로 지정"""
+    work_dir = work_dir or tempfile.mkdtemp(prefix="noble-bench-")
+    os.makedirs(os.path.join(work_dir, "database"), exist_ok=True)
+    os.makedirs(os.path.join(work_dir, "uploads"), exist_ok=True)
+
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(work_dir, 'database', 'reviews.db')}",
+        "UPLOAD_DIR": os.path.join(work_dir, "uploads"),
+        "CACHE_GENERATION_FILE": os.path.join(work_dir, "database", "cache_generation"),
+        # 메트릭 스냅샷과 이미지 변형도 저장소의 database/가 아닌 작업 디렉토리에 쓴다
+        "METRICS_DIR": os.path.join(work_dir, "metrics"),
+        "IMAGE_VARIANT_DIR": os.path.join(work_dir, "database", "image_variants"),
+        "DEBUG": "False",
+    }
+    env.update({key.upper(): str(value) for key, value in overrides.items()})
+    os.environ.update(env)
+    return work_dir
+
+def percentile(values: List[float], pct: float) -> float:
+    """백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """지연 시간 목록(초) 요약 (ms 단위)"""
+    summary = {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else 0.0,
+    }
+    if elapsed:
+        summary["throughput_rps"] = len(latencies) / elapsed
+    return summary
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """결과 표 출력"""
+    print(f"\n== {title}")
+    columns = sorted({key for row in rows.values() for key in row})
+    print(f"{'':<24}" + "".join(f"{column:>16}" for column in columns))
+    for name, row in rows.items():
+        print(f"{name:<24}" + "".join(f"{row.get(column, 0):>16.2f}" for column in columns))
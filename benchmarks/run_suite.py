@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+API 주요 경로 벤치마크 모음
+
+데이터셋 크기별로 임시 데이터베이스에 더미 데이터(create_dummy_data.py)를 넣고 다음 시나리오를 측정한다.
+
+- list_shallow: 리뷰 목록 앞쪽 페이지 (1-5페이지)
+- list_deep: 리뷰 목록 뒤쪽 페이지 (OFFSET이 큰 페이지)
+- detail: 리뷰 상세
+- login: 로그인 (비밀번호 해시 검증)
+- upload_single: 이미지 한 장 업로드
+- upload_multi: 리뷰 이미지 여러 장 추가
+- update: 리뷰 수정
+
+시나리오마다 처리량, 지연(p50/p95/p99), 요청당 SQL 쿼리 수, 최대 메모리(RSS)를 JSON으로 저장하고
+--compare로 이전 결과와 비교한다.
+
+- inprocess: ASGI 클라이언트로 앱을 프로세스 안에서 직접 호출 (쿼리 수 측정 가능)
+  ASGI 클라이언트는 백그라운드 작업이 끝나야 응답을 돌려주므로 업로드 지연과 쿼리 수에 이미지 최적화가 포함된다.
+- uvicorn / gunicorn: 실제 서버를 띄워 HTTP로 호출 (gunicorn은 start_production.sh와 같은 옵션)
+
+app 설정은 import 시점에 읽히므로 데이터셋마다 별도 프로세스에서 실행한다.
+
+사용법:
+    python -m benchmarks.run_suite --sizes 1000,100000 --requests 300 --concurrency 8 --output results.json
+    python -m benchmarks.run_suite --mode gunicorn --workers 4 --compare results.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.common import ROOT_DIR, configure_environment, print_table, summarize
+
+SCENARIOS = ("list_shallow", "list_deep", "detail", "login", "upload_single", "upload_multi", "update")
+
+# 측정하지 않고 먼저 보내는 요청 수 (커넥션, 캐시, 프로세스 풀 준비)
+WARMUP_REQUESTS = 5
+
+ADMIN_CREDENTIALS = {"username": "tony", "password": "test0723"}
+
+# 비교할 때 보여줄 지표 (값이 클수록 좋은지)
+COMPARE_METRICS = {"throughput_rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+def seed(size: int, seed_value: int) -> None:
+    """더미 데이터 생성 (환경 변수로 지정된 임시 데이터베이스에)"""
+    subprocess.run(
+        [
+            sys.executable, os.path.join(ROOT_DIR, "create_dummy_data.py"),
+            "--reviews", str(size),
+            "--users", str(max(1, size // 1000)),
+            "--seed", str(seed_value),
+            "--end-date", "2025-12-31",
+            "--image-files", "20",
+            "--write-files",
+            "--defer-search-index",
+        ],
+        check=True,
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+
+def jpeg_bytes(rng: random.Random, width: int = 1280, height: int = 960) -> bytes:
+    """업로드용 JPEG (요청마다 내용이 달라야 content 저장 모드에서 중복 제거되지 않는다)"""
+    from PIL import Image
+
+    image = Image.new("RGB", (width, height), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    image.paste(Image.effect_noise((width // 4, height // 4), 64).convert("RGB"), (rng.randrange(width // 2), 0))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+class Scenario:
+    """시나리오 하나의 요청 생성기 (측정 전에 필요한 데이터를 미리 만든다)"""
+
+    def __init__(self, name: str, size: int, requests: int, rng: random.Random):
+        self.name = name
+        self.size = size
+        self.rng = rng
+        self.uploads: List[bytes] = []
+        if name in ("upload_single", "upload_multi"):
+            per_request = 1 if name == "upload_single" else 3
+            self.uploads = [jpeg_bytes(rng) for _ in range((requests + WARMUP_REQUESTS) * per_request)]
+
+    def _review_id(self) -> int:
+        return self.rng.randint(1, self.size)
+
+    def request(self, headers: dict) -> dict:
+        """httpx 요청 인자"""
+        if self.name == "list_shallow":
+            return {"method": "GET", "url": "/api/reviews", "params": {"page": self.rng.randint(1, 5), "limit": 6}}
+        if self.name == "list_deep":
+            last_page = max(1, self.size * 9 // 10 // 6)
+            page = self.rng.randint(max(1, last_page * 8 // 10), last_page)
+            return {"method": "GET", "url": "/api/reviews", "params": {"page": page, "limit": 6}}
+        if self.name == "detail":
+            return {"method": "GET", "url": f"/api/reviews/{self._review_id()}"}
+        if self.name == "login":
+            return {"method": "POST", "url": "/api/auth/login", "json": ADMIN_CREDENTIALS}
+        if self.name == "upload_single":
+            return {
+                "method": "POST", "url": "/api/images/upload", "headers": headers,
+                "files": {"image": ("photo.jpg", self.uploads.pop(), "image/jpeg")},
+            }
+        if self.name == "upload_multi":
+            return {
+                "method": "PUT", "url": f"/api/reviews/{self._review_id()}/images", "headers": headers,
+                "files": [("images", (f"photo{i}.jpg", self.uploads.pop(), "image/jpeg")) for i in range(3)],
+            }
+        if self.name == "update":
+            return {
+                "method": "PUT", "url": f"/api/reviews/{self._review_id()}", "headers": headers,
+                "params": {"content": f"벤치마크 수정 {self.rng.random()}", "rating": self.rng.randint(1, 5)},
+            }
+        raise ValueError(self.name)
+
+def peak_rss_mb(pid: int) -> Optional[float]:
+    """프로세스와 모든 자식 프로세스의 최대 RSS(VmHWM) 합계 (MB, /proc가 없으면 None)"""
+    if not os.path.isdir("/proc"):
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+async def measure(client, scenario: Scenario, headers: dict, requests: int, concurrency: int) -> dict:
+    """동시 요청으로 시나리오 실행, 지연 요약"""
+    for _ in range(WARMUP_REQUESTS):
+        await client.request(**scenario.request(headers))
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            kwargs = scenario.request(headers)
+            started = time.perf_counter()
+            response = await client.request(**kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {**summarize(latencies, time.perf_counter() - started), "errors": errors}
+
+class QueryCounter:
+    """두 엔진(동기/비동기)에서 실행된 SQL 문 수"""
+
+    def __init__(self):
+        from sqlalchemy import event
+        from app.database import async_engine, engine
+
+        self.count = 0
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._executed)
+
+    def _executed(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+async def run_scenarios(client, args, size: int, server_pid: Optional[int], counter: Optional[QueryCounter]) -> dict:
+    login = await client.post("/api/auth/login", json=ADMIN_CREDENTIALS)
+    login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['data']['token']}"}
+
+    results = {}
+    rng = random.Random(args.seed)
+    for name in args.scenarios:
+        scenario = Scenario(name, size, args.requests, rng)
+        queries_before = counter.count if counter else 0
+        summary = await measure(client, scenario, headers, args.requests, args.concurrency)
+        if counter:
+            summary["queries_per_request"] = (counter.count - queries_before) / (args.requests + WARMUP_REQUESTS)
+        summary["peak_rss_mb"] = peak_rss_mb(server_pid or os.getpid())
+        results[name] = summary
+    return results
+
+async def run_inprocess(args, size: int) -> dict:
+    import httpx
+    from app.main import app
+
+    counter = QueryCounter()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await run_scenarios(client, args, size, None, counter)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_command(args, port: int) -> List[str]:
+    if args.mode == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    return [
+        sys.executable, "-m", "gunicorn", "app.main:app",
+        "--workers", str(args.workers),
+        "--worker-class", "uvicorn.workers.UvicornWorker",
+        "--bind", f"127.0.0.1:{port}",
+        "--log-level", "warning",
+        "--timeout", "120",
+        "--keep-alive", "2",
+    ]
+
+async def run_server(args, size: int) -> dict:
+    import httpx
+
+    port = free_port()
+    server = subprocess.Popen(server_command(args, port), cwd=ROOT_DIR)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            deadline = time.time() + 30
+            while True:
+                try:
+                    (await client.get("/health")).raise_for_status()
+                    break
+                except httpx.TransportError:
+                    if time.time() > deadline or server.poll() is not None:
+                        raise RuntimeError("서버가 시작되지 않았습니다.")
+                    await asyncio.sleep(0.2)
+            return await run_scenarios(client, args, size, server.pid, None)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def run_dataset(args, size: int, queue) -> None:
+    """데이터셋 하나 실행 (별도 프로세스, 환경 변수는 부모가 지정)"""
+    seed(size, args.seed)
+    runner = run_inprocess if args.mode == "inprocess" else run_server
+    queue.put(asyncio.run(runner(args, size)))
+
+def wait_result(process, queue) -> dict:
+    """자식 프로세스 결과 기다리기 (결과 없이 종료하면 중단)"""
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            process.join()
+            return result
+        except queue_module.Empty:
+            if not process.is_alive():
+                raise SystemExit(f"벤치마크 프로세스가 비정상 종료했습니다 (exit code {process.exitcode}).")
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(baseline: dict, results: List[dict]) -> None:
+    """이전 결과 대비 변화율 출력 (같은 데이터셋 크기, 시나리오끼리)"""
+    previous = {(row["dataset_size"], row["scenario"]): row for row in baseline["results"]}
+    print(f"\n== 비교 기준: {baseline['meta'].get('git_revision')} ({baseline['meta'].get('started_at')})")
+    for row in results:
+        before = previous.get((row["dataset_size"], row["scenario"]))
+        if before is None:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARE_METRICS.items():
+            if before.get(metric):
+                change = (row[metric] - before[metric]) / before[metric] * 100
+                better = (change > 0) == higher_is_better
+                changes.append(f"{metric} {change:+.1f}%{'' if abs(change) < 5 else (' ✓' if better else ' ✗')}")
+        print(f"{row['dataset_size']:>8} {row['scenario']:<16}" + "  ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="API 주요 경로 벤치마크 모음")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="데이터셋 크기(리뷰 수, 쉼표 구분)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn", "gunicorn"), default="inprocess", help="실행 방식")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn 워커 수")
+    parser.add_argument("--seed", type=int, default=42, help="데이터와 요청 순서 난수 시드")
+    parser.add_argument("--no-response-cache", action="store_true", help="응답 캐시를 끄고 측정")
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    args = parser.parse_args()
+    args.scenarios = args.scenarios.split(",")
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+
+    meta = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for size in (int(value) for value in args.sizes.split(",")):
+        configure_environment(
+            image_optimize_enabled=True,
+            response_cache_enabled=not args.no_response_cache,
+        )
+        queue = context.Queue()
+        process = context.Process(target=run_dataset, args=(args, size, queue))
+        process.start()
+        scenario_results = wait_result(process, queue)
+
+        print_table(f"리뷰 {size}건 ({args.mode}, 동시 {args.concurrency})", {
+            name: {key: value for key, value in summary.items() if value is not None}
+            for name, summary in scenario_results.items()
+        })
+        results.extend({"dataset_size": size, "scenario": name, **summary} for name, summary in scenario_results.items())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과를 {args.output}에 저장했습니다.")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+if __name__ == "__main__":
+    main()
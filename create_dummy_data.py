@@ -1,116 +1,333 @@
 #!/usr/bin/env python3
 """
-더미 리뷰 데이터 생성 스크립트
-개발 및 테스트용
+더미 데이터 생성 스크립트
+개발, 테스트, 벤치마크용
+
+사용자, 리뷰, 이미지를 원하는 수만큼 만든다. 같은 --seed(와 --end-date)면 항상 같은 데이터가 만들어진다.
+ORM 객체를 만들지 않고 Core INSERT로 묶어 넣으므로 리뷰 100만 건도 몇 분 안에 들어간다.
+ORM 이벤트를 거치지 않으므로 지역 컬럼과 파일 참조 수는 여기서 직접 채우고,
+집계 테이블과 응답 조각(review_fragments)은 묶음마다 갱신하는 대신 다 넣은 뒤 한 번에 만든다.
+
+사용법:
+    python create_dummy_data.py                                  # 리뷰 50건 (리뷰가 없을 때만)
+    python create_dummy_data.py --reviews 1000000 --users 1000   # 대량 생성
+    python create_dummy_data.py --reviews 10000 --append         # 기존 데이터에 추가
+    python create_dummy_data.py --reviews 1000 --write-files     # 이미지 파일도 생성
 """
 
-import sys
+import argparse
+import bisect
+import hashlib
+import io
+import itertools
 import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy import select, insert, func, text
+from app.database import engine, init_db
 from app.models.user import User
-from app.models.review import Review
-from app.models.image import ReviewImage
-import random
-from datetime import datetime, timedelta
+from app.models.review import Review, SEARCH_TABLE, create_search_index, search_index_exists
+from app.models.image import ReviewImage, adjust_blob_refs
+from app.models.aggregate import rebuild_review_aggregates
+from app.core.review_fragments import initialize_review_fragments
+from app.core.security import get_password_hash
+from app.utils.file_handler import content_filename, get_file_path, get_file_url
+from app.utils.region import extract_region
 
-def create_dummy_reviews():
-    """더미 리뷰 데이터 생성"""
-    print("더미 리뷰 데이터 생성을 시작합니다...")
-    
-    db = SessionLocal()
-    try:
-        # 기존 더미 데이터가 있는지 확인
-        existing_reviews = db.query(Review).count()
-        if existing_reviews > 0:
-            print(f"이미 {existing_reviews}개의 리뷰가 존재합니다.")
-            return
-        
-        # 관리자 사용자 가져오기
-        admin_user = db.query(User).filter(User.username == "tony").first()
-        if not admin_user:
-            print("관리자 사용자를 찾을 수 없습니다.")
-            return
-        
-        # 더미 데이터 생성
-        teams = ["27팀", "15팀", "32팀", "8팀", "41팀", "19팀", "23팀", "36팀", "12팀", "45팀"]
-        locations = [
-            ("경기 군포시", "서울 노원구"),
-            ("서울 강남구", "서울 서초구"),
-            ("경기 성남시", "서울 송파구"),
-            ("인천 연수구", "서울 마포구"),
-            ("경기 수원시", "서울 영등포구"),
-            ("서울 강동구", "서울 중랑구"),
-            ("경기 안양시", "서울 도봉구"),
-            ("서울 금천구", "서울 강서구"),
-            ("경기 의정부시", "서울 동대문구"),
-            ("서울 종로구", "서울 중구")
+# 출발/도착 지역 (인구 비율에 가까운 가중치)
+LOCATIONS = [
+    ("서울 노원구", 5), ("서울 강남구", 6), ("서울 서초구", 5), ("서울 송파구", 7), ("서울 마포구", 4),
+    ("서울 영등포구", 4), ("서울 강동구", 5), ("서울 중랑구", 4), ("서울 도봉구", 3), ("서울 강서구", 6),
+    ("서울 동대문구", 3), ("서울 종로구", 2), ("서울 중구", 2), ("서울 은평구", 5), ("서울 관악구", 5),
+    ("서울 금천구", 2), ("서울 성북구", 4), ("서울 광진구", 3), ("서울 양천구", 4), ("서울 구로구", 4),
+    ("경기 수원시 영통구", 4), ("경기 수원시 장안구", 3), ("경기 성남시 분당구", 5), ("경기 고양시 일산동구", 4),
+    ("경기 용인시 수지구", 4), ("경기 안양시 동안구", 3), ("경기 군포시", 2), ("경기 의정부시", 3),
+    ("경기 부천시", 5), ("경기 화성시", 6), ("경기 남양주시", 4), ("경기 김포시", 3), ("경기 하남시", 2),
+    ("경기 가평군", 1), ("인천 연수구", 3), ("인천 부평구", 4), ("인천 남동구", 4), ("인천 강화군", 1),
+    ("부산 해운대구", 3), ("부산 수영구", 1), ("대구 수성구", 2), ("대전 유성구", 2), ("광주 북구", 2),
+]
+# 같은 시/도 안에서 이사하는 비율
+SAME_PROVINCE_RATIO = 0.7
+
+TEAM_COUNT = 45
+
+TITLE_TEMPLATES = [
+    "{team} {n}차 후기입니다~",
+    "{to_region}(으)로 이사했어요",
+    "{from_region} → {to_region} 이사 후기",
+    "{team} 덕분에 편하게 이사했습니다",
+    "{rating}점 드립니다, {team} 후기",
+]
+
+SENTENCES = [
+    "정말 친절하게 도와주셨어요.",
+    "이사가 생각보다 편했어요.",
+    "팀원분들이 정말 세심하게 챙겨주셔서 감사했습니다.",
+    "빠르고 안전하게 이사 완료했습니다.",
+    "가격도 합리적이고 서비스도 훌륭했습니다.",
+    "이사 전 걱정이 많았는데 덕분에 안심하고 이사할 수 있었어요.",
+    "포장부터 정리까지 꼼꼼하게 해주셨어요.",
+    "가구 조립까지 깔끔하게 마무리해 주셨습니다.",
+    "엘리베이터가 없는 4층이었는데도 불평 없이 옮겨주셨어요.",
+    "견적 받을 때 설명해 주신 내용 그대로 진행됐습니다.",
+    "시간 약속을 잘 지켜주셨어요.",
+    "냉장고와 세탁기 설치까지 도와주셔서 편했습니다.",
+    "비가 오는 날이었는데 짐이 하나도 젖지 않았어요.",
+    "보관 이사였는데 보관 상태가 깨끗했어요.",
+    "작은 흠집이 하나 생겼는데 바로 보상해 주셨습니다.",
+    "아이들 짐이 많았는데 방별로 잘 정리해 주셨어요.",
+    "다음에도 꼭 이용하고 싶은 업체입니다.",
+    "주변에도 추천하려고 합니다.",
+    "조금 늦게 도착하셨지만 작업은 빨리 끝났어요.",
+    "추천합니다!",
+]
+
+# 평점 분포 (대부분 4-5점)
+RATING_WEIGHTS = [(1, 2), (2, 3), (3, 8), (4, 30), (5, 57)]
+# 상태 분포
+STATUS_WEIGHTS = [("published", 90), ("draft", 8), ("deleted", 2)]
+
+# 이미지 파일 (--write-files)
+PLACEHOLDER_SIZES = [(800, 600), (600, 800), (1024, 768), (640, 640)]
+
+DEFAULT_USER_PASSWORD = "dummy1234"
+
+class WeightedChoice:
+    """누적 가중치로 빠르게 고르기 (random.choices보다 호출 비용이 작다)"""
+
+    def __init__(self, weighted):
+        self.values = [value for value, _ in weighted]
+        self.cum_weights = list(itertools.accumulate(weight for _, weight in weighted))
+        self.total = self.cum_weights[-1]
+
+    def __call__(self, rng: random.Random):
+        return self.values[bisect.bisect_right(self.cum_weights, rng.random() * self.total)]
+
+LOCATION_CHOICE = WeightedChoice(LOCATIONS)
+LOCATIONS_BY_PROVINCE = {
+    province: WeightedChoice([(location, weight) for location, weight in LOCATIONS if location.split()[0] == province])
+    for province in {location.split()[0] for location, _ in LOCATIONS}
+}
+RATING_CHOICE = WeightedChoice(RATING_WEIGHTS)
+STATUS_CHOICE = WeightedChoice(STATUS_WEIGHTS)
+
+def parse_range(value: str):
+    """'1-3' 또는 '2' 형식의 범위"""
+    low, _, high = value.partition("-")
+    low, high = int(low), int(high or low)
+    if low < 0 or high < low:
+        raise argparse.ArgumentTypeError(f"잘못된 범위: {value}")
+    return low, high
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def generate_review(rng: random.Random, n: int, user_ids, end: datetime, days: int) -> dict:
+    """리뷰 한 건 (컬럼 값)"""
+    from_location = LOCATION_CHOICE(rng)
+    if rng.random() < SAME_PROVINCE_RATIO:
+        to_location = LOCATIONS_BY_PROVINCE[from_location.split()[0]](rng)
+    else:
+        to_location = LOCATION_CHOICE(rng)
+    from_region, to_region = extract_region(from_location), extract_region(to_location)
+
+    team = f"{rng.randint(1, TEAM_COUNT)}팀"
+    rating = RATING_CHOICE(rng)
+    created_at = end - timedelta(seconds=rng.randrange(days * 86400))
+    moved_at = created_at - timedelta(days=rng.randint(1, 14))
+
+    return {
+        "user_id": rng.choice(user_ids),
+        "team": team,
+        "title": rng.choice(TITLE_TEMPLATES).format(
+            team=team, n=n, from_region=from_region, to_region=to_region, rating=rating
+        ),
+        "content": " ".join(rng.sample(SENTENCES, rng.randint(1, 6))),
+        "from_location": from_location,
+        "to_location": to_location,
+        "from_region": from_region,
+        "to_region": to_region,
+        "from_date": moved_at.strftime("%m.%d"),
+        "to_date": (moved_at + timedelta(days=rng.choice((0, 0, 0, 1)))).strftime("%m.%d"),
+        "rating": rating,
+        "status": STATUS_CHOICE(rng),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+def write_placeholder_images(rng: random.Random, count: int) -> list:
+    """자리표시 JPEG 파일 생성 (내용 해시 파일명이라 이미 있으면 다시 쓰지 않는다), 이미지 행 값 목록 반환"""
+    from PIL import Image
+
+    images = []
+    for i in range(count):
+        width, height = PLACEHOLDER_SIZES[i % len(PLACEHOLDER_SIZES)]
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        buffer = io.BytesIO()
+        Image.new("RGB", (width, height), color).save(buffer, "JPEG", quality=80)
+        data = buffer.getvalue()
+
+        filename = content_filename(hashlib.sha256(data).hexdigest(), ".jpg")
+        path = get_file_path(filename)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+        images.append({
+            "image_url": get_file_url(filename),
+            "image_filename": filename,
+            "image_size": len(data),
+            "image_mime_type": "image/jpeg",
+            "image_width": width,
+            "image_height": height,
+        })
+    return images
+
+def placeholder_image_names(count: int) -> list:
+    """파일 없이 이름만 있는 이미지 행 값 목록 (파일을 만들지 않을 때)"""
+    return [
+        {"image_url": get_file_url(f"dummy_{i:04d}.jpg"), "image_filename": f"dummy_{i:04d}.jpg"}
+        for i in range(count)
+    ]
+
+def ensure_users(conn, count: int, password: str) -> list:
+    """관리자와 더미 사용자(dummy_0001...) id 목록 (모자라면 새로 만든다)"""
+    admin_id = conn.execute(select(User.id).where(User.username == "tony")).scalar()
+    if admin_id is None:
+        admin_id = conn.execute(
+            insert(User).values(username="tony", password_hash=get_password_hash("test0723"), role="admin")
+        ).inserted_primary_key[0]
+        print("관리자 계정이 생성되었습니다: tony / test0723")
+
+    user_ids = list(conn.execute(
+        select(User.id).where(User.username.like("dummy\\_%", escape="\\")).order_by(User.id).limit(count)
+    ).scalars())
+    if len(user_ids) < count:
+        # 해시 계산이 느리므로 모든 더미 사용자가 같은 해시를 공유한다
+        password_hash = get_password_hash(password)
+        start = conn.execute(select(func.count()).select_from(User).where(User.username.like("dummy\\_%", escape="\\"))).scalar()
+        rows = [
+            {"username": f"dummy_{i:04d}", "password_hash": password_hash, "role": "user"}
+            for i in range(start + 1, start + 1 + count - len(user_ids))
         ]
-        
-        contents = [
-            "정말 친절하게 도와주셨어요. 이사가 생각보다 편했어요.",
-            "팀원분들이 정말 세심하게 챙겨주셔서 감사했습니다.",
-            "빠르고 안전하게 이사 완료했습니다. 추천해요!",
-            "가격도 합리적이고 서비스도 훌륭했습니다.",
-            "이사 전 걱정이 많았는데 덕분에 안심하고 이사할 수 있었어요.",
-            "정말 만족스러운 서비스였습니다. 감사합니다!",
-            "친절하고 전문적인 서비스에 감동받았습니다.",
-            "이사 준비부터 완료까지 모든 과정이 완벽했습니다.",
-            "다음에도 꼭 이용하고 싶은 업체입니다.",
-            "정말 추천하고 싶은 이사 업체입니다."
+        user_ids.extend(conn.execute(insert(User).returning(User.id, sort_by_parameter_order=True), rows).scalars())
+        print(f"더미 사용자 {len(rows)}명이 생성되었습니다 (비밀번호: {password}).")
+    return [admin_id] + user_ids
+
+def drop_search_index(conn) -> bool:
+    """검색 인덱스와 트리거 삭제 (대량 삽입 후 한 번에 다시 색인), 삭제했으면 True"""
+    if not search_index_exists(conn):
+        return False
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{suffix}"))
+    conn.execute(text(f"DROP TABLE {SEARCH_TABLE}"))
+    return True
+
+def insert_batch(conn, reviews: list, images_per_review, image_pool: list, rng: random.Random) -> int:
+    """리뷰 묶음 INSERT (이미지, 파일 참조 수 포함), 이미지 수 반환"""
+    review_ids = conn.execute(
+        insert(Review).returning(Review.id, sort_by_parameter_order=True), reviews
+    ).scalars().all()
+
+    images = []
+    if image_pool:
+        low, high = images_per_review
+        for review_id, review in zip(review_ids, reviews):
+            for sort_order in range(rng.randint(low, high)):
+                images.append({
+                    **rng.choice(image_pool),
+                    "review_id": review_id,
+                    "sort_order": sort_order,
+                    "created_at": review["created_at"],
+                })
+    if images:
+        conn.execute(insert(ReviewImage), images)
+        # 파일별로 모아 한 번씩 증가 (이미지 행마다 UPDATE하지 않는다)
+        for filename, refs in Counter(image["image_filename"] for image in images).items():
+            adjust_blob_refs(conn, [filename], refs)
+    return len(images)
+
+def create_dummy_data(args) -> None:
+    """더미 데이터 생성"""
+    init_db(engine)
+    rng = random.Random(args.seed)
+    # created_at 서버 기본값(CURRENT_TIMESTAMP)과 같은 UTC 기준 (로컬 시각이면 시간대만큼 어긋난다)
+    end = args.end_date or datetime.utcnow().replace(microsecond=0)
+
+    with engine.begin() as conn:
+        existing_reviews = conn.execute(select(func.count()).select_from(Review)).scalar()
+        if existing_reviews and not args.append:
+            print(f"이미 {existing_reviews}개의 리뷰가 존재합니다. 추가하려면 --append를 사용하세요.")
+            return
+        user_ids = ensure_users(conn, args.users, args.password)
+        search_index_dropped = args.defer_search_index and drop_search_index(conn)
+
+    if args.write_files:
+        image_pool = write_placeholder_images(rng, args.image_files)
+        print(f"이미지 파일 {len(image_pool)}개를 {os.path.abspath(get_file_path(''))}에 만들었습니다.")
+    else:
+        image_pool = placeholder_image_names(args.image_files)
+
+    print(f"리뷰 {args.reviews}건 생성을 시작합니다 (seed={args.seed})...")
+    started = time.perf_counter()
+    created = image_count = 0
+    while created < args.reviews:
+        size = min(args.batch_size, args.reviews - created)
+        reviews = [
+            generate_review(rng, existing_reviews + created + i + 1, user_ids, end, args.days)
+            for i in range(size)
         ]
-        
-        for i in range(50):
-            team = random.choice(teams)
-            from_loc, to_loc = random.choice(locations)
-            content = random.choice(contents)
-            
-            # 날짜 생성 (최근 30일 내)
-            days_ago = random.randint(1, 30)
-            from_date = (datetime.now() - timedelta(days=days_ago)).strftime("%m.%d")
-            to_date = (datetime.now() - timedelta(days=days_ago-1)).strftime("%m.%d")
-            
-            review = Review(
-                user_id=admin_user.id,
-                team=team,
-                title=f"{team} {i+1}차 후기입니다~",
-                content=content,
-                from_location=from_loc,
-                to_location=to_loc,
-                from_date=from_date,
-                to_date=to_date,
-                rating=random.randint(4, 5),  # 4-5점
-                status="published"
-            )
-            
-            db.add(review)
-            db.flush()  # ID를 얻기 위해 flush
-            
-            # 더미 이미지 생성 (1-3개)
-            num_images = random.randint(1, 3)
-            for j in range(num_images):
-                # 더미 이미지 URL (실제로는 picsum.photos 사용)
-                image_url = f"https://picsum.photos/800/600?random={i*10+j}"
-                filename = f"review_{review.id}_{j+1}.jpg"
-                
-                review_image = ReviewImage(
-                    review_id=review.id,
-                    image_url=image_url,
-                    image_filename=filename,
-                    sort_order=j
-                )
-                db.add(review_image)
-        
-        db.commit()
-        print("✅ 50개의 더미 리뷰 데이터가 생성되었습니다.")
-        
-    except Exception as e:
-        print(f"❌ 더미 데이터 생성 중 오류 발생: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        with engine.begin() as conn:
+            image_count += insert_batch(conn, reviews, args.images_per_review, image_pool, rng)
+        created += size
+        elapsed = time.perf_counter() - started
+        print(f"  {created}/{args.reviews} ({created / elapsed:,.0f}건/s)", end="\r", flush=True)
+    print()
+
+    print("집계를 다시 계산하는 중...")
+    with engine.begin() as conn:
+        rebuild_review_aggregates(conn)
+
+    print("응답 조각을 만드는 중...")
+    with engine.begin() as conn:
+        initialize_review_fragments(conn)
+
+    if search_index_dropped:
+        print("검색 인덱스를 다시 만드는 중...")
+        with engine.begin() as conn:
+            create_search_index(conn)
+
+    print(f"✅ 리뷰 {created}건, 이미지 {image_count}개가 생성되었습니다 ({time.perf_counter() - started:.1f}s).")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="더미 데이터 생성 (개발, 테스트, 벤치마크용)")
+    parser.add_argument("--reviews", type=int, default=50, help="생성할 리뷰 수")
+    parser.add_argument("--users", type=int, default=0, help="리뷰를 나눠 쓸 더미 사용자 수 (관리자 외)")
+    parser.add_argument("--password", default=DEFAULT_USER_PASSWORD, help="더미 사용자 비밀번호")
+    parser.add_argument("--images-per-review", type=parse_range, default=(1, 3), help="리뷰당 이미지 수 범위 (예: 0-3)")
+    parser.add_argument("--image-files", type=int, default=50, help="리뷰들이 나눠 참조할 서로 다른 이미지 수")
+    parser.add_argument("--write-files", action="store_true", help="업로드 디렉토리에 자리표시 이미지 파일 생성")
+    parser.add_argument("--days", type=int, default=365, help="작성 시각을 분포시킬 기간 (일)")
+    parser.add_argument("--end-date", type=parse_date, help="가장 최근 작성일 (YYYY-MM-DD, 기본값: 지금, UTC)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--batch-size", type=int, default=5000, help="트랜잭션 하나에 넣을 리뷰 수")
+    parser.add_argument("--append", action="store_true", help="리뷰가 이미 있어도 추가")
+    parser.add_argument(
+        "--defer-search-index", action="store_true",
+        help="검색 인덱스를 지우고 넣은 뒤 한 번에 다시 색인 (다른 프로세스가 쓰는 중이면 사용하지 말 것)"
+    )
+    args = parser.parse_args()
+
+    if args.image_files < 1:
+        args.images_per_review = (0, 0)
+    create_dummy_data(args)
 
 if __name__ == "__main__":
-    create_dummy_reviews()
+    main()
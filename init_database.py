@@ -9,14 +9,14 @@ from app.models.user import User
 from app.models.review import Review
 from app.models.image import ReviewImage
 from app.core.security import get_password_hash
-from app.database import Base
+from app.database import init_db as create_tables
 import random
 from datetime import datetime, timedelta
 
 def init_database():
     """데이터베이스 초기화"""
-    # 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    # 테이블 및 인덱스 생성
+    create_tables(engine)
     print("데이터베이스 테이블이 생성되었습니다.")
 
 def create_admin_user():
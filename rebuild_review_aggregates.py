@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+리뷰 집계 테이블 재계산 스크립트
+
+review_stats(상태별 요약)와 review_facet_counts(필터 항목별 리뷰 수)는 리뷰를 쓸 때
+같은 트랜잭션에서 증감되므로 평소에는 필요 없다. ORM을 거치지 않고 reviews를 직접 고쳤거나
+집계가 어긋났을 때 사용한다.
+
+사용법:
+    python rebuild_review_aggregates.py          # 전체 재계산
+    python rebuild_review_aggregates.py --check  # reviews와 비교만 (어긋나면 종료 코드 1)
+"""
+
+import argparse
+import sys
+from app.database import engine, init_db
+from app.models.aggregate import check_review_aggregates, rebuild_review_aggregates
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="리뷰 집계 테이블 재계산")
+    parser.add_argument("--check", action="store_true", help="재계산하지 않고 일치 여부만 검사")
+    args = parser.parse_args()
+
+    init_db(engine)
+
+    if args.check:
+        with engine.connect() as conn:
+            problems = check_review_aggregates(conn)
+        if problems:
+            print(f"집계가 reviews와 일치하지 않습니다 ({len(problems)}건):")
+            for problem in problems:
+                print(f"  - {problem}")
+            sys.exit(1)
+        print("집계가 reviews와 일치합니다.")
+        return
+
+    with engine.begin() as conn:
+        rebuild_review_aggregates(conn)
+    print("리뷰 집계를 다시 계산했습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+리뷰 검색 인덱스(FTS5) 재생성 스크립트
+
+인덱스는 트리거로 자동 갱신되므로 평소에는 필요 없다.
+인덱스 도입 전 데이터를 색인하거나, 인덱스가 reviews와 어긋났을 때 사용한다.
+
+사용법:
+    python rebuild_search_index.py          # 인덱스 생성 후 전체 재색인
+    python rebuild_search_index.py --check  # reviews와 일치하는지 검사만
+"""
+
+import argparse
+import sys
+from sqlalchemy.exc import DatabaseError
+from app.database import engine
+from app.models.review import check_search_index, create_search_index, rebuild_search_index
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="리뷰 검색 인덱스 재생성")
+    parser.add_argument("--check", action="store_true", help="재생성하지 않고 일치 여부만 검사")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "sqlite":
+        print("검색 인덱스는 SQLite에서만 사용합니다.")
+        return
+
+    with engine.begin() as conn:
+        if not create_search_index(conn):
+            print("이 SQLite는 FTS5 trigram 토크나이저를 지원하지 않습니다. 검색은 LIKE 스캔으로 동작합니다.")
+            sys.exit(1)
+
+        if args.check:
+            try:
+                check_search_index(conn)
+            except DatabaseError as e:
+                print(f"검색 인덱스가 reviews와 일치하지 않습니다: {e}")
+                sys.exit(1)
+            print("검색 인덱스가 reviews와 일치합니다.")
+            return
+
+        rebuild_search_index(conn)
+
+    print("검색 인덱스를 다시 만들었습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+테스트 공통 설정
+
+app 모듈은 import 시점에 설정을 읽으므로 app을 import하기 전에 임시 데이터베이스/업로드 경로를 지정한다.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+WORK_DIR = tempfile.mkdtemp(prefix="noble-test-")
+os.makedirs(os.path.join(WORK_DIR, "database"), exist_ok=True)
+os.makedirs(os.path.join(WORK_DIR, "uploads"), exist_ok=True)
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(WORK_DIR, 'database', 'reviews.db')}",
+    "UPLOAD_DIR": os.path.join(WORK_DIR, "uploads"),
+    "CACHE_GENERATION_FILE": os.path.join(WORK_DIR, "database", "cache_generation"),
+    "METRICS_DIR": os.path.join(WORK_DIR, "metrics"),
+    "IMAGE_VARIANT_DIR": os.path.join(WORK_DIR, "database", "image_variants"),
+    "DEBUG": "False",
+    # 쿼리 수를 세려면 매 요청이 DB까지 가야 한다
+    "RESPONSE_CACHE_ENABLED": "False",
+})
+
+REVIEW_COUNT = 60
+IMAGES_PER_REVIEW = 3
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="session")
+def review_ids(client):
+    """이미지가 있는 공개 리뷰 (review_fragments는 after_flush에서 함께 만들어진다)"""
+    from app.database import SessionLocal
+    from app.models.image import ReviewImage
+    from app.models.review import Review
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "tony").one()
+        reviews = [
+            Review(
+                user_id=user.id,
+                team="서울팀",
+                title=f"리뷰 {i}",
+                content="내용",
+                from_location="서울특별시 강남구",
+                to_location="부산광역시 해운대구",
+                from_date="2025-01-01",
+                to_date="2025-01-02",
+                rating=5,
+                status="published",
+                images=[
+                    ReviewImage(image_url=f"/uploads/{i}-{j}.jpg", image_filename=f"{i}-{j}.jpg", sort_order=j)
+                    for j in range(IMAGES_PER_REVIEW)
+                ]
+            )
+            for i in range(REVIEW_COUNT)
+        ]
+        db.add_all(reviews)
+        db.commit()
+        return [review.id for review in reviews]
+    finally:
+        db.close()
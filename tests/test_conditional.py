@@ -0,0 +1,15 @@
+"""조건부 GET: 304는 같은 요청의 200과 같은 ETag, Vary를 보낸다"""
+
+import pytest
+
+@pytest.mark.parametrize("url", ["/api/reviews?limit=20", "/api/reviews/stats"])
+@pytest.mark.parametrize("accept_encoding", ["gzip", "identity"])
+def test_not_modified_matches_ok_headers(client, review_ids, url, accept_encoding):
+    ok = client.get(url, headers={"Accept-Encoding": accept_encoding})
+    assert ok.status_code == 200
+
+    not_modified = client.get(url, headers={"Accept-Encoding": accept_encoding, "If-None-Match": ok.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == ok.headers["etag"]
+    assert not_modified.headers.get("vary") == ok.headers.get("vary") == "Accept-Encoding"
+    assert ok.headers["etag"].endswith('-gzip"') == (accept_encoding == "gzip")
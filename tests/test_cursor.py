@@ -0,0 +1,57 @@
+"""목록 커서 (created_at, id) 페이지 이동 (모든 리뷰가 한 번씩, 순서대로 나와야 한다)"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, select, text
+
+def test_cursor_walks_every_review_once(client, review_ids):
+    from app.database import SessionLocal
+    from app.models.review import Review
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        # 앱에서 넣은 시각(마이크로초 포함)과 서버 기본값이 섞여 있어도 같은 형식으로 저장된다
+        # (다른 테스트의 최신 페이지에 끼지 않도록 오래된 시각)
+        user = db.query(User).filter(User.username == "tony").one()
+        created_at = datetime(2000, 1, 1, 12, 0, 0, 123456)
+        db.add_all([
+            Review(
+                user_id=user.id, team="서울팀", title=f"커서 {i}", content="내용",
+                from_location="서울특별시 강남구", to_location="부산광역시 해운대구",
+                from_date="2025-01-01", to_date="2025-01-02", rating=4, status="published",
+                created_at=created_at, updated_at=created_at
+            )
+            for i in range(5)
+        ])
+        db.commit()
+        stored = db.execute(text("SELECT DISTINCT length(created_at) FROM reviews")).scalars().all()
+        expected = db.execute(
+            select(Review.id).where(Review.status == "published").order_by(Review.created_at.desc(), Review.id.desc())
+        ).scalars().all()
+    finally:
+        db.close()
+    assert stored == [19]
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/reviews?limit=7" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url).json()["data"]
+        seen += [review["id"] for review in data["reviews"]]
+        cursor = data["pagination"]["next_cursor"]
+        if not cursor:
+            break
+    assert seen == expected
+
+def test_cursor_key_per_dialect():
+    from sqlalchemy.dialects import postgresql, sqlite
+    from app.core.review_reader import created_at_key
+
+    predicate = created_at_key("postgresql") < datetime(2025, 1, 1)
+    assert isinstance(predicate.right.type, DateTime)
+    assert "CAST" not in str(predicate.compile(dialect=postgresql.dialect()))
+
+    predicate = created_at_key("sqlite") < "2025-01-01 00:00:00"
+    assert isinstance(predicate.right.type, String)
+    assert str(predicate.compile(dialect=sqlite.dialect())) == "reviews.created_at < ?"
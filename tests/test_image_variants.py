@@ -0,0 +1,28 @@
+"""크기 변형 이미지 (GET /api/images/{filename}?w=&fmt=)"""
+
+import io
+import os
+
+from PIL import Image
+
+def test_variant_resized_and_revalidated(client):
+    from app.config import settings
+
+    Image.new("RGB", (2000, 1000), (200, 10, 10)).save(os.path.join(settings.upload_dir, "variant.jpg"))
+
+    response = client.get("/api/images/variant.jpg?w=640&fmt=webp")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert Image.open(io.BytesIO(response.content)).size == (640, 320)
+
+    etag = response.headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}'):
+        not_modified = client.get("/api/images/variant.jpg?w=640&fmt=webp", headers={"If-None-Match": if_none_match})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+
+def test_variant_rejects_unknown_width_and_missing_source(client):
+    assert client.get("/api/images/variant.jpg?w=641").status_code == 400
+    assert client.get("/api/images/variant.jpg?w=640&fmt=gif").status_code == 400
+    assert client.get("/api/images/missing.jpg?w=640").status_code == 404
+    assert client.get("/api/images/..%2F..%2Fetc%2Fpasswd?w=640").status_code == 404
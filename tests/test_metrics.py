@@ -0,0 +1,23 @@
+"""워커 간 메트릭 합산 (스냅샷 파일)"""
+
+import json
+import os
+
+def test_snapshot_keeps_previous_process_with_same_pid(client):
+    from app.core import metrics
+
+    # 같은 PID를 썼던 이전 프로세스의 스냅샷은 덮어쓰지 않고 계속 합산한다
+    directory = metrics._metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+    previous = os.path.join(directory, f"worker-{os.getpid()}-previous.json")
+    with open(previous, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "samples": [["upload_bytes_total", [], 1000.0]]}, f)
+    try:
+        own = metrics.aggregate().get(("upload_bytes_total", ()), 0.0)
+        metrics.write_snapshot()
+        assert os.path.exists(previous)
+        assert os.path.exists(os.path.join(directory, metrics._snapshot_name()))
+        assert metrics.aggregate()[("upload_bytes_total", ())] == own
+    finally:
+        os.remove(previous)
+    assert metrics.aggregate().get(("upload_bytes_total", ()), 0.0) == own - 1000.0
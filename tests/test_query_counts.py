@@ -0,0 +1,71 @@
+"""리뷰 목록/상세 조회의 SQL 문 수 (페이지 크기와 관계없이 일정해야 한다, N+1 방지)"""
+
+import pytest
+from sqlalchemy import delete, event
+
+from tests.conftest import IMAGES_PER_REVIEW
+
+class QueryCounter:
+    """두 엔진(동기/비동기)에서 실행된 SQL 문 수 (benchmarks/run_suite.py와 같은 방식)"""
+
+    def __init__(self):
+        from app.database import async_engine, engine
+
+        self.targets = (engine, async_engine.sync_engine)
+        self.count = 0
+
+    def _executed(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        for target in self.targets:
+            event.listen(target, "before_cursor_execute", self._executed)
+        return self
+
+    def __exit__(self, *exc_info):
+        for target in self.targets:
+            event.remove(target, "before_cursor_execute", self._executed)
+
+def count_queries(client, url: str) -> int:
+    with QueryCounter() as counter:
+        response = client.get(url)
+    assert response.status_code == 200
+    return counter.count
+
+@pytest.mark.parametrize("limit", [1, 6, 20, 50])
+def test_list_query_count(client, review_ids, limit):
+    # 개수, 리뷰 id/updated_at, 조각
+    assert count_queries(client, f"/api/reviews?limit={limit}") == 3
+    response = client.get(f"/api/reviews?limit={limit}")
+    assert len(response.json()["data"]["reviews"]) == limit
+    assert all(len(review["images"]) == IMAGES_PER_REVIEW for review in response.json()["data"]["reviews"])
+
+@pytest.mark.parametrize("limit", [1, 20, 50])
+def test_cursor_list_query_count(client, review_ids, limit):
+    # 커서 모드는 개수를 세지 않는다
+    cursor = client.get("/api/reviews?limit=1").json()["data"]["pagination"]["next_cursor"]
+    assert count_queries(client, f"/api/reviews?limit={limit}&cursor={cursor}") == 2
+
+def test_detail_query_count(client, review_ids):
+    # 리뷰 id/updated_at과 상세 조각 (한 문장)
+    assert count_queries(client, f"/api/reviews/{review_ids[0]}") == 1
+    assert len(client.get(f"/api/reviews/{review_ids[0]}").json()["data"]["images"]) == IMAGES_PER_REVIEW
+
+def test_fragment_miss_query_count(client, review_ids):
+    """조각이 없는 리뷰를 그 자리에서 만들 때도 이미지는 한 번에 읽는다"""
+    from app.database import engine
+    from app.models.fragment import ReviewFragment
+
+    with engine.begin() as conn:
+        conn.execute(delete(ReviewFragment.__table__))
+    try:
+        # 개수, 리뷰 id/updated_at, 조각, 없는 리뷰 컬럼, 이미지
+        for limit in (1, 20, 50):
+            assert count_queries(client, f"/api/reviews?limit={limit}") == 5
+        # 조각 조회, 리뷰 컬럼, 이미지
+        assert count_queries(client, f"/api/reviews/{review_ids[0]}") == 3
+    finally:
+        from app.core.review_fragments import initialize_review_fragments
+
+        with engine.begin() as conn:
+            initialize_review_fragments(conn)
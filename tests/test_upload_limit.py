@@ -0,0 +1,35 @@
+"""업로드 요청 전체 크기 제한 (본문을 받기 전에 413)"""
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.upload_limit import UploadSizeLimitMiddleware
+
+def make_client(max_size: int) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_size=max_size)
+
+    @app.post("/upload")
+    def upload(image: UploadFile = File(...)):
+        return {"size": len(image.file.read())}
+
+    return TestClient(app)
+
+def test_allows_small_upload():
+    response = make_client(4096).post("/upload", files={"image": ("a.jpg", b"x" * 100, "image/jpeg")})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+def test_rejects_declared_length_without_reading_body():
+    response = make_client(4096).post("/upload", files={"image": ("a.jpg", b"x" * 10000, "image/jpeg")})
+    assert response.status_code == 413
+
+def test_rejects_chunked_body_when_limit_is_crossed():
+    def body():
+        for _ in range(100):
+            yield b"--b\r\n" + b"x" * 1024
+
+    response = make_client(4096).post(
+        "/upload", content=body(), headers={"Content-Type": "multipart/form-data; boundary=b"}
+    )
+    assert response.status_code == 413